@@ -0,0 +1,122 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+facility_type = sa.Enum("hospital", "clinic", "megastore", name="facilitytype")
+user_role = sa.Enum("admin", "facility_staff", "state_official", name="userrole")
+requisition_status = sa.Enum("draft", "pending", "approved", "rejected", name="requisitionstatus")
+
+def upgrade() -> None:
+    op.create_table(
+        "facilities",
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("facility_name", sa.String(), nullable=False),
+        sa.Column("facility_type", facility_type, nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "medications",
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("medication_name", sa.String(), nullable=False),
+        sa.Column("dosage_form", sa.String(), nullable=False),
+        sa.Column("strength", sa.String(), nullable=False),
+        sa.Column("manufacturer", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "vendors",
+        sa.Column("vendor_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("vendor_name", sa.String(), nullable=False),
+        sa.Column("contact_name", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "users",
+        sa.Column("user_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("username", sa.String(), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("role", user_role, nullable=False),
+    )
+    op.create_table(
+        "inventory",
+        sa.Column("inventory_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("reorder_level", sa.Integer(), nullable=False),
+        sa.Column("expiry_date", sa.Date(), nullable=False),
+    )
+    op.create_table(
+        "requisition",
+        sa.Column("requisition_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), nullable=False),
+        sa.Column("quantity_requested", sa.Integer(), nullable=False),
+        sa.Column("status", requisition_status, nullable=False),
+        sa.Column("requested_at", sa.DateTime(), nullable=True),
+        sa.Column("approved_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "transfers",
+        sa.Column("transfer_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("from_facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("to_facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), nullable=False),
+        sa.Column("quantity_transferred", sa.Integer(), nullable=False),
+        sa.Column("transfer_date", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "purchase_orders",
+        sa.Column("purchase_order_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("vendor_id", sa.Uuid(as_uuid=True), sa.ForeignKey("vendors.vendor_id"), nullable=False),
+        sa.Column("requisition_id", sa.Uuid(as_uuid=True), sa.ForeignKey("requisition.requisition_id"), nullable=False),
+        sa.Column("quantity_ordered", sa.Integer(), nullable=False),
+        sa.Column("order_date", sa.DateTime(), nullable=True),
+        sa.Column("expected_delivery_date", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "facility_stock_summary",
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), primary_key=True),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), primary_key=True),
+        sa.Column("quantity_on_hand", sa.Integer(), nullable=False),
+        sa.Column("reorder_level", sa.Integer(), nullable=False),
+        sa.Column("quantity_on_order", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "facility_expiry_summary",
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), primary_key=True),
+        sa.Column("expiry_date", sa.Date(), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+
+def downgrade() -> None:
+    op.drop_table("facility_expiry_summary")
+    op.drop_table("facility_stock_summary")
+    op.drop_table("purchase_orders")
+    op.drop_table("transfers")
+    op.drop_table("requisition")
+    op.drop_table("inventory")
+    op.drop_table("users")
+    op.drop_table("vendors")
+    op.drop_table("medications")
+    op.drop_table("facilities")
+    bind = op.get_bind()
+    for enum in (requisition_status, user_role, facility_type):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,105 @@
+"""Indexes for foreign keys and hot access paths, unique inventory lots
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, extra keyword arguments for op.create_index)
+INDEXES = [
+    ("ix_facilities_state_city", "facilities", ["state", "city"], {}),
+    ("ix_users_facility_id", "users", ["facility_id"], {}),
+    ("ix_inventory_expiry_facility_medication", "inventory", ["expiry_date", "facility_id", "medication_id"], {}),
+    ("ix_inventory_medication_facility", "inventory", ["medication_id", "facility_id"], {"postgresql_include": ["quantity"]}),
+    ("ix_requisition_facility_medication_status", "requisition", ["facility_id", "medication_id", "status"], {}),
+    ("ix_requisition_facility_status", "requisition", ["facility_id", "status"], {}),
+    ("ix_requisition_status_requested_at", "requisition", ["status", "requested_at"], {}),
+    ("ix_requisition_medication_id", "requisition", ["medication_id"], {}),
+    ("ix_transfers_from_facility_id", "transfers", ["from_facility_id"], {}),
+    ("ix_transfers_to_facility_id", "transfers", ["to_facility_id"], {}),
+    ("ix_transfers_medication_id", "transfers", ["medication_id"], {}),
+    ("ix_transfers_transfer_date", "transfers", ["transfer_date"], {}),
+    ("ix_purchase_orders_vendor_id", "purchase_orders", ["vendor_id"], {}),
+    ("ix_purchase_orders_requisition_id", "purchase_orders", ["requisition_id"], {}),
+    (
+        "ix_stock_summary_below_reorder",
+        "facility_stock_summary",
+        ["facility_id", "medication_id"],
+        {
+            "postgresql_where": sa.text("quantity_on_hand < reorder_level"),
+            "sqlite_where": sa.text("quantity_on_hand < reorder_level"),
+        },
+    ),
+    ("ix_stock_summary_updated_at", "facility_stock_summary", ["updated_at"], {}),
+]
+
+def _merge_duplicate_lots() -> None:
+    # Rows for the same (facility, medication, expiry date) are folded into
+    # one so the unique constraint can be created.
+    op.execute(
+        """
+        UPDATE inventory SET quantity = (
+            SELECT SUM(other.quantity) FROM inventory AS other
+            WHERE other.facility_id = inventory.facility_id
+              AND other.medication_id = inventory.medication_id
+              AND other.expiry_date = inventory.expiry_date
+        )
+        WHERE inventory_id IN (
+            SELECT inventory_id FROM (
+                SELECT inventory_id,
+                       ROW_NUMBER() OVER (PARTITION BY facility_id, medication_id, expiry_date ORDER BY inventory_id) AS position,
+                       COUNT(*) OVER (PARTITION BY facility_id, medication_id, expiry_date) AS copies
+                FROM inventory
+            ) AS lots
+            WHERE position = 1 AND copies > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM inventory WHERE inventory_id IN (
+            SELECT inventory_id FROM (
+                SELECT inventory_id,
+                       ROW_NUMBER() OVER (PARTITION BY facility_id, medication_id, expiry_date ORDER BY inventory_id) AS position
+                FROM inventory
+            ) AS lots
+            WHERE position > 1
+        )
+        """
+    )
+
+def upgrade() -> None:
+    _merge_duplicate_lots()
+    postgresql = op.get_bind().dialect.name == "postgresql"
+
+    if postgresql:
+        # Build the indexes without blocking writes to tables that already hold
+        # data; CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "uq_inventory_lot", "inventory", ["facility_id", "medication_id", "expiry_date"],
+                unique=True, postgresql_concurrently=True,
+            )
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+        op.execute("ALTER TABLE inventory ADD CONSTRAINT uq_inventory_lot UNIQUE USING INDEX uq_inventory_lot")
+    else:
+        with op.batch_alter_table("inventory") as batch_op:
+            batch_op.create_unique_constraint("uq_inventory_lot", ["facility_id", "medication_id", "expiry_date"])
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, **kwargs)
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("inventory") as batch_op:
+        batch_op.drop_constraint("uq_inventory_lot", type_="unique")
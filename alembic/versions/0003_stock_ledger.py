@@ -0,0 +1,121 @@
+"""Append-only stock movement ledger and balance snapshots
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:00:00
+
+"""
+import uuid
+from datetime import date, datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+movement_type = sa.Enum(
+    "opening", "receipt", "transfer_out", "transfer_in", "dispense", "adjustment", name="movementtype"
+)
+
+# Monthly partitions created up front on PostgreSQL, starting with the current month
+INITIAL_PARTITION_MONTHS = 3
+
+def _create_partitions(start: date) -> None:
+    # Rows outside every monthly partition land in the default one
+    op.execute("CREATE TABLE stock_movements_default PARTITION OF stock_movements DEFAULT")
+    first = start.replace(day=1)
+    for _ in range(INITIAL_PARTITION_MONTHS):
+        following = (first + timedelta(days=32)).replace(day=1)
+        op.execute(
+            f"CREATE TABLE stock_movements_p{first:%Y_%m} PARTITION OF stock_movements "
+            f"FOR VALUES FROM ('{first.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        first = following
+
+def _seed_opening_balances(opened_at: datetime) -> None:
+    # Stock already on hand enters the ledger as one opening movement per lot
+    bind = op.get_bind()
+    inventory = sa.table(
+        "inventory",
+        sa.column("inventory_id", sa.Uuid(as_uuid=True)),
+        sa.column("facility_id", sa.Uuid(as_uuid=True)),
+        sa.column("medication_id", sa.Uuid(as_uuid=True)),
+        sa.column("expiry_date", sa.Date()),
+        sa.column("quantity", sa.Integer()),
+    )
+    lots = bind.execute(sa.select(inventory).where(inventory.c.quantity != 0)).all()
+    movements = sa.table(
+        "stock_movements",
+        sa.column("movement_id", sa.Uuid(as_uuid=True)),
+        sa.column("occurred_at", sa.DateTime()),
+        sa.column("facility_id", sa.Uuid(as_uuid=True)),
+        sa.column("medication_id", sa.Uuid(as_uuid=True)),
+        sa.column("expiry_date", sa.Date()),
+        sa.column("quantity", sa.Integer()),
+        sa.column("movement_type", movement_type),
+        sa.column("reference_id", sa.Uuid(as_uuid=True)),
+    )
+    rows = [
+        {
+            "movement_id": uuid.uuid4(),
+            "occurred_at": opened_at,
+            "facility_id": lot.facility_id,
+            "medication_id": lot.medication_id,
+            "expiry_date": lot.expiry_date,
+            "quantity": lot.quantity,
+            "movement_type": "opening",
+            "reference_id": lot.inventory_id,
+        }
+        for lot in lots
+    ]
+    for start in range(0, len(rows), 1000):
+        bind.execute(movements.insert(), rows[start:start + 1000])
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    opened_at = datetime.utcnow()
+
+    op.create_table(
+        "stock_movements",
+        sa.Column("movement_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), nullable=False),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), nullable=False),
+        sa.Column("expiry_date", sa.Date(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("movement_type", movement_type, nullable=False),
+        sa.Column("reference_id", sa.Uuid(as_uuid=True), nullable=True),
+        # A partitioned table's primary key must include the partition column
+        sa.PrimaryKeyConstraint("movement_id", "occurred_at"),
+        postgresql_partition_by="RANGE (occurred_at)",
+    )
+    op.create_index(
+        "ix_stock_movements_facility_medication_occurred_at",
+        "stock_movements",
+        ["facility_id", "medication_id", "occurred_at"],
+        postgresql_include=["quantity"],
+    )
+    op.create_table(
+        "stock_balance_snapshots",
+        sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), primary_key=True),
+        sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), primary_key=True),
+        sa.Column("as_of", sa.DateTime(), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_stock_balance_snapshots_as_of", "stock_balance_snapshots", ["as_of"])
+
+    if postgresql:
+        _create_partitions(opened_at.date())
+    _seed_opening_balances(opened_at)
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_balance_snapshots_as_of", table_name="stock_balance_snapshots")
+    op.drop_table("stock_balance_snapshots")
+    # Dropping the partitioned table drops its partitions with it
+    op.drop_index("ix_stock_movements_facility_medication_occurred_at", table_name="stock_movements")
+    op.drop_table("stock_movements")
+    movement_type.drop(op.get_bind(), checkfirst=True)
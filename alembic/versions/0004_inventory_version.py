@@ -0,0 +1,24 @@
+"""Version column on inventory lots for optimistic concurrency
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing lots start at version 1, as new ones do
+    with op.batch_alter_table("inventory") as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+def downgrade() -> None:
+    with op.batch_alter_table("inventory") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,30 @@
+"""Transfer status, so planned redistributions can be stored as drafts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+transfer_status = sa.Enum("draft", "completed", name="transferstatus")
+
+def upgrade() -> None:
+    transfer_status.create(op.get_bind(), checkfirst=True)
+    # Every existing transfer has already moved its stock
+    with op.batch_alter_table("transfers") as batch_op:
+        batch_op.add_column(sa.Column("status", transfer_status, nullable=False, server_default="completed"))
+    op.create_index("ix_transfers_status", "transfers", ["status"])
+
+def downgrade() -> None:
+    op.drop_index("ix_transfers_status", table_name="transfers")
+    with op.batch_alter_table("transfers") as batch_op:
+        batch_op.drop_column("status")
+    transfer_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,59 @@
+"""Durable background job queue and recurring job schedules
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+job_status = sa.Enum("queued", "running", "succeeded", "failed", "cancelled", name="jobstatus")
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("job_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("schedule_name", sa.String(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_jobs_status_priority_run_at", "jobs", ["status", "priority", "run_at"])
+    op.create_index("ix_jobs_job_type_created_at", "jobs", ["job_type", "created_at"])
+    op.create_table(
+        "job_schedules",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("cron", sa.String(), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("next_run_at", sa.DateTime(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_job_schedules_next_run_at", "job_schedules", ["next_run_at"])
+
+def downgrade() -> None:
+    op.drop_index("ix_job_schedules_next_run_at", table_name="job_schedules")
+    op.drop_table("job_schedules")
+    op.drop_index("ix_jobs_job_type_created_at", table_name="jobs")
+    op.drop_index("ix_jobs_status_priority_run_at", table_name="jobs")
+    op.drop_table("jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
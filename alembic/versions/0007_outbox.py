@@ -0,0 +1,47 @@
+"""Transactional outbox for inventory, transfer and requisition changes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("event_id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("aggregate_type", sa.String(), nullable=False),
+        sa.Column("aggregate_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sequence", sa.BigInteger(), nullable=True),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("sequence", name="uq_outbox_events_sequence"),
+    )
+    op.create_index(
+        "ix_outbox_events_unpublished", "outbox_events", ["event_id"],
+        postgresql_where=sa.text("sequence IS NULL"), sqlite_where=sa.text("sequence IS NULL"),
+    )
+    op.create_index("ix_outbox_events_published_at", "outbox_events", ["published_at"])
+    relay_state = op.create_table(
+        "outbox_relay_state",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("last_sequence", sa.BigInteger(), nullable=False),
+        sa.Column("last_published_at", sa.DateTime(), nullable=True),
+    )
+    op.bulk_insert(relay_state, [{"name": "default", "last_sequence": 0}])
+
+def downgrade() -> None:
+    op.drop_table("outbox_relay_state")
+    op.drop_index("ix_outbox_events_published_at", table_name="outbox_events")
+    op.drop_index("ix_outbox_events_unpublished", table_name="outbox_events")
+    op.drop_table("outbox_events")
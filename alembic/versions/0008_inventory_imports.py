@@ -0,0 +1,35 @@
+"""Stock-count import status, shared by every API worker
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+import_status = sa.Enum("queued", "running", "completed", "failed", name="importstatus")
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_imports",
+        sa.Column("job_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("status", import_status, nullable=False),
+        sa.Column("rows_read", sa.Integer(), nullable=False),
+        sa.Column("rows_imported", sa.Integer(), nullable=False),
+        sa.Column("rows_failed", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+def downgrade() -> None:
+    op.drop_table("inventory_imports")
+    import_status.drop(op.get_bind(), checkfirst=True)
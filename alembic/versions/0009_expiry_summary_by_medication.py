@@ -0,0 +1,48 @@
+"""Expiry summary per medication, and received/cancelled requisitions
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+def _create_expiry_summary(by_medication: bool) -> None:
+    columns = [sa.Column("facility_id", sa.Uuid(as_uuid=True), sa.ForeignKey("facilities.facility_id"), primary_key=True)]
+    if by_medication:
+        columns.append(
+            sa.Column("medication_id", sa.Uuid(as_uuid=True), sa.ForeignKey("medications.medication_id"), primary_key=True)
+        )
+    columns += [sa.Column("expiry_date", sa.Date(), primary_key=True), sa.Column("quantity", sa.Integer(), nullable=False)]
+    op.create_table("facility_expiry_summary", *columns)
+    # Repopulated from inventory, the same way StockSummaryRepository.rebuild() does
+    keys = "facility_id, medication_id, expiry_date" if by_medication else "facility_id, expiry_date"
+    op.execute(
+        f"INSERT INTO facility_expiry_summary ({keys}, quantity) "
+        f"SELECT {keys}, sum(quantity) FROM inventory GROUP BY {keys}"
+    )
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # New enum values cannot be used in the transaction that adds them
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE requisitionstatus ADD VALUE IF NOT EXISTS 'received'")
+            op.execute("ALTER TYPE requisitionstatus ADD VALUE IF NOT EXISTS 'cancelled'")
+    op.drop_table("facility_expiry_summary")
+    _create_expiry_summary(by_medication=True)
+    op.create_index("ix_expiry_summary_facility_expiry", "facility_expiry_summary", ["facility_id", "expiry_date"])
+
+def downgrade() -> None:
+    op.drop_index("ix_expiry_summary_facility_expiry", table_name="facility_expiry_summary")
+    op.drop_table("facility_expiry_summary")
+    _create_expiry_summary(by_medication=False)
+    # PostgreSQL cannot drop enum values; received and cancelled stay defined but unused
+    op.execute("UPDATE requisition SET status = 'approved' WHERE status = 'received'")
+    op.execute("UPDATE requisition SET status = 'rejected' WHERE status = 'cancelled'")
@@ -1,27 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 
-from app.core.security import create_access_token, verify_password
+from app.core.auth import get_current_user, principal_claims
+from app.core.security import create_access_token
+from app.db.async_session import get_async_db
 from app.db.session import get_db
 from app.models.user import User
-from app.services import user_service
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService
 from app.schemas.user import Token
 from app.core.config import settings
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user_service = UserService(db)
+    user_service = AsyncUserService(db)
     
-    # Authenticate the user
-    user = user_service.authenticate_user(form_data.username, form_data.password)
+    # Authenticate the user; bcrypt runs in its own process pool and a full
+    # queue is answered with 503 rather than waited on
+    user = await user_service.authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,21 +35,19 @@ def login_for_access_token(
     # Create the access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=principal_claims(user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 # Optionally, add a route to refresh tokens (if using refresh tokens)
 @router.post("/refresh", response_model=Token)
 def refresh_access_token(
-    current_user: User = Depends(user_service.get_current_user),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    user_service = UserService(db)
-
     # You might check if the user's session is still valid or implement other logic
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": current_user.username}, expires_delta=access_token_expires
+        data=principal_claims(current_user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,58 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.outbox import OutboxEvent as OutboxEventSchema
+from app.services.outbox_service import OutboxFeedService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[OutboxEventSchema])
+async def read_events(
+    response: Response,
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=settings.OUTBOX_LONG_POLL_TIMEOUT),
+    aggregate_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    """
+    Published change events after sequence ``after`` (from now when not
+    given), waiting up to ``wait`` seconds for some when there are none.
+    X-Last-Sequence is the ``after`` to send next.
+    """
+    db.close()  # Authentication is done; don't hold its connection while waiting
+    service = OutboxFeedService()
+    position = await service.start_position(after, aggregate_type)
+    events, position = await service.poll(position, limit, aggregate_type, wait)
+    response.headers["X-Last-Sequence"] = str(position)
+    return events
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    after: Optional[int] = Query(None, ge=0),
+    aggregate_type: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None),  # Sent by EventSource when it reconnects
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    """
+    Server-sent events for every change published after ``after`` (or the
+    Last-Event-ID header), from now when neither is given.
+    """
+    db.close()  # Authentication is done; the stream must not hold its connection
+    service = OutboxFeedService()
+    position = await service.start_position(last_event_id if last_event_id is not None else after, aggregate_type)
+    return StreamingResponse(
+        service.stream(position, aggregate_type, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
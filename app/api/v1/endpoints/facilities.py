@@ -1 +1,84 @@
-# Placeholder for app/api/v1/endpoints/facilities.py
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.response_cache import next_cursor_headers, response_cache
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.facility import FacilityDetail, FacilityListItem
+from app.schemas.stock_summary import FacilityStockSummary
+from app.services.facility_service import FacilityService
+from app.services.stock_feed_service import stock_feed
+from app.services.stock_summary_service import StockSummaryService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[FacilityListItem])
+def list_facilities(
+    request: Request,
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    def build():
+        facilities, next_cursor = FacilityService(db).list_facilities(state=state, city=city, after=cursor, limit=limit)
+        return facilities, next_cursor_headers(next_cursor)
+
+    # Served from the response cache, with an ETag for conditional requests
+    return response_cache.respond(request, "facilities", build)
+
+@router.get("/{facility_id}", response_model=FacilityDetail)
+def get_facility(
+    facility_id: UUID,
+    transfer_days: int = Query(30, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return FacilityService(db).get_detail(facility_id, transfer_days=transfer_days)
+
+@router.get("/{facility_id}/stock-summary", response_model=FacilityStockSummary)
+def get_stock_summary(
+    facility_id: UUID,
+    expiring_within_days: int = Query(90, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return StockSummaryService(db).get_facility_summary(facility_id, expiring_within_days)
+
+@router.get("/{facility_id}/stock/stream")
+async def stream_facility_stock(
+    facility_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    """
+    Server-sent events with the facility's stock: a ``snapshot`` of every
+    lot, then a ``stock`` event whenever one changes.
+    """
+    db.close()  # Authentication is done; the stream must not hold its connection
+    await stock_feed.check_facility(facility_id)
+    return StreamingResponse(
+        stock_feed.stream(facility_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/stock-summary/rebuild", status_code=status.HTTP_204_NO_CONTENT)
+def rebuild_stock_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # A full delete and rebuild of the summary tables; maintenance only
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to rebuild the stock summary."
+        )
+    StockSummaryService(db).rebuild()
@@ -1 +1,174 @@
-# Placeholder for app/api/v1/endpoints/inventory.py
+import shutil
+import tempfile
+from datetime import datetime
+from uuid import UUID
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.user import User
+from app.repositories.inventory_repository import InventoryRepository
+from app.schemas.inventory import (
+    DispenseRequest,
+    DispenseResult,
+    InventoryImportStatus,
+    NearExpiryLot,
+    NearExpiryReport,
+    RedistributionSuggestion,
+)
+from app.schemas.stock_ledger import SnapshotResult, StockBalance, StockMovement
+from app.services.expiry_service import NearExpiryService
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_response
+from app.services.inventory_import_service import create_import_job, get_import_job
+from app.services.inventory_service import InventoryService
+from app.services.stock_ledger_service import StockLedgerService
+
+router = APIRouter()
+
+IMPORT_FORMATS = {"csv": ".csv", "ndjson": ".ndjson"}
+
+@router.post("/imports", response_model=InventoryImportStatus, status_code=status.HTTP_202_ACCEPTED)
+def import_stock_count(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Infer the format from the file name unless the client states it
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format. Use one of: {', '.join(IMPORT_FORMATS)}."
+        )
+
+    # Spool the upload to disk in fixed-size chunks; a job worker runs the
+    # import, so it survives a restart of this process.
+    with tempfile.NamedTemporaryFile(
+        suffix=IMPORT_FORMATS[format], dir=settings.IMPORT_SPOOL_DIR, delete=False
+    ) as spooled:
+        shutil.copyfileobj(file.file, spooled, 1024 * 1024)
+
+    return create_import_job(db, file.filename, spooled.name, format)
+
+@router.get("/imports/{job_id}", response_model=InventoryImportStatus)
+def get_import_status(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    job = get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found."
+        )
+    return job
+
+@router.get("/export")
+def export_inventory(
+    format: str = "csv",
+    facility_id: Optional[UUID] = None,
+    medication_id: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}."
+        )
+    stmt = InventoryRepository(db).export_query(facility_id=facility_id, medication_id=medication_id)
+    return export_response(stmt, format, "inventory")
+
+@router.post("/dispense", response_model=DispenseResult)
+def dispense_stock(
+    dispense_in: DispenseRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return InventoryService(db).dispense(dispense_in)
+
+@router.get("/near-expiry", response_model=NearExpiryReport)
+def get_near_expiry_report(
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return NearExpiryService(db).get_report(state=state, city=city)
+
+@router.get("/near-expiry/lots", response_model=List[NearExpiryLot])
+def list_near_expiry_lots(
+    response: Response,
+    within_days: int = Query(30, ge=0),
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    lots, next_cursor = NearExpiryService(db).list_lots(within_days, state=state, city=city, after=cursor, limit=limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return lots
+
+@router.get("/near-expiry/redistribution", response_model=List[RedistributionSuggestion])
+def suggest_redistribution(
+    within_days: int = Query(90, ge=0),
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return NearExpiryService(db).suggest_redistribution(within_days=within_days, state=state, city=city)
+
+@router.get("/ledger/balance", response_model=StockBalance)
+def get_stock_balance(
+    facility_id: UUID,
+    medication_id: UUID,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return StockLedgerService(db).get_balance(facility_id, medication_id, as_of=as_of)
+
+@router.get("/ledger/movements", response_model=List[StockMovement])
+def list_stock_movements(
+    response: Response,
+    facility_id: Optional[UUID] = None,
+    medication_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    movements, next_cursor = StockLedgerService(db).list_movements(
+        facility_id=facility_id, medication_id=medication_id, start=start, end=end, after=cursor, limit=limit
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return movements
+
+@router.post("/ledger/snapshots", response_model=SnapshotResult)
+def take_balance_snapshots(
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # A snapshot closes the ledger up to as_of, so only admins may take one
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to take balance snapshots."
+        )
+    return StockLedgerService(db).take_snapshots(as_of=as_of)
@@ -0,0 +1,97 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.db.session import get_db
+from app.models.job import JobStatus
+from app.models.user import User
+from app.schemas.job import Job as JobSchema, JobCreate, JobSchedule as JobScheduleSchema, JobScheduleUpdate
+from app.services.job_service import JobService
+
+router = APIRouter()
+
+@router.post("/", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_job(
+    job_in: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to enqueue jobs."
+        )
+    return JobService(db).enqueue(job_in)
+
+@router.get("/", response_model=List[JobSchema])
+def list_jobs(
+    response: Response,
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    job_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    jobs, next_cursor = JobService(db).list_jobs(job_status=job_status, job_type=job_type, after=cursor, limit=limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return jobs
+
+@router.get("/schedules", response_model=List[JobScheduleSchema])
+def list_job_schedules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return JobService(db).list_schedules()
+
+@router.put("/schedules/{name}", response_model=JobScheduleSchema)
+def put_job_schedule(
+    name: str,
+    schedule_in: JobScheduleUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to change job schedules."
+        )
+    return JobService(db).put_schedule(name, schedule_in)
+
+@router.delete("/schedules/{name}", response_model=JobScheduleSchema)
+def delete_job_schedule(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete job schedules."
+        )
+    return JobService(db).delete_schedule(name)
+
+@router.get("/{job_id}", response_model=JobSchema)
+def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return JobService(db).get_job(job_id)
+
+@router.post("/{job_id}/cancel", response_model=JobSchema)
+def cancel_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to cancel jobs."
+        )
+    return JobService(db).cancel_job(job_id)
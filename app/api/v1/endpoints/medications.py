@@ -1 +1,84 @@
-# Placeholder for app/api/v1/endpoints/medications.py
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.response_cache import next_cursor_headers, response_cache
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.medication import (
+    Medication as MedicationSchema,
+    MedicationCreate,
+    MedicationDetail,
+    MedicationListItem,
+    MedicationUpdate,
+)
+from app.services.medication_service import MedicationService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[MedicationListItem])
+def list_medications(
+    request: Request,
+    name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    def build():
+        medications, next_cursor = MedicationService(db).list_medications(name=name, after=cursor, limit=limit)
+        return medications, next_cursor_headers(next_cursor)
+
+    # Served from the response cache, with an ETag for conditional requests
+    return response_cache.respond(request, "medications", build)
+
+@router.post("/", response_model=MedicationSchema, status_code=status.HTTP_201_CREATED)
+def create_medication(
+    medication_in: MedicationCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to create medications."
+        )
+    return MedicationService(db).create_medication(medication_in)
+
+@router.get("/{medication_id}", response_model=MedicationDetail)
+def get_medication(
+    medication_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return MedicationService(db).get_detail(medication_id)
+
+@router.put("/{medication_id}", response_model=MedicationSchema)
+def update_medication(
+    medication_id: UUID,
+    medication_in: MedicationUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to update medications."
+        )
+    return MedicationService(db).update_medication(medication_id, medication_in)
+
+@router.delete("/{medication_id}", response_model=MedicationSchema)
+def delete_medication(
+    medication_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete medications."
+        )
+    return MedicationService(db).delete_medication(medication_id)
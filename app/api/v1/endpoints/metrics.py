@@ -0,0 +1,83 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import get_current_user, principal_cache
+from app.core.metrics import gauge_lines, registry
+from app.core.response_cache import response_cache
+from app.core.security import password_pool_stats
+from app.db.pool_metrics import pool_snapshot
+from app.models.user import User
+from app.services.expiry_service import near_expiry_cache
+
+router = APIRouter()
+
+# Served at the application root (/metrics) for the Prometheus scraper
+prometheus_router = APIRouter()
+
+CACHES = {
+    "principal": principal_cache,
+    "near_expiry": near_expiry_cache,
+    "response": response_cache,
+}
+
+def _pool_lines() -> List[str]:
+    # Wait and hold times, checkouts and timeouts are registry metrics of their own
+    engines = pool_snapshot()["engines"]
+    lines: List[str] = []
+    for metric, documentation in (
+        ("size", "Configured pool size."),
+        ("checked_out", "Connections currently checked out."),
+        ("overflow", "Connections open beyond the pool size."),
+        ("peak_checked_out", "Most connections checked out at once."),
+    ):
+        lines += gauge_lines(
+            f"db_pool_{metric}", documentation,
+            [({"engine": name}, stats[metric]) for name, stats in engines.items() if metric in stats],
+        )
+    return lines
+
+def _cache_lines() -> List[str]:
+    stats = {name: cache.stats() for name, cache in CACHES.items()}
+    return (
+        gauge_lines("cache_hits_total", "Cache hits.", [({"cache": name}, s["hits"]) for name, s in stats.items()], kind="counter")
+        + gauge_lines("cache_misses_total", "Cache misses.", [({"cache": name}, s["misses"]) for name, s in stats.items()], kind="counter")
+        + gauge_lines("cache_entries", "Entries held.", [({"cache": name}, s["size"]) for name, s in stats.items() if s["size"] is not None])
+        + gauge_lines(
+            "response_cache_not_modified_total", "Cached responses answered with 304 Not Modified.",
+            [({}, response_cache.stats()["not_modified"])], kind="counter",
+        )
+    )
+
+def _password_pool_lines() -> List[str]:
+    return gauge_lines(
+        "password_hash_pending", "Password hash/verify calls running or queued.", [({}, password_pool_stats()["pending"])]
+    )
+
+registry.add_collector(_pool_lines)
+registry.add_collector(_cache_lines)
+registry.add_collector(_password_pool_lines)
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_prometheus_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/pool")
+def get_pool_metrics(
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    """
+    Connection pool occupancy, checkout wait and hold times per engine, and
+    connection use per route, for sizing DB_POOL_SIZE per worker.
+    """
+    return pool_snapshot()
+
+@router.get("/caches")
+def get_cache_metrics(
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    """
+    Size, hits, misses and hit ratio of each in-process cache.
+    """
+    return {name: cache.stats() for name, cache in CACHES.items()}
@@ -1 +1,24 @@
 # Placeholder for app/api/v1/endpoints/purchase_orders.py
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.purchase_order import OrderSuggestionReport
+from app.services.forecast_service import ForecastService
+
+router = APIRouter()
+
+@router.get("/suggestions", response_model=OrderSuggestionReport)
+def suggest_purchase_orders(
+    facility_id: Optional[UUID] = None,
+    vendor_id: Optional[UUID] = None,
+    include_zero: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return ForecastService(db).suggest_orders(facility_id=facility_id, vendor_id=vendor_id, include_zero=include_zero)
@@ -1 +1,116 @@
-# Placeholder for app/api/v1/endpoints/requisitions.py
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.db.session import get_db
+from app.models.requisition import RequisitionStatus
+from app.models.user import DECIDING_ROLES, User
+from app.repositories.requisition_repository import RequisitionRepository
+from app.schemas.requisition import (
+    ReorderScanResult,
+    RequisitionApprovalBatch,
+    RequisitionBatch,
+    RequisitionBatchResult,
+)
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_response
+from app.services.reorder_service import ReorderService
+from app.services.requisition_service import RequisitionService
+
+router = APIRouter()
+
+@router.get("/export")
+def export_requisitions(
+    format: str = "csv",
+    facility_id: Optional[UUID] = None,
+    requisition_status: Optional[RequisitionStatus] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}."
+        )
+    stmt = RequisitionRepository(db).export_query(facility_id=facility_id, status=requisition_status)
+    return export_response(stmt, format, "requisitions")
+
+@router.post("/reorder-scan", response_model=ReorderScanResult)
+def run_reorder_scan(
+    since: Optional[datetime] = None,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # The scan drafts requisitions for every facility in the state
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to run the reorder scan."
+        )
+    return ReorderService(db).scan(since=since, dry_run=dry_run)
+
+@router.post("/submit-batch", response_model=RequisitionBatchResult)
+def submit_requisitions(
+    batch: RequisitionBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Facility staff may only submit their own facility's requisitions
+    facility_id = None if current_user.role in DECIDING_ROLES else current_user.facility_id
+    return RequisitionService(db).submit_batch(batch, facility_id=facility_id)
+
+@router.post("/approve-batch", response_model=RequisitionBatchResult)
+def approve_requisitions(
+    batch: RequisitionApprovalBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Ensure the requester may decide requisitions (state officials and admins)
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to approve requisitions."
+        )
+    return RequisitionService(db).approve_batch(batch)
+
+@router.post("/reject-batch", response_model=RequisitionBatchResult)
+def reject_requisitions(
+    batch: RequisitionBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Ensure the requester may decide requisitions (state officials and admins)
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to reject requisitions."
+        )
+    return RequisitionService(db).reject_batch(batch)
+
+@router.post("/receive-batch", response_model=RequisitionBatchResult)
+def receive_requisitions(
+    batch: RequisitionBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Facility staff may only book receipts for their own facility
+    facility_id = None if current_user.role in DECIDING_ROLES else current_user.facility_id
+    return RequisitionService(db).receive_batch(batch, facility_id=facility_id)
+
+@router.post("/cancel-batch", response_model=RequisitionBatchResult)
+def cancel_requisitions(
+    batch: RequisitionBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    # Ensure the requester may decide requisitions (state officials and admins)
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to cancel requisitions."
+        )
+    return RequisitionService(db).cancel_batch(batch)
@@ -1 +1,71 @@
-# Placeholder for app/api/v1/endpoints/transfers.py
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.db.session import get_db
+from app.models.user import DECIDING_ROLES, User
+from app.repositories.transfer_repository import TransferRepository
+from app.models.transfer import TransferStatus
+from app.schemas.transfer import RedistributionPlanResult, Transfer as TransferSchema, TransferCreate
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_response
+from app.services.redistribution_service import RedistributionService
+from app.services.transfer_service import TransferService
+
+router = APIRouter()
+
+@router.post("/", response_model=TransferSchema, status_code=status.HTTP_201_CREATED)
+def create_transfer(
+    transfer_in: TransferCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return TransferService(db).create_transfer(transfer_in)
+
+@router.post("/redistribution", response_model=RedistributionPlanResult)
+def plan_redistribution(
+    state: str,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to plan redistributions."
+        )
+    return RedistributionService(db).plan(state=state, dry_run=dry_run)
+
+@router.post("/{transfer_id}/confirm", response_model=TransferSchema)
+def confirm_transfer(
+    transfer_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if current_user.role not in DECIDING_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to confirm transfers."
+        )
+    return TransferService(db).confirm_draft(transfer_id)
+
+@router.get("/export")
+def export_transfers(
+    format: str = "csv",
+    facility_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    transfer_status: Optional[TransferStatus] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}."
+        )
+    stmt = TransferRepository(db).export_query(facility_id=facility_id, start=start, end=end, status=transfer_status)
+    return export_response(stmt, format, "transfers")
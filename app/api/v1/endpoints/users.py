@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.security import get_current_user
+from app.core.auth import get_current_user
 from app.db.session import get_db
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
 from app.models.user import User
@@ -87,13 +87,25 @@ def delete_user(
 
 @router.get("/", response_model=List[UserSchema])
 def list_users(
-    skip: int = 0,
-    limit: int = 10,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    order_by: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
 ):
     user_service = UserService(db)
-    return user_service.list_users(skip=skip, limit=limit)
+
+    # Offset paging is kept for existing clients; everyone else gets keyset
+    # pages and follows the X-Next-Cursor header to the next one.
+    if skip:
+        return user_service.list_users(skip=skip, limit=limit)
+
+    users, next_cursor = user_service.list_users_page(cursor=cursor, order_by=order_by, limit=limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 @router.put("/{user_id}/password", response_model=UserSchema)
 def update_user_password(
@@ -1 +1,81 @@
-# Placeholder for app/api/v1/endpoints/vendors.py
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.response_cache import next_cursor_headers, response_cache
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.vendor import Vendor as VendorSchema, VendorCreate, VendorListItem, VendorUpdate
+from app.services.vendor_service import VendorService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[VendorListItem])
+def list_vendors(
+    request: Request,
+    name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    def build():
+        vendors, next_cursor = VendorService(db).list_vendors(name=name, after=cursor, limit=limit)
+        return vendors, next_cursor_headers(next_cursor)
+
+    # Served from the response cache, with an ETag for conditional requests
+    return response_cache.respond(request, "vendors", build)
+
+@router.post("/", response_model=VendorSchema, status_code=status.HTTP_201_CREATED)
+def create_vendor(
+    vendor_in: VendorCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to create vendors."
+        )
+    return VendorService(db).create_vendor(vendor_in)
+
+@router.get("/{vendor_id}", response_model=VendorSchema)
+def get_vendor(
+    vendor_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    return response_cache.respond(
+        request, "vendors", lambda: (VendorSchema.from_orm(VendorService(db).get_vendor(vendor_id)), {})
+    )
+
+@router.put("/{vendor_id}", response_model=VendorSchema)
+def update_vendor(
+    vendor_id: UUID,
+    vendor_in: VendorUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to update vendors."
+        )
+    return VendorService(db).update_vendor(vendor_id, vendor_in)
+
+@router.delete("/{vendor_id}", response_model=VendorSchema)
+def delete_vendor(
+    vendor_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)  # Ensure the requester is authenticated
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete vendors."
+        )
+    return VendorService(db).delete_vendor(vendor_id)
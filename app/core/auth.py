@@ -1,23 +1,72 @@
 # app/core/auth.py
 
+import asyncio
+import sys
+import time
+from typing import Any, Dict, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import TTLCache
 from app.core.security import verify_access_token
-from app.models.user import User
-from app.db.session import SessionLocal
+from app.models.user import User, UserRole
+from app.db.session import get_db  # The endpoints' own, so one session serves both and they can release it
 from app.schemas.user import TokenData
 from app.core.config import settings
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+# Authenticated users by username (the token subject). Entries are dropped
+# when the user's password, status or record changes in this process; other
+# processes see such changes once the entry expires.
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
+
+# Columns kept in the cache; the password hash is left out and loads on access
+PRINCIPAL_COLUMNS = ("user_id", "facility_id", "username", "role")
+
+def principal_claims(user: User) -> Dict[str, Any]:
+    """
+    Claims to sign into an access token so that, with AUTH_TRUST_TOKEN_CLAIMS,
+    the user can be rebuilt from the token without a database lookup.
+    """
+    return {
+        "sub": user.username,
+        "uid": str(user.user_id),
+        "role": user.role.value,
+        "fid": str(user.facility_id),
+    }
 
-def get_db():
-    db = SessionLocal()
+def invalidate_principal(username: str) -> None:
+    principal_cache.delete(username)
+
+def _attach(db: Session, values: Dict[str, Any]) -> User:
+    # Rebuild the user as a persistent instance of this session without a
+    # SELECT, so lazy relationships (facility) still load on demand.
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+def _load_principal(db: Session, username: str) -> Optional[Dict[str, Any]]:
+    columns = [getattr(User, name) for name in PRINCIPAL_COLUMNS]
+    row = db.execute(select(*columns).where(User.username == username)).first()
+    return dict(zip(PRINCIPAL_COLUMNS, row)) if row is not None else None
+
+def _claims_principal(token_data: TokenData) -> Optional[Dict[str, Any]]:
+    if token_data.user_id is None or token_data.role is None or token_data.facility_id is None:
+        return None
     try:
-        yield db
-    finally:
-        db.close()
+        role = UserRole(token_data.role)
+    except ValueError:
+        return None
+    return {
+        "user_id": token_data.user_id,
+        "facility_id": token_data.facility_id,
+        "username": token_data.username,
+        "role": role,
+    }
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
@@ -26,12 +75,82 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_data = verify_access_token(token, credentials_exception)
-    user = db.query(User).filter(User.username == token_data.username).first()
-    if user is None:
-        raise credentials_exception
-    return user
+
+    values = _claims_principal(token_data) if settings.AUTH_TRUST_TOKEN_CLAIMS else None
+    if values is None:
+        values = principal_cache.get(token_data.username)
+    if values is None:
+        values = _load_principal(db, token_data.username)
+        if values is None:
+            raise credentials_exception
+        principal_cache.set(token_data.username, values)
+    return _attach(db, values)
 
 def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def _benchmark(requests: int, clients: int) -> None:
+    import httpx
+
+    # The module the application's routes depend on, not this __main__ copy
+    from app.core import auth
+    from app.core.security import create_access_token
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models.facility import Facility, FacilityType
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        facility = Facility(facility_name="Benchmark Clinic", facility_type=FacilityType.clinic,
+                            address="1 Hospital Road", state="Lagos", city="Ikeja")
+        db.add(facility)
+        db.flush()
+        user = User(facility_id=facility.facility_id, username=f"benchmark-{time.time_ns()}",
+                    password_hash="-", role=UserRole.facility_staff)
+        db.add(user)
+        db.commit()
+        subject_token = create_access_token({"sub": user.username})
+        claims_token = create_access_token(principal_claims(user))
+
+    async def run(label: str, token: str) -> None:
+        latencies = []
+        auth.principal_cache.clear()
+        hits, misses = auth.principal_cache.hits, auth.principal_cache.misses
+
+        async def client_loop(client: httpx.AsyncClient) -> None:
+            for _ in range(requests // clients):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/metrics/caches", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        print(
+            f"  {label:<14} {len(latencies) / elapsed:7.0f} req/s, p50 {latencies[len(latencies) // 2] * 1000:6.1f}ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.1f}ms; principal cache "
+            f"{auth.principal_cache.hits - hits} hits, {auth.principal_cache.misses - misses} misses"
+        )
+
+    print(f"{requests} authenticated requests from {clients} concurrent clients:")
+    ttl = auth.principal_cache.ttl
+    auth.principal_cache.ttl = 0  # Every entry is already expired: a user lookup per request, as before the cache
+    await run("no cache", subject_token)
+    auth.principal_cache.ttl = ttl
+    await run("cache", subject_token)
+    settings.AUTH_TRUST_TOKEN_CLAIMS = True
+    await run("token claims", claims_token)
+    engine.dispose()
+
+if __name__ == "__main__":
+    # python -m app.core.auth [requests] [concurrent clients]
+    # Runs against SQLALCHEMY_DATABASE_URI: point it at a scratch database, where a benchmark user is added
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(_benchmark(requests, clients))
@@ -22,6 +22,7 @@
 
 
 import os
+import tempfile
 from dotenv import load_dotenv
 from pydantic import BaseSettings
 
@@ -44,6 +45,130 @@ class Settings(BaseSettings):
         f"postgresql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
     )
 
+    # Connection pool, per engine and per uvicorn worker process. A statement
+    # timeout of 0 leaves the server default in place.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+    # Stock-moving transactions that lose a race (a lot changed under them,
+    # a deadlock or serialization failure) are retried this many times in
+    # total, sleeping a random time up to base * 2^attempt, capped at max.
+    DB_RETRY_ATTEMPTS: int = int(os.getenv("DB_RETRY_ATTEMPTS", 5))
+    DB_RETRY_BASE_DELAY: float = float(os.getenv("DB_RETRY_BASE_DELAY", 0.01))
+    DB_RETRY_MAX_DELAY: float = float(os.getenv("DB_RETRY_MAX_DELAY", 0.5))
+
+    # Async endpoints connect with this URL; by default it is derived from
+    # SQLALCHEMY_DATABASE_URI with the asyncpg (or aiosqlite) driver.
+    ASYNC_SQLALCHEMY_DATABASE_URI: str = os.getenv("ASYNC_SQLALCHEMY_DATABASE_URI", "")
+
+    # Development/test guard against N+1 queries: "warn" logs and "raise"
+    # fails requests that run more than QUERY_BUDGET_MAX_QUERIES statements,
+    # or one statement shape more than QUERY_BUDGET_MAX_REPEATS times.
+    QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "off")
+    QUERY_BUDGET_MAX_QUERIES: int = int(os.getenv("QUERY_BUDGET_MAX_QUERIES", 30))
+    QUERY_BUDGET_MAX_REPEATS: int = int(os.getenv("QUERY_BUDGET_MAX_REPEATS", 5))
+
+    # Number of rows sent per statement by the bulk repository methods
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", 1000))
+
+    # Stock-count uploads wait in IMPORT_SPOOL_DIR until a job worker imports
+    # them. When workers run outside the API process (`python -m app.worker`
+    # in another container or on another host) it must be shared storage
+    # mounted at the same path in both; the default temp dir only works for
+    # JOB_EMBEDDED_WORKERS or workers on the same machine.
+    IMPORT_SPOOL_DIR: str = os.getenv("IMPORT_SPOOL_DIR", tempfile.gettempdir())
+
+    # Largest requisition batch accepted by the batch approve/reject endpoints,
+    # and the delivery lead time assumed for purchase orders they raise
+    REQUISITION_BATCH_MAX_SIZE: int = int(os.getenv("REQUISITION_BATCH_MAX_SIZE", 20000))
+    PURCHASE_ORDER_LEAD_TIME_DAYS: int = int(os.getenv("PURCHASE_ORDER_LEAD_TIME_DAYS", 14))
+
+    # Order forecasting: demand is bucketed into periods of FORECAST_PERIOD_DAYS
+    # over the last FORECAST_HISTORY_PERIODS, with yearly seasonality. Orders
+    # cover the vendor lead time plus FORECAST_REVIEW_DAYS until the next
+    # order, with safety stock of FORECAST_SERVICE_Z forecast errors.
+    FORECAST_PERIOD_DAYS: int = int(os.getenv("FORECAST_PERIOD_DAYS", 7))
+    FORECAST_HISTORY_PERIODS: int = int(os.getenv("FORECAST_HISTORY_PERIODS", 104))
+    FORECAST_SEASON_PERIODS: int = int(os.getenv("FORECAST_SEASON_PERIODS", 52))
+    FORECAST_REVIEW_DAYS: int = int(os.getenv("FORECAST_REVIEW_DAYS", 7))
+    FORECAST_SERVICE_Z: float = float(os.getenv("FORECAST_SERVICE_Z", 1.65))
+
+    # Redistribution planning: moving stock costs REDISTRIBUTION_SAME_CITY_COST
+    # within a city and REDISTRIBUTION_OTHER_CITY_COST elsewhere in the state,
+    # less up to REDISTRIBUTION_EXPIRY_WEIGHT for stock expiring within
+    # REDISTRIBUTION_EXPIRY_HORIZON_DAYS. Medications are solved together in
+    # batches of about REDISTRIBUTION_BATCH_SIZE facility pairs.
+    REDISTRIBUTION_SAME_CITY_COST: float = float(os.getenv("REDISTRIBUTION_SAME_CITY_COST", 1.0))
+    REDISTRIBUTION_OTHER_CITY_COST: float = float(os.getenv("REDISTRIBUTION_OTHER_CITY_COST", 10.0))
+    REDISTRIBUTION_EXPIRY_WEIGHT: float = float(os.getenv("REDISTRIBUTION_EXPIRY_WEIGHT", 5.0))
+    REDISTRIBUTION_EXPIRY_HORIZON_DAYS: int = int(os.getenv("REDISTRIBUTION_EXPIRY_HORIZON_DAYS", 180))
+    REDISTRIBUTION_BATCH_SIZE: int = int(os.getenv("REDISTRIBUTION_BATCH_SIZE", 2000))
+
+    # Background jobs: workers poll every JOB_POLL_INTERVAL seconds and claim
+    # up to JOB_CLAIM_BATCH due jobs at a time under a JOB_LEASE_SECONDS lease,
+    # renewed while they run. A failed job is retried up to JOB_MAX_ATTEMPTS
+    # times with exponential backoff between JOB_RETRY_BASE_DELAY and
+    # JOB_RETRY_MAX_DELAY seconds. JOB_EMBEDDED_WORKERS worker threads run
+    # inside the API process (0 leaves jobs to `python -m app.worker`).
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+    JOB_CLAIM_BATCH: int = int(os.getenv("JOB_CLAIM_BATCH", 10))
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", 300))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+    JOB_RETRY_BASE_DELAY: float = float(os.getenv("JOB_RETRY_BASE_DELAY", 30))
+    JOB_RETRY_MAX_DELAY: float = float(os.getenv("JOB_RETRY_MAX_DELAY", 3600))
+    JOB_EMBEDDED_WORKERS: int = int(os.getenv("JOB_EMBEDDED_WORKERS", 0))
+
+    # Change feed: the outbox relay numbers up to OUTBOX_RELAY_BATCH events
+    # at a time, waiting OUTBOX_RELAY_INTERVAL seconds when there are none;
+    # OUTBOX_EMBEDDED_RELAY runs it inside the API process instead of
+    # `python -m app.relay`. Feed readers poll every OUTBOX_FEED_POLL_INTERVAL
+    # seconds, long polls wait at most OUTBOX_LONG_POLL_TIMEOUT seconds and
+    # idle streams get a keep-alive every OUTBOX_STREAM_KEEPALIVE seconds.
+    # Published events are kept for OUTBOX_RETENTION_DAYS.
+    OUTBOX_RELAY_BATCH: int = int(os.getenv("OUTBOX_RELAY_BATCH", 1000))
+    OUTBOX_RELAY_INTERVAL: float = float(os.getenv("OUTBOX_RELAY_INTERVAL", 0.2))
+    OUTBOX_EMBEDDED_RELAY: bool = os.getenv("OUTBOX_EMBEDDED_RELAY", "false").lower() == "true"
+    OUTBOX_FEED_POLL_INTERVAL: float = float(os.getenv("OUTBOX_FEED_POLL_INTERVAL", 0.5))
+    OUTBOX_LONG_POLL_TIMEOUT: float = float(os.getenv("OUTBOX_LONG_POLL_TIMEOUT", 30))
+    OUTBOX_STREAM_KEEPALIVE: float = float(os.getenv("OUTBOX_STREAM_KEEPALIVE", 15))
+    OUTBOX_RETENTION_DAYS: int = int(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+
+    # Live stock feed: each subscriber holds at most STOCK_FEED_MAX_PENDING
+    # changed lots it has not been sent yet before it is resynced
+    STOCK_FEED_MAX_PENDING: int = int(os.getenv("STOCK_FEED_MAX_PENDING", 1000))
+
+    # Automatic reorders top stock up to this multiple of the reorder level
+    REORDER_TOP_UP_FACTOR: float = float(os.getenv("REORDER_TOP_UP_FACTOR", 2.0))
+
+    # Near-expiry horizons (days) and how long their cached totals are reused
+    NEAR_EXPIRY_HORIZONS: str = os.getenv("NEAR_EXPIRY_HORIZONS", "30,60,90")
+    NEAR_EXPIRY_CACHE_TTL: int = int(os.getenv("NEAR_EXPIRY_CACHE_TTL", 300))
+
+    # Cached reference data responses (medications, vendors, facilities).
+    # Leave RESPONSE_CACHE_URL empty for a per-process cache, or point it at
+    # Redis (redis://host:6379/0) to share entries between workers.
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+
+    # Authenticated users are cached per token subject for this many seconds,
+    # so most requests skip the user lookup. With AUTH_TRUST_TOKEN_CLAIMS the
+    # role and facility signed into the token are used without any lookup.
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+    # bcrypt cost for new hashes; stored hashes with another cost are rehashed
+    # on the next successful login. Hashing runs in a dedicated process pool
+    # and logins beyond PASSWORD_HASH_MAX_PENDING in flight are refused (503).
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+
     # Security settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your_default_secret_key")
     ALGORITHM: str = "HS256"
@@ -0,0 +1,86 @@
+# app/core/cron.py
+
+"""
+Cron expressions for recurring jobs.
+
+Five fields, minute hour day-of-month month day-of-week, evaluated in UTC.
+Each field takes *, a value, a range (a-b), a step (*/n or a-b/n) or a
+comma-separated list of those; day-of-week runs 0-6 from Sunday (7 is also
+Sunday). As in cron, when both day fields are restricted a day matching
+either one qualifies. @hourly, @daily, @weekly and @monthly are accepted.
+"""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (lowest, highest) value of each field
+FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Far enough to find any date that exists (February 29th included)
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+def _parse_field(field: str, lowest: int, highest: int) -> FrozenSet[int]:
+    values = set()
+    for item in field.split(","):
+        span, _, step = item.partition("/")
+        if span == "*":
+            start, end = lowest, highest
+        elif "-" in span:
+            start, end = (int(part) for part in span.split("-", 1))
+        else:
+            start = end = int(span)
+        stride = int(step) if step else 1
+        if not lowest <= start <= end <= highest or stride < 1:
+            raise ValueError(f"Cron field '{field}' is out of range {lowest}-{highest}")
+        values.update(range(start, end + 1, stride))
+    return frozenset(values)
+
+class CronSchedule:
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        try:
+            parsed: Tuple[FrozenSet[int], ...] = tuple(
+                _parse_field(field, lowest, highest) for field, (lowest, highest) in zip(fields, FIELD_RANGES)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}") from None
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays  # Python counts from Monday
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        The first matching minute strictly after ``moment``.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + SEARCH_LIMIT
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
@@ -0,0 +1,321 @@
+# app/core/metrics.py
+
+"""
+In-process metrics with Prometheus text exposition.
+
+Every metric keeps one shard per thread and a thread only ever writes its own
+shard, so recording takes no lock. Rendering sums the shards; a scrape that
+races a write may miss that one increment until the next scrape.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()  # Taken once per thread, when its shard is created
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    """
+    A value that goes up and down (e.g. requests in flight), kept as the sum
+    of per-thread increments and decrements.
+    """
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+    def values(self) -> Dict[Tuple[str, ...], list]:
+        totals: Dict[Tuple[str, ...], list] = {}
+        for shard in list(self._shards):
+            for labels, entry in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(entry))
+                for index, value in enumerate(list(entry)):
+                    total[index] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, entry in sorted(self.values().items()):
+            cumulative = 0
+            for bound, hits in zip(bounds, entry):
+                cumulative += hits
+                label_text = _format_labels(self.labelnames, labels, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{label_text} {entry[-1]}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector) -> None:
+        """
+        Add a callable returning extra exposition lines at scrape time (used
+        for values that live elsewhere, such as pool and cache statistics).
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+))
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "SQL statements executed, by route template.", ("route",)
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "Time spent executing single SQL statements."
+))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request, by route template.", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+))
+db_time_per_request_seconds = registry.register(Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per HTTP request, by route template.", ("route",)
+))
+
+# --- Per-request database statistics -----------------------------------------
+
+class RequestQueryStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    db_query_duration_seconds.observe(elapsed)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+# --- ASGI middleware -----------------------------------------------------------
+
+def route_template(scope) -> str:
+    # FastAPI stores the matched route in the (shared) scope while routing
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status codes, requests in flight
+    and SQL counts/time per request, labelled by route template so the label
+    set stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            current_query_stats.reset(token)
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            db_queries_total.inc(route, amount=stats.queries)
+            db_queries_per_request.observe(stats.queries, route)
+            db_time_per_request_seconds.observe(stats.db_time, route)
+
+# --- Exposition helpers for statistics kept elsewhere ---------------------------
+
+def gauge_lines(name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]], kind: str = "gauge") -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+    return lines
+
+def _benchmark(requests: int, queries: int) -> None:
+    from types import SimpleNamespace
+    from sqlalchemy import create_engine, text
+
+    route = SimpleNamespace(path="/api/v1/facilities/{facility_id}")
+
+    async def endpoint(scope, receive, send):
+        # What routing leaves in the scope, and an empty 200 response
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def serve(app) -> float:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await app({"type": "http", "method": "GET", "path": "/api/v1/facilities/1"}, receive, send)
+        return (time.perf_counter() - started) / requests
+
+    bare = min(asyncio.run(serve(endpoint)) for _ in range(3))
+    instrumented = min(asyncio.run(serve(MetricsMiddleware(endpoint))) for _ in range(3))
+    print(f"{requests} requests: {bare * 1e6:.1f}us bare, {instrumented * 1e6:.1f}us through MetricsMiddleware, "
+          f"{(instrumented - bare) * 1e6:.1f}us added per request")
+
+    engine = create_engine("sqlite://")
+
+    def execute() -> float:
+        with engine.connect() as connection:
+            started = time.perf_counter()
+            for _ in range(queries):
+                connection.execute(text("SELECT 1"))
+            return (time.perf_counter() - started) / queries
+
+    hooked = min(execute() for _ in range(3))
+    event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+    unhooked = min(execute() for _ in range(3))
+    print(f"{queries} queries: {unhooked * 1e6:.1f}us without the cursor hooks, {hooked * 1e6:.1f}us with them, "
+          f"{(hooked - unhooked) * 1e6:.1f}us added per query")
+
+if __name__ == "__main__":
+    # python -m app.core.metrics [requests] [queries]
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    _benchmark(requests, queries)
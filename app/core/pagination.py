@@ -0,0 +1,186 @@
+# app/core/pagination.py
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Column, inspect, select, tuple_
+from sqlalchemy.sql import Select
+
+invalid_cursor_exception = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid pagination cursor.",
+)
+
+def primary_key_column(model: Type[Any]) -> Column:
+    """
+    Return the (single) primary key column of a mapped model.
+    """
+    return inspect(model).primary_key[0]
+
+def sort_columns(model: Type[Any], order_by: Optional[str] = None, sortable: Sequence[str] = ()) -> List[Column]:
+    """
+    Resolve the keyset columns for a model: the requested sort column followed
+    by the primary key as a unique tie-breaker. Only the primary key and the
+    ``sortable`` columns are accepted, since the cursor carries the sort
+    values of the last row back to the client.
+    """
+    pk = primary_key_column(model)
+    if order_by is None or order_by == pk.key:
+        return [pk]
+
+    column = inspect(model).columns.get(order_by) if order_by in sortable else None
+    if column is None:
+        allowed = ", ".join([pk.key, *sortable])
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot order {model.__name__} by '{order_by}'. Use one of: {allowed}.",
+        )
+    if column.nullable:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot paginate {model.__name__} on nullable column '{order_by}'.",
+        )
+    return [column, pk]
+
+def _coerce(column: Column, value: Any) -> Any:
+    # Cursor values travel as JSON, so turn them back into the column's Python type
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    return python_type(value)
+
+def encode_cursor(order_by: str, values: Sequence[Any]) -> str:
+    """
+    Encode the keyset values of the last row of a page as an opaque token.
+    """
+    payload = {"o": order_by, "v": jsonable_encoder(list(values))}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(token: str, order_by: str, columns: Sequence[Column]) -> List[Any]:
+    """
+    Decode a token produced by encode_cursor, rejecting tokens that were issued
+    for a different sort order or that have been tampered with.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        if payload["o"] != order_by or len(values) != len(columns):
+            raise ValueError("cursor does not match the requested ordering")
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise invalid_cursor_exception
+
+def build_keyset_query(
+    model: Type[Any],
+    after: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = False,
+    sortable: Sequence[str] = (),
+) -> Tuple[Select, List[Column]]:
+    """
+    Build a SELECT for the page of ``model`` rows that follows the ``after`` cursor.
+
+    The statement fetches ``limit + 1`` rows so the caller can tell whether
+    another page exists without issuing a COUNT.
+    """
+    columns = sort_columns(model, order_by, sortable)
+    order_key = columns[0].key
+    stmt = select(model)
+
+    if after is not None:
+        values = decode_cursor(after, order_key, columns)
+        # Row-value comparison lets the database seek straight into the
+        # (sort column, primary key) index instead of scanning skipped rows.
+        if descending:
+            stmt = stmt.where(tuple_(*columns) < tuple_(*values))
+        else:
+            stmt = stmt.where(tuple_(*columns) > tuple_(*values))
+
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    return stmt.order_by(*ordering).limit(limit + 1), columns
+
+def paginate(rows: Sequence[Any], columns: Sequence[Column], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the over-fetched row and build the cursor for the next page.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(columns[0].key, [getattr(last, column.key) for column in columns])
+
+def _benchmark(rows: int, database_url: str, limit: int = 50, repeats: int = 5) -> None:
+    import time
+
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    # Models must all be registered before the schema is created
+    from app.db.base import Base
+    from app.models.facility import Facility, FacilityType
+    from app.repositories.facility_repository import FacilityRepository
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(Facility.__table__.delete())
+        connection.execute(insert(Facility), [
+            {"facility_id": uuid.uuid4(), "facility_name": f"Facility {index}", "facility_type": FacilityType.clinic,
+             "address": f"{index} Hospital Road", "state": "Lagos", "city": f"City {index % 200}"}
+            for index in range(rows)
+        ])
+
+    def best_of(fetch) -> float:
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - started)
+        return min(timings) * 1000
+
+    pk = primary_key_column(Facility)
+    print(f"{rows} facilities, {limit} per page, best of {repeats} (ms):")
+    with Session(engine) as db:
+        repository = FacilityRepository(db)
+        page = 1
+        while page * limit <= rows:
+            skip = (page - 1) * limit
+            # The cursor a client holds after reading the previous page
+            cursor = None
+            if skip:
+                last = db.execute(select(pk).order_by(pk).offset(skip - 1).limit(1)).scalar_one()
+                cursor = encode_cursor(pk.key, [last])
+            offset_ms = best_of(lambda: (repository.get_multi(skip=skip, limit=limit), db.expunge_all()))
+            keyset_ms = best_of(lambda: (repository.get_page(after=cursor, limit=limit), db.expunge_all()))
+            print(f"  page {page:>6}: offset {offset_ms:8.2f}  keyset {keyset_ms:8.2f}")
+            page *= 10
+
+if __name__ == "__main__":
+    # python -m app.core.pagination [rows] [database url]
+    # Point the URL at a scratch database: the benchmark creates its tables and replaces the facilities in it
+    import sys
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    database_url = sys.argv[2] if len(sys.argv) > 2 else "sqlite:///pagination_benchmark.db"
+    _benchmark(rows, database_url)
@@ -0,0 +1,163 @@
+# app/core/query_budget.py
+
+"""
+Per-request query budgets and N+1 detection for development and tests.
+
+Each statement is reduced to its shape (the SQL text with whitespace and IN
+lists collapsed); the same shape executed many times in one request is the
+signature of a lazy relationship loaded row by row. QUERY_BUDGET_MODE picks
+what happens when a request goes over budget:
+
+    off    nothing is tracked (the default)
+    warn   the request completes and a warning lists the repeated statements
+    raise  the statement that goes over budget raises QueryBudgetExceeded
+"""
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+QUERY_BUDGET_MODES = ("off", "warn", "raise")
+
+_WHITESPACE = re.compile(r"\s+")
+# "IN (?, ?, ?)", "IN (%(id_1_1)s, %(id_1_2)s)" and "IN ($1, $2)" all become "IN (...)"
+_IN_LIST = re.compile(r"\bIN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+class QueryTracker:
+    """
+    Statements executed while the tracker is active, counted by shape.
+    """
+
+    def __init__(self, max_queries: Optional[int] = None, max_repeats: Optional[int] = None, enforce: bool = False):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.enforce = enforce  # Raise from the statement that goes over budget
+        self.count = 0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.shapes[shape] += 1
+        if self.enforce and (
+            (self.max_queries is not None and self.count > self.max_queries)
+            or (self.max_repeats is not None and self.shapes[shape] > self.max_repeats)
+        ):
+            raise QueryBudgetExceeded(self.report())
+
+    def repeated(self, threshold: int = 1) -> List[Tuple[str, int]]:
+        """
+        Shapes executed more than ``threshold`` times, most frequent first.
+        """
+        return [(shape, times) for shape, times in self.shapes.most_common() if times > threshold]
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} queries, budget is {self.max_queries}")
+        if self.max_repeats is not None:
+            for shape, times in self.repeated(self.max_repeats):
+                problems.append(f"{times}x (at most {self.max_repeats}) {shape}")
+        return problems
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries"]
+        lines.extend(f"  {times}x {shape}" for shape, times in self.shapes.most_common(10))
+        problems = self.violations()
+        if problems:
+            lines.append("over budget:")
+            lines.extend(f"  {problem}" for problem in problems)
+        return "\n".join(lines)
+
+current_query_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("current_query_tracker", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _track_statement(conn, cursor, statement, parameters, context, executemany):
+    # Recorded before execution so an enforced budget stops the offending statement
+    tracker = current_query_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+@contextmanager
+def track_queries(bind: Optional[Engine] = None, **budget) -> Iterator[QueryTracker]:
+    """
+    Count the statements executed inside the block. Without ``bind`` only
+    statements run in the current context are seen (threadpool workers of a
+    request copy it); with an engine (or the Engine class, for all engines),
+    every statement it executes is counted whichever thread or task runs it,
+    which is what tests driving the app through TestClient need.
+    """
+    tracker = QueryTracker(**budget)
+    if bind is None:
+        token = current_query_tracker.set(tracker)
+        try:
+            yield tracker
+        finally:
+            current_query_tracker.reset(token)
+        return
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        tracker.record(statement)
+
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield tracker
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+class QueryBudgetMiddleware:
+    """
+    Pure ASGI middleware applying QUERY_BUDGET_MAX_QUERIES and
+    QUERY_BUDGET_MAX_REPEATS to every HTTP request while QUERY_BUDGET_MODE is
+    "warn" or "raise". Tracked responses carry an X-Query-Count header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.mode = settings.QUERY_BUDGET_MODE.lower()
+        if self.mode not in QUERY_BUDGET_MODES:
+            raise ValueError(f"QUERY_BUDGET_MODE must be one of {', '.join(QUERY_BUDGET_MODES)}, got {self.mode!r}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(
+            max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+            max_repeats=settings.QUERY_BUDGET_MAX_REPEATS,
+            enforce=self.mode == "raise",
+        )
+        token = current_query_tracker.set(tracker)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(tracker.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_tracker.reset(token)
+            problems = tracker.violations()
+            if problems:
+                route = scope.get("route")
+                label = f"{scope['method']} {route.path if route is not None else scope['path']}"
+                log = logging.error if tracker.enforce else logging.warning
+                log(f"Query budget exceeded by {label}: {tracker.report()}")
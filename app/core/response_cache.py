@@ -0,0 +1,272 @@
+# app/core/response_cache.py
+
+"""
+Response cache for reference data (medications, vendors, facilities).
+
+Rendered JSON bodies are cached per namespace and request URL together with
+a strong ETag, so a client revalidating with If-None-Match gets a 304 without
+the body being rebuilt or sent. Each namespace has a version number that is
+part of every key; invalidating a namespace bumps the version, which orphans
+all of its entries at once (they age out through the TTL / LRU).
+
+Entries live in this process by default. Set RESPONSE_CACHE_URL to a
+redis:// URL to share them (and the versions) between workers; the redis
+package is then required.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# (etag, body, extra headers)
+CachedBody = Tuple[str, bytes, Dict[str, str]]
+
+class LocalBackend:
+    """
+    In-process entries (LRU with TTL) and namespace versions.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: CachedBody) -> None:
+        self.entries.set(key, value)
+
+    def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def size(self) -> Optional[int]:
+        return self.entries.stats()["size"]
+
+class RedisBackend:
+    """
+    Entries and namespace versions shared through Redis.
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "response-cache:"):
+        import redis  # Optional dependency, only needed with a redis:// RESPONSE_CACHE_URL
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        header, body = raw.split(b"\n", 1)
+        etag, headers = json.loads(header)
+        return etag, body, headers
+
+    def set(self, key: str, value: CachedBody) -> None:
+        etag, body, headers = value
+        header = json.dumps([etag, headers]).encode()
+        self.client.setex(self.prefix + key, self.ttl, header + b"\n" + body)
+
+    def version(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}version:{namespace}") or 0)
+
+    def bump(self, namespace: str) -> None:
+        self.client.incr(f"{self.prefix}version:{namespace}")
+
+    def size(self) -> Optional[int]:
+        return None  # Not tracked for a shared backend
+
+def make_etag(body: bytes) -> str:
+    # A strong validator: it changes whenever any byte of the body does
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+def next_cursor_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    return {"X-Next-Cursor": next_cursor} if next_cursor else {}
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0  # Requests answered with 304
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool, not_modified: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if not_modified:
+                self.not_modified += 1
+
+    def key(self, namespace: str, request: Request) -> str:
+        query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+        return f"{namespace}:{self.backend.version(namespace)}:{request.url.path}?{query}"
+
+    def respond(self, request: Request, namespace: str, build: Callable[[], Tuple[Any, Dict[str, str]]]) -> Response:
+        """
+        Answer a GET from the cache, calling ``build`` only on a miss.
+        ``build`` returns the value to render as JSON and any extra response
+        headers (e.g. X-Next-Cursor), which are cached with the body.
+        """
+        # The key carries the namespace version read before building, so a
+        # body built from data that is invalidated meanwhile is never served
+        # under the new version.
+        try:
+            key = self.key(namespace, request)
+            entry = self.backend.get(key)
+        except Exception as e:
+            # A shared backend being unavailable must not take the endpoint down
+            logging.error(f"Response cache read failed for {namespace}: {e}")
+            key, entry = None, None
+        hit = entry is not None
+        if entry is None:
+            value, extra = build()
+            body = json.dumps(jsonable_encoder(value), separators=(",", ":")).encode()
+            entry = (make_etag(body), body, extra)
+            if key is not None:
+                try:
+                    self.backend.set(key, entry)
+                except Exception as e:
+                    logging.error(f"Response cache write failed for {key}: {e}")
+
+        etag, body, extra = entry
+        response_headers = {"ETag": etag, "Cache-Control": "no-cache", **extra}
+        not_modified = etag_matches(request.headers.get("if-none-match"), etag)
+        self._count(hit, not_modified)
+        if not_modified:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+        return Response(content=body, media_type="application/json", headers=response_headers)
+
+    def invalidate(self, namespace: str) -> None:
+        try:
+            self.backend.bump(namespace)
+        except Exception as e:
+            logging.error(f"Response cache invalidation failed for {namespace}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": self.backend.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+def _make_backend():
+    if settings.RESPONSE_CACHE_URL:
+        return RedisBackend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_TTL)
+    return LocalBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+
+response_cache = ResponseCache(_make_backend())
+
+async def _benchmark(requests: int, clients: int, rows: int) -> None:
+    import httpx
+
+    # The cache the application's endpoints use, not this __main__ copy
+    from app.core import response_cache as application_cache
+    from app.core.auth import principal_claims
+    from app.core.security import create_access_token
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models.facility import Facility, FacilityType
+    from app.models.medication import Medication
+    from app.models.user import User, UserRole
+    from app.models.vendor import Vendor
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        facilities = [
+            Facility(facility_name=f"Facility {index}", facility_type=FacilityType.clinic,
+                     address=f"{index} Hospital Road", state="Lagos", city="Ikeja")
+            for index in range(rows)
+        ]
+        db.add_all(facilities)
+        db.add_all([
+            Medication(medication_name=f"Medication {index}", dosage_form="tablet", strength="500mg", manufacturer="Emzor")
+            for index in range(rows)
+        ])
+        db.add_all([
+            Vendor(vendor_name=f"Vendor {index}", contact_name="Ada Obi", phone_number="08000000000",
+                   email=f"vendor{index}@example.com", address=f"{index} Marina")
+            for index in range(rows)
+        ])
+        db.flush()
+        user = User(facility_id=facilities[0].facility_id, username=f"benchmark-{time.time_ns()}",
+                    password_hash="-", role=UserRole.facility_staff)
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(principal_claims(user))}"}
+
+    cache = application_cache.response_cache
+    cached_backend = cache.backend
+    uncached_backend = LocalBackend(maxsize=1, ttl=0)  # Every entry is already expired: each request rebuilds the body
+
+    async def run(label: str, path: str, revalidate: bool) -> None:
+        latencies = []
+        etag = None
+
+        async def client_loop(client: httpx.AsyncClient) -> None:
+            for _ in range(requests // clients):
+                request_headers = {**headers, "If-None-Match": etag} if revalidate else headers
+                started = time.perf_counter()
+                response = await client.get(path, headers=request_headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == (304 if revalidate else 200), response.text
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            etag = (await client.get(path, headers=headers)).headers["ETag"]
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        print(f"  {path:<30} {label:<12} {len(latencies) / elapsed:6.0f} req/s, "
+              f"p50 {latencies[len(latencies) // 2] * 1000:6.1f}ms")
+
+    print(f"{requests} requests per case from {clients} concurrent clients, {rows} rows per list:")
+    for path in (f"/api/v1/medications/?limit={rows}", f"/api/v1/vendors/?limit={rows}", f"/api/v1/facilities/?limit={rows}"):
+        cache.backend = uncached_backend
+        await run("uncached", path, revalidate=False)
+        cache.backend = cached_backend
+        await run("cached", path, revalidate=False)
+        await run("cached, 304", path, revalidate=True)
+    stats = cache.stats()
+    print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses, {stats['not_modified']} answered with 304")
+    engine.dispose()
+
+if __name__ == "__main__":
+    # python -m app.core.response_cache [requests] [concurrent clients] [rows per list]
+    # Runs against SQLALCHEMY_DATABASE_URI: point it at a scratch database, where reference data is added
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    asyncio.run(_benchmark(requests, clients, rows))
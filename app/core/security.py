@@ -1,14 +1,21 @@
 # Placeholder for app/core/security.py
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from app.core.config import settings
 from app.schemas.user import TokenData
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
-# Password hashing setup using passlib and bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing setup using passlib and bcrypt. Hashes made with a cost
+# other than BCRYPT_ROUNDS count as deprecated and are replaced on login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 # Function to hash a password
 def get_password_hash(password: str) -> str:
@@ -18,6 +25,67 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# Function to verify a password and get a replacement hash when the stored one is outdated
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# --- bcrypt off the event loop ------------------------------------------------
+#
+# bcrypt is CPU-bound, so it runs in a small process pool of its own rather
+# than on the threadpool that serves the sync endpoints. At most
+# PASSWORD_HASH_MAX_PENDING calls may be running or queued; beyond that the
+# caller gets 503 straight away instead of queueing behind a login burst.
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+password_pool_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many sign-in attempts are in progress. Please retry shortly.",
+    headers={"Retry-After": "1"},
+)
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        # Spawned workers import only this module's dependencies, not the
+        # parent's open database connections.
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_pool
+
+def shutdown_password_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+async def _run_in_hash_pool(func, *args):
+    global _pending
+    # The counter is only touched from the event loop thread, so no lock is needed
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise password_pool_busy_exception
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), func, *args)
+    finally:
+        _pending -= 1
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+def password_pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "pending": _pending,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+    }
+
 # Function to create a JWT access token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -36,6 +104,90 @@ def verify_access_token(token: str, credentials_exception: HTTPException) -> Tok
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        return TokenData(username=username)
-    except JWTError:
+        return TokenData(
+            username=username,
+            user_id=payload.get("uid"),
+            role=payload.get("role"),
+            facility_id=payload.get("fid"),
+        )
+    except (JWTError, ValidationError):
         raise credentials_exception
+
+async def _benchmark(seconds: float, clients: int, logins: int) -> None:
+    import anyio
+    import httpx
+
+    # The modules the application uses, not this __main__ copy
+    from app.core import security
+    from app.core.auth import principal_claims
+    from app.db.async_session import async_engine
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models.facility import Facility, FacilityType
+    from app.models.user import User, UserRole
+
+    password = "benchmark-password"
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        facility = Facility(facility_name="Benchmark Clinic", facility_type=FacilityType.clinic,
+                            address="1 Hospital Road", state="Lagos", city="Ikeja")
+        db.add(facility)
+        db.flush()
+        user = User(facility_id=facility.facility_id, username=f"benchmark-{time.time_ns()}",
+                    password_hash=get_password_hash(password), role=UserRole.facility_staff)
+        db.add(user)
+        db.commit()
+        token = create_access_token(principal_claims(user))
+        username = user.username
+
+    async def run(label: str, storm: bool) -> None:
+        latencies, outcomes = [], {}
+        deadline = time.perf_counter() + seconds
+
+        async def reader(client: httpx.AsyncClient) -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/api/v1/metrics/caches", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        async def login(client: httpx.AsyncClient) -> None:
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+                outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+                if response.status_code == 503:
+                    await asyncio.sleep(0.05)  # A client honouring Retry-After, shortened
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            await asyncio.gather(
+                *(reader(client) for _ in range(clients)),
+                *(login(client) for _ in range(logins if storm else 0)),
+            )
+        latencies.sort()
+        print(
+            f"  {label:<38} other requests {len(latencies) / seconds:5.0f} req/s, "
+            f"p50 {latencies[len(latencies) // 2] * 1000:6.1f}ms, p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f}ms; "
+            f"logins {outcomes.get(200, 0) / seconds:5.1f}/s ok, {outcomes.get(503, 0)} refused with 503"
+        )
+
+    print(f"{clients} clients on an authenticated endpoint for {seconds:.0f}s, storm of {logins} concurrent logins "
+          f"(bcrypt cost {settings.BCRYPT_ROUNDS}, {settings.PASSWORD_HASH_WORKERS} hash workers):")
+    await run("no logins", storm=False)
+    hash_pool = security._run_in_hash_pool
+    # As before the hash pool: bcrypt on the threadpool that serves the sync endpoints
+    security._run_in_hash_pool = lambda func, *args: anyio.to_thread.run_sync(func, *args)
+    await run("login storm, bcrypt on the threadpool", storm=True)
+    security._run_in_hash_pool = hash_pool
+    await run("login storm, bcrypt in the hash pool", storm=True)
+    security.shutdown_password_pool()
+    engine.dispose()
+    await async_engine.dispose()  # Its aiosqlite connection threads would otherwise keep the process alive
+
+if __name__ == "__main__":
+    # python -m app.core.security [seconds] [clients] [concurrent logins]
+    # Runs against SQLALCHEMY_DATABASE_URI: point it at a scratch database, where a benchmark user is added
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    logins = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    asyncio.run(_benchmark(seconds, clients, logins))
@@ -0,0 +1,112 @@
+# app/db/async_session.py
+
+import asyncio
+import sys
+import time
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.pool_metrics import instrument_engine
+from app.db.session import engine_options
+
+# Async drivers for the sync URLs used elsewhere (asyncpg in production,
+# aiosqlite for tests)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_uri(uri: str) -> str:
+    """
+    Turn a sync database URL into the equivalent async one; URLs that already
+    name a driver are used as given.
+    """
+    url = make_url(uri)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
+
+# Create the async engine alongside the sync one so endpoints can move over one at a time
+ASYNC_DATABASE_URI = settings.ASYNC_SQLALCHEMY_DATABASE_URI or async_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+async_engine = create_async_engine(ASYNC_DATABASE_URI, **engine_options(ASYNC_DATABASE_URI, use_async=True))
+instrument_engine(async_engine.sync_engine, "async", max_overflow=settings.DB_MAX_OVERFLOW)
+
+# Objects stay readable after commit without another round trip
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def _benchmark(clients: int, requests: int) -> None:
+    import httpx
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.orm import Session
+
+    # The engines the repositories use, not this __main__ copy's
+    from app.db import async_session
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine, get_db
+    from app.models.medication import Medication
+    from app.repositories.async_base import AsyncBaseRepository
+    from app.repositories.base import BaseRepository
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add_all([
+            Medication(medication_name=f"Medication {index}", dosage_form="tablet", strength="500mg", manufacturer="Emzor")
+            for index in range(200)
+        ])
+        db.commit()
+
+    # The same keyset page through each stack
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_page(db: Session = Depends(get_db)):
+        return [medication.medication_name for medication in BaseRepository(db, Medication).get_page(limit=20)[0]]
+
+    @app.get("/async")
+    async def async_page(db: AsyncSession = Depends(async_session.get_async_db)):
+        medications, _ = await AsyncBaseRepository(db, Medication).get_page(limit=20)
+        return [medication.medication_name for medication in medications]
+
+    async def run(path: str) -> None:
+        latencies, failures = [], 0
+
+        async def client_loop(client: httpx.AsyncClient) -> None:
+            nonlocal failures
+            for _ in range(requests):
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except Exception:
+                    failures += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                failures += response.status_code != 200
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                                     base_url="http://benchmark", timeout=None) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        print(
+            f"  {path:<6} {len(latencies) / elapsed:6.0f} req/s, p50 {latencies[len(latencies) // 2] * 1000:7.1f}ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f}ms, {failures} failed"
+        )
+
+    print(f"{clients} concurrent clients x {requests} requests (pool size {settings.DB_POOL_SIZE} + "
+          f"{settings.DB_MAX_OVERFLOW} overflow per engine):")
+    await run("/sync")
+    await run("/async")
+    engine.dispose()
+    await async_session.async_engine.dispose()
+
+if __name__ == "__main__":
+    # python -m app.db.async_session [concurrent clients] [requests per client]
+    # Runs against SQLALCHEMY_DATABASE_URI: point it at a scratch database, where medications are added
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(_benchmark(clients, requests))
@@ -9,6 +9,11 @@ from app.models.transfer import Transfer
 from app.models.purchase_order import PurchaseOrder
 from app.models.vendor import Vendor
 from app.models.user import User
+from app.models.stock_summary import FacilityStockSummary, FacilityExpirySummary
+from app.models.stock_ledger import StockMovement, StockBalanceSnapshot
+from app.models.job import Job, JobSchedule
+from app.models.outbox import OutboxEvent, OutboxRelayState
+from app.models.inventory_import import InventoryImport
 
 from app.db.base_class import Base  # Import the Base class
 
@@ -0,0 +1,185 @@
+# app/db/explain.py
+
+"""
+EXPLAIN helpers for checking that the hot queries are served by indexes.
+
+    python -m app.db.explain    # checks the key queries against SQLALCHEMY_DATABASE_URI
+"""
+
+import json
+import sys
+import uuid
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import UniqueConstraint, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.db import base  # Import all models so relationships between them resolve
+from app.models.facility import Facility
+from app.models.inventory import Inventory
+from app.models.purchase_order import PurchaseOrder
+from app.models.requisition import RequisitionStatus
+from app.models.transfer import Transfer
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.requisition_repository import RequisitionRepository
+from app.repositories.stock_summary_repository import StockSummaryRepository
+from app.repositories.transfer_repository import TransferRepository
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN of a statement, compiled per dialect so bound parameters are
+    processed exactly as they are for the statement itself.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+class PlanNode(NamedTuple):
+    operation: str  # e.g. "Index Scan", "Seq Scan", "SEARCH", "SCAN"
+    table: Optional[str]
+    index: Optional[str]
+
+def _postgresql_nodes(plan: Dict[str, Any]) -> List[PlanNode]:
+    nodes = [PlanNode(plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name"))]
+    for child in plan.get("Plans", []):
+        nodes.extend(_postgresql_nodes(child))
+    return nodes
+
+def _sqlite_node(detail: str) -> PlanNode:
+    # e.g. "SEARCH inventory USING INDEX uq_inventory_lot (facility_id=? AND ...)"
+    words = detail.split()
+    table = words[1] if len(words) > 1 and words[0] in ("SCAN", "SEARCH") else None
+    index = None
+    if "INDEX" in words and words.index("INDEX") + 1 < len(words):
+        index = words[words.index("INDEX") + 1]
+    return PlanNode(words[0] if words else detail, table, index)
+
+def explain(db: Session, stmt) -> List[PlanNode]:
+    """
+    Return the nodes of the plan the database picks for ``stmt``.
+    """
+    # Read the DBAPI rows directly: the result processors SQLAlchemy compiled
+    # for the explained statement's columns do not apply to the plan rows.
+    result = db.execute(Explain(stmt))
+    rows = result.cursor.fetchall()
+    result.close()
+    if db.get_bind().dialect.name == "postgresql":
+        document = rows[0][0]
+        if isinstance(document, str):
+            document = json.loads(document)
+        return _postgresql_nodes(document[0]["Plan"])
+    return [_sqlite_constraint_name(db, _sqlite_node(row[-1])) for row in rows]
+
+def _sqlite_constraint_name(db: Session, node: PlanNode) -> PlanNode:
+    # SQLite backs unique constraints with indexes named sqlite_autoindex_*;
+    # report the constraint's own name instead, matched on its columns.
+    if not (node.index or "").startswith("sqlite_autoindex_") or node.table not in base.Base.metadata.tables:
+        return node
+    columns = [row[2] for row in db.execute(text(f"PRAGMA index_info('{node.index}')"))]
+    for constraint in base.Base.metadata.tables[node.table].constraints:
+        if isinstance(constraint, UniqueConstraint) and [column.name for column in constraint.columns] == columns:
+            return node._replace(index=constraint.name)
+    return node
+
+def prefer_indexes(db: Session) -> None:
+    """
+    Make the planner choose an index whenever one applies, for the rest of the
+    transaction. Small test tables would otherwise be read sequentially
+    whatever indexes exist.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+
+def uses_index(plan: List[PlanNode], index_name: str) -> bool:
+    return any(node.index == index_name for node in plan)
+
+def assert_uses_index(db: Session, stmt, index_name: str) -> List[PlanNode]:
+    plan = explain(db, stmt)
+    if not uses_index(plan, index_name):
+        raise AssertionError(f"Expected the plan to use {index_name}, got {plan}")
+    return plan
+
+def key_queries(db: Session) -> Dict[str, Tuple[Callable[[], Any], str]]:
+    """
+    The hot access paths, each with the index that should serve it. Statements
+    are built lazily, with placeholder ids, through the same repository methods
+    the application uses.
+    """
+    facility_id, medication_id, vendor_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    today = date.today()
+    return {
+        "fefo_lots": (
+            lambda: InventoryRepository(db).available_lots_query(facility_id, medication_id, today),
+            "uq_inventory_lot",
+        ),
+        "near_expiry_window": (
+            lambda: select(Inventory.facility_id, Inventory.medication_id, Inventory.quantity).where(
+                Inventory.expiry_date >= today, Inventory.expiry_date <= today + timedelta(days=30)
+            ),
+            "ix_inventory_expiry_facility_medication",
+        ),
+        "medication_stock": (
+            lambda: select(Inventory.facility_id, Inventory.quantity).where(Inventory.medication_id == medication_id),
+            "ix_inventory_medication_facility",
+        ),
+        "reorder_scan": (
+            lambda: StockSummaryRepository(db).below_reorder_query(),
+            "ix_stock_summary_below_reorder",
+        ),
+        "open_requisitions": (
+            lambda: RequisitionRepository(db).export_query(facility_id=facility_id, status=RequisitionStatus.pending),
+            "ix_requisition_facility_status",
+        ),
+        "facility_transfers_out": (
+            lambda: TransferRepository(db).export_query().where(Transfer.from_facility_id == facility_id),
+            "ix_transfers_from_facility_id",
+        ),
+        "vendor_purchase_orders": (
+            lambda: select(PurchaseOrder).where(PurchaseOrder.vendor_id == vendor_id),
+            "ix_purchase_orders_vendor_id",
+        ),
+        "facilities_by_city": (
+            lambda: select(Facility).where(Facility.state == "Lagos", Facility.city == "Ikeja"),
+            "ix_facilities_state_city",
+        ),
+    }
+
+def check_key_queries(db: Session) -> Dict[str, Tuple[bool, List[PlanNode]]]:
+    """
+    Explain every key query; returns {name: (uses expected index, plan)}.
+    Runs in a transaction that is rolled back.
+    """
+    results = {}
+    try:
+        prefer_indexes(db)
+        for name, (build, index_name) in key_queries(db).items():
+            plan = explain(db, build())
+            results[name] = (uses_index(plan, index_name), plan)
+    finally:
+        db.rollback()
+    return results
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        results = check_key_queries(session)
+    finally:
+        session.close()
+    for name, (ok, plan) in results.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {plan}")
+    sys.exit(0 if all(ok for ok, _ in results.values()) else 1)
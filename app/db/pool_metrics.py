@@ -0,0 +1,229 @@
+# app/db/pool_metrics.py
+
+"""
+Connection pool instrumentation: how long callers wait for a connection, how
+long they hold it, pool occupancy and overflow, and per-route usage.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import Counter, Histogram, registry
+
+db_pool_wait_seconds = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection, by engine.", ("engine",)
+))
+db_pool_hold_seconds = registry.register(Histogram(
+    "db_pool_hold_seconds", "Time a connection stays checked out, by engine.", ("engine",)
+))
+db_pool_checkouts_total = registry.register(Counter(
+    "db_pool_checkouts_total", "Connection checkouts, by engine.", ("engine",)
+))
+db_pool_timeouts_total = registry.register(Counter(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection, by engine.", ("engine",)
+))
+db_pool_connects_total = registry.register(Counter(
+    "db_pool_connects_total", "Database connections opened by the pool, by engine.", ("engine",)
+))
+
+def _histogram_snapshot(histogram: Histogram, *labels: str) -> Dict[str, Any]:
+    entry = histogram.values().get(labels) or [0] * (len(histogram.buckets) + 1) + [0.0, 0]
+    cumulative, buckets = 0, {}
+    for bound, hits in zip(histogram.buckets + (float("inf"),), entry):
+        cumulative += hits
+        buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+    total, count = entry[-2], entry[-1]
+    return {"count": count, "sum": total, "avg": total / count if count else 0.0, "buckets": buckets}
+
+class PoolMetrics:
+    """
+    Connection pool statistics of one engine. Durations and counts go to the
+    shared metrics registry under the engine's name; only the peak number of
+    connections checked out at once is kept here.
+    """
+
+    def __init__(self, name: str, max_overflow: Optional[int] = None):
+        self.name = name
+        self.max_overflow = max_overflow  # As configured; pools do not expose it
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        db_pool_wait_seconds.observe(seconds, self.name)
+        if timed_out:
+            db_pool_timeouts_total.inc(self.name)
+
+    def record_checkout(self, checked_out: int) -> None:
+        db_pool_checkouts_total.inc(self.name)
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_hold(self, seconds: float) -> None:
+        db_pool_hold_seconds.observe(seconds, self.name)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        data = {
+            "pool_class": type(pool).__name__,
+            "checkouts": db_pool_checkouts_total.values().get((self.name,), 0),
+            "timeouts": db_pool_timeouts_total.values().get((self.name,), 0),
+            "connects": db_pool_connects_total.values().get((self.name,), 0),
+            "peak_checked_out": self.peak_checked_out,
+            "wait_seconds": _histogram_snapshot(db_pool_wait_seconds, self.name),
+            "hold_seconds": _histogram_snapshot(db_pool_hold_seconds, self.name),
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+            if self.max_overflow is not None:
+                data["max_overflow"] = self.max_overflow
+        return data
+
+class RequestPoolUsage:
+    """
+    Connection use by one request; filled in by the pool events while the
+    request runs (including in threadpool workers, which copy the context).
+    """
+    __slots__ = ("checkouts", "wait", "hold")
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait = 0.0
+        self.hold = 0.0
+
+current_request_usage: ContextVar[Optional[RequestPoolUsage]] = ContextVar("current_request_usage", default=None)
+
+class _TimedConnectMixin:
+    """
+    Times Pool.connect(), the call the engine makes for every checkout, so
+    the wait for a free connection (and for opening a new one) is measured;
+    the pool events only fire once a connection has been handed out.
+    """
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self._record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._record_wait(time.perf_counter() - started)
+        return connection
+
+    def _record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        if self.metrics is not None:
+            self.metrics.record_wait(seconds, timed_out)
+        usage = current_request_usage.get()
+        if usage is not None:
+            usage.wait += seconds
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class TimedQueuePool(_TimedConnectMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedConnectMixin, AsyncAdaptedQueuePool):
+    pass
+
+# Registered engines by name, and connection use aggregated per route
+_engines: Dict[str, Engine] = {}
+_route_usage: Dict[str, Dict[str, float]] = {}
+_route_lock = threading.Lock()
+
+def instrument_engine(engine: Engine, name: str, max_overflow: Optional[int] = None) -> PoolMetrics:
+    """
+    Attach connect/checkout/checkin listeners to an engine's pool and register
+    it for pool_snapshot(). Pass ``async_engine.sync_engine`` for an
+    AsyncEngine, and the configured ``max_overflow`` to have it reported.
+    """
+    metrics = PoolMetrics(name, max_overflow)
+    engine.pool.metrics = metrics
+    _engines[name] = engine
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        db_pool_connects_total.inc(name)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        pool = engine.pool
+        metrics.record_checkout(pool.checkedout() if isinstance(pool, QueuePool) else 0)
+        usage = current_request_usage.get()
+        if usage is not None:
+            usage.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        metrics.record_hold(held)
+        usage = current_request_usage.get()
+        if usage is not None:
+            usage.hold += held
+
+    return metrics
+
+def record_request_usage(route: str, usage: RequestPoolUsage) -> None:
+    with _route_lock:
+        entry = _route_usage.setdefault(
+            route, {"requests": 0, "checkouts": 0, "wait_seconds": 0.0, "hold_seconds": 0.0, "max_hold_seconds": 0.0}
+        )
+        entry["requests"] += 1
+        entry["checkouts"] += usage.checkouts
+        entry["wait_seconds"] += usage.wait
+        entry["hold_seconds"] += usage.hold
+        entry["max_hold_seconds"] = max(entry["max_hold_seconds"], usage.hold)
+
+def pool_snapshot() -> Dict[str, Any]:
+    with _route_lock:
+        routes = {route: dict(entry) for route, entry in _route_usage.items()}
+    return {
+        "engines": {
+            name: engine.pool.metrics.snapshot(engine.pool)
+            for name, engine in _engines.items()
+            if getattr(engine.pool, "metrics", None) is not None
+        },
+        "routes": routes,
+    }
+
+class PoolUsageMiddleware:
+    """
+    ASGI middleware that collects the pool usage of each HTTP request and adds
+    it to the totals for the matched route template (e.g. "GET /api/v1/inventory/export").
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        usage = RequestPoolUsage()
+        token = current_request_usage.set(usage)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_usage.reset(token)
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            label = f"{scope['method']} {route.path}" if route is not None else "unmatched"
+            record_request_usage(label, usage)
@@ -0,0 +1,77 @@
+# app/db/retry.py
+
+"""
+Retrying transactions that lost a race with a concurrent writer.
+
+A transaction that hits a transient conflict (see is_transient_conflict) is
+rolled back and run again from the start, so it re-reads whatever changed
+under it. Sleeps between attempts use full jitter, which spreads the
+retries of transactions that collided with each other.
+"""
+
+import logging
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.core.metrics import Counter, registry
+
+T = TypeVar("T")
+
+# PostgreSQL serialization_failure and deadlock_detected
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+db_transaction_retries_total = registry.register(Counter(
+    "db_transaction_retries_total", "Transactions rolled back and retried after a conflict, by operation.", ("operation",)
+))
+
+def is_transient_conflict(error: BaseException) -> bool:
+    """
+    Whether running the same transaction again could succeed: a versioned
+    row or stock lot changed since it was read, a deadlock or serialization
+    failure, or SQLite's database-level write lock being held.
+    """
+    if isinstance(error, StaleDataError):
+        return True
+    if isinstance(error, DBAPIError):
+        sqlstate = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+        if sqlstate in RETRYABLE_SQLSTATES:
+            return True
+        return isinstance(error, OperationalError) and "database is locked" in str(error.orig)
+    return False
+
+def run_in_transaction(
+    db: Session,
+    work: Callable[[], T],
+    operation: str = "transaction",
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+) -> T:
+    """
+    Run ``work`` and commit, retrying transient conflicts with bounded
+    exponential backoff. Any other error, or a conflict on the last attempt,
+    is raised with the session rolled back.
+    """
+    attempts = attempts or settings.DB_RETRY_ATTEMPTS
+    base_delay = settings.DB_RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = settings.DB_RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    for attempt in range(attempts):
+        try:
+            result = work()
+            db.commit()
+            return result
+        except Exception as e:
+            db.rollback()
+            if attempt + 1 >= attempts or not is_transient_conflict(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            logging.warning(f"Retrying {operation} after a conflict (attempt {attempt + 1} of {attempts}): {e}")
+            db_transaction_retries_total.inc(operation)
+            time.sleep(delay)
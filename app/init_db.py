@@ -2,18 +2,21 @@
 
 import os
 import sys
+from datetime import date
 
 # Add the project root directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import ProgrammingError
 from psycopg2 import connect
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from app.db.base import Base  # Import the Base class that holds the metadata for the models
 from app.core.config import settings
+from app.repositories.stock_ledger_repository import StockLedgerRepository
+from app.services.job_service import JobService
 
 
 def database_exists(connection, database_name):
@@ -80,6 +83,15 @@ def init_db():
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully.")
 
+    # The stock ledger is partitioned by month and cannot take rows before its partitions exist
+    with Session(engine) as session:
+        StockLedgerRepository(session).ensure_month_partitions(date.today())
+        session.commit()
+
+    # Recurring maintenance jobs: reorder scans, ledger snapshots, summary rebuilds
+    with Session(engine) as session:
+        JobService(session).ensure_default_schedules()
+
     # List the tables in the database
     list_tables(engine)
 
@@ -1,11 +1,32 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.users import router as user_router
+from app.api.v1.endpoints.events import router as event_router
+from app.api.v1.endpoints.facilities import router as facility_router
+from app.api.v1.endpoints.inventory import router as inventory_router
+from app.api.v1.endpoints.jobs import router as job_router
+from app.api.v1.endpoints.medications import router as medication_router
+from app.api.v1.endpoints.purchase_orders import router as purchase_order_router
+from app.api.v1.endpoints.requisitions import router as requisition_router
+from app.api.v1.endpoints.transfers import router as transfer_router
+from app.api.v1.endpoints.vendors import router as vendor_router
+from app.api.v1.endpoints.metrics import prometheus_router, router as metrics_router
 from app.core.config import settings
+from app.core.security import shutdown_password_pool
 from app.db.session import SessionLocal, engine
+from app.db.async_session import async_engine
+from app.db.pool_metrics import PoolUsageMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.db import base  # Import all models so relationships between them resolve
+from app.repositories import stock_summary_repository  # Keeps the stock summary in sync with ORM writes
+from app.relay import start_embedded_relay
+from app.services.stock_feed_service import stock_feed
+from app.worker import start_embedded_workers
 from sqlalchemy.orm import Session
 import logging
-import uvicorn
 
 # Create an instance of the FastAPI app
 app = FastAPI(
@@ -22,8 +43,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record how long each request waits for and holds database connections
+app.add_middleware(PoolUsageMiddleware)
+
+# Query budgets and N+1 detection (off unless QUERY_BUDGET_MODE is set)
+app.add_middleware(QueryBudgetMiddleware)
+
+# Per-route latency, status codes, requests in flight and SQL per request
+app.add_middleware(MetricsMiddleware)
+
 # Include the user router
+app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(user_router, prefix="/api/v1", tags=["users"])
+app.include_router(facility_router, prefix="/api/v1/facilities", tags=["facilities"])
+app.include_router(inventory_router, prefix="/api/v1/inventory", tags=["inventory"])
+app.include_router(medication_router, prefix="/api/v1/medications", tags=["medications"])
+app.include_router(transfer_router, prefix="/api/v1/transfers", tags=["transfers"])
+app.include_router(vendor_router, prefix="/api/v1/vendors", tags=["vendors"])
+app.include_router(requisition_router, prefix="/api/v1/requisitions", tags=["requisitions"])
+app.include_router(purchase_order_router, prefix="/api/v1/purchase-orders", tags=["purchase orders"])
+app.include_router(job_router, prefix="/api/v1/jobs", tags=["jobs"])
+app.include_router(event_router, prefix="/api/v1/events", tags=["events"])
+app.include_router(metrics_router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(prometheus_router)
 
 @app.get("/")
 def read_root():
@@ -46,6 +88,16 @@ async def startup_event():
     finally:
         db.close()
 
+    # Background job workers inside this process, if configured
+    if settings.JOB_EMBEDDED_WORKERS > 0:
+        app.state.job_workers = start_embedded_workers(settings.JOB_EMBEDDED_WORKERS)
+        logging.info(f"Started {settings.JOB_EMBEDDED_WORKERS} embedded job workers.")
+
+    # Outbox relay inside this process, if configured
+    if settings.OUTBOX_EMBEDDED_RELAY:
+        app.state.outbox_relay = start_embedded_relay()
+        logging.info("Started the embedded outbox relay.")
+
     # Example: Initialize other resources
     logging.info("Initialization complete.")
 
@@ -54,18 +106,44 @@ async def startup_event():
 async def shutdown_event():
     # Shutdown event logic
     logging.info("Shutting down the application...")
+
+    # Let embedded job workers finish the job in hand, joining them off the
+    # event loop; past the lease another worker would take the job over anyway
+    job_workers = getattr(app.state, "job_workers", None)
+    if job_workers is not None:
+        stop, threads = job_workers
+        stop.set()
+        for thread in threads:
+            await asyncio.to_thread(thread.join, settings.JOB_LEASE_SECONDS)
+            if thread.is_alive():
+                logging.warning(f"Job worker {thread.name} did not stop within {settings.JOB_LEASE_SECONDS}s.")
+
+    outbox_relay = getattr(app.state, "outbox_relay", None)
+    if outbox_relay is not None:
+        stop, thread = outbox_relay
+        stop.set()
+        await asyncio.to_thread(thread.join)
+
+    # Stop following the change feed for live stock streams
+    await stock_feed.close()
     
     # Example: Clean up or close the database connection pool
     try:
         engine.dispose()
+        await async_engine.dispose()
         logging.info("Database connection pool disposed.")
     except Exception as e:
         logging.error(f"Failed to dispose database connection pool: {e}")
 
+    # Stop the password hashing worker processes
+    shutdown_password_pool()
+
     # Example: Clean up other resources
     logging.info("Cleanup complete.")
 
 if __name__ == "__main__":
+    import uvicorn  # Only the development server needs it; tests import the app alone
+
     logging.info("Starting Uvicorn server...")
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
 
@@ -1,6 +1,6 @@
 # app/models/facility.py
 
-from sqlalchemy import Column, String, Enum, UUID
+from sqlalchemy import Column, String, Enum, Uuid, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
@@ -13,8 +13,12 @@ class FacilityType(PyEnum):  # Use Python's Enum
 
 class Facility(Base):
     __tablename__ = "facilities"
+    __table_args__ = (
+        # Facilities are listed and aggregated by state, then city
+        Index("ix_facilities_state_city", "state", "city"),
+    )
 
-    facility_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    facility_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     facility_name = Column(String, nullable=False)
     facility_type = Column(Enum(FacilityType), nullable=False)  # Pass the Enum members
     address = Column(String, nullable=False)
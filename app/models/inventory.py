@@ -1,17 +1,31 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, UUID
+from sqlalchemy import Column, Integer, Date, ForeignKey, Uuid, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
 
 class Inventory(Base):
     __tablename__ = "inventory"
+    __table_args__ = (
+        # One row per lot: a medication at a facility with a given expiry date
+        UniqueConstraint("facility_id", "medication_id", "expiry_date", name="uq_inventory_lot"),
+        # Near-expiry queries are range scans on expiry_date across all facilities
+        Index("ix_inventory_expiry_facility_medication", "expiry_date", "facility_id", "medication_id"),
+        # Stock of a medication across facilities; uq_inventory_lot already
+        # covers lookups that start from the facility. Including the quantity
+        # lets PostgreSQL answer the totals from the index alone.
+        Index("ix_inventory_medication_facility", "medication_id", "facility_id", postgresql_include=["quantity"]),
+    )
 
-    inventory_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    facility_id = Column(UUID(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
-    medication_id = Column(UUID(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False)
+    inventory_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     reorder_level = Column(Integer, nullable=False)
     expiry_date = Column(Date, nullable=False)
+    # Bumped by every write; the ORM refuses to overwrite a lot changed since it was loaded
+    version = Column(Integer, nullable=False, default=1)
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     facility = relationship("Facility", back_populates="inventory")
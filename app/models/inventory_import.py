@@ -0,0 +1,30 @@
+# app/models/inventory_import.py
+
+from sqlalchemy import Column, Integer, String, Enum, Uuid, DateTime, JSON
+from app.db.base_class import Base
+import uuid
+from datetime import datetime
+from enum import Enum as PyEnum
+
+class ImportStatus(PyEnum):  # Use Python's Enum
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+class InventoryImport(Base):
+    """
+    Progress and outcome of a stock-count import. Kept in the database so
+    every API worker can report on an import whichever process runs it.
+    """
+    __tablename__ = "inventory_imports"
+
+    job_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String, nullable=True)
+    status = Column(Enum(ImportStatus), nullable=False, default=ImportStatus.queued)
+    rows_read = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # [{"line": ..., "detail": ...}], capped
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
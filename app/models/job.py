@@ -0,0 +1,59 @@
+# app/models/job.py
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, Enum, Uuid, DateTime, JSON, Index
+from app.db.base_class import Base
+import uuid
+from datetime import datetime
+from enum import Enum as PyEnum
+
+class JobStatus(PyEnum):  # Use Python's Enum
+    queued = "queued"  # Waiting for run_at, including retries after a failure
+    running = "running"  # Claimed by a worker until locked_until
+    succeeded = "succeeded"
+    failed = "failed"  # Out of attempts
+    cancelled = "cancelled"
+
+class Job(Base):
+    """
+    A unit of background work in the durable queue. Workers claim due jobs
+    by moving them to running with a lease (locked_until); a job whose
+    worker died is claimed again once the lease runs out.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers claim the highest-priority queued jobs that are due
+        Index("ix_jobs_status_priority_run_at", "status", "priority", "run_at"),
+        Index("ix_jobs_job_type_created_at", "job_type", "created_at"),
+    )
+
+    job_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.queued)
+    priority = Column(Integer, nullable=False, default=0)  # Higher runs first
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    locked_by = Column(String, nullable=True)  # Worker holding the lease
+    locked_until = Column(DateTime, nullable=True)
+    schedule_name = Column(String, nullable=True)  # Schedule that enqueued the job, if any
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+class JobSchedule(Base):
+    """
+    A recurring job: when next_run_at passes, a worker enqueues the job and
+    moves next_run_at to the following match of the cron expression.
+    """
+    __tablename__ = "job_schedules"
+
+    name = Column(String, primary_key=True)
+    job_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    cron = Column(String, nullable=False)
+    enabled = Column(Boolean, nullable=False, default=True)
+    next_run_at = Column(DateTime, nullable=False, index=True)
+    last_run_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, UUID
+from sqlalchemy import Column, String, Uuid
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
@@ -6,7 +6,7 @@ import uuid
 class Medication(Base):
     __tablename__ = "medications"
 
-    medication_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    medication_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     medication_name = Column(String, nullable=False)
     dosage_form = Column(String, nullable=False)
     strength = Column(String, nullable=False)
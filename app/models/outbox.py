@@ -0,0 +1,45 @@
+# app/models/outbox.py
+
+from sqlalchemy import Column, Integer, BigInteger, String, Uuid, DateTime, JSON, Index, text
+from app.db.base_class import Base
+from datetime import datetime
+
+class OutboxEvent(Base):
+    """
+    A change to an inventory lot, transfer or requisition, written in the same
+    transaction as the change itself (transactional outbox).
+
+    event_id follows insert order, so the events of one transaction keep
+    their order, but transactions commit out of event_id order. The relay
+    therefore numbers committed events itself: ``sequence`` is gapless and
+    only ever grows, and is what consumers resume from.
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # The relay's scan for unpublished events stays small however many published ones are kept
+        Index(
+            "ix_outbox_events_unpublished", "event_id",
+            postgresql_where=text("sequence IS NULL"), sqlite_where=text("sequence IS NULL"),
+        ),
+    )
+
+    # SQLite only autoincrements INTEGER primary keys
+    event_id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    aggregate_type = Column(String, nullable=False)  # inventory, transfer or requisition
+    aggregate_id = Column(Uuid(as_uuid=True), nullable=False)
+    event_type = Column(String, nullable=False)  # created, updated, upserted (bulk and stock writes) or deleted
+    payload = Column(JSON, nullable=False)  # The row after the change; before it for deletes
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sequence = Column(BigInteger, nullable=True, unique=True)  # Set by the relay when published
+    published_at = Column(DateTime, nullable=True, index=True)
+
+class OutboxRelayState(Base):
+    """
+    The relay's high-water mark. Relays lock this row while numbering a
+    batch, so sequences are handed out by one relay at a time.
+    """
+    __tablename__ = "outbox_relay_state"
+
+    name = Column(String, primary_key=True)
+    last_sequence = Column(BigInteger, nullable=False, default=0)
+    last_published_at = Column(DateTime, nullable=True)
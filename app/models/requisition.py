@@ -1,6 +1,6 @@
 # app/models/requisition.py
 
-from sqlalchemy import Column, Integer, Enum, ForeignKey, UUID, DateTime
+from sqlalchemy import Column, Integer, Enum, ForeignKey, Uuid, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
@@ -8,16 +8,26 @@ from datetime import datetime
 from enum import Enum as PyEnum
 
 class RequisitionStatus(PyEnum):  # Use Python's Enum
+    draft = "draft"  # Raised automatically, awaiting review
     pending = "pending"
     approved = "approved"
     rejected = "rejected"
+    received = "received"  # Approved and delivered, so no longer on order
+    cancelled = "cancelled"  # Approved, then withdrawn before delivery
 
 class Requisition(Base):
     __tablename__ = "requisition"
+    __table_args__ = (
+        # A facility's requisitions by status, and the open-requisition check of
+        # the reorder scan, which also filters on the medication.
+        Index("ix_requisition_facility_medication_status", "facility_id", "medication_id", "status"),
+        Index("ix_requisition_facility_status", "facility_id", "status"),
+        Index("ix_requisition_status_requested_at", "status", "requested_at"),
+    )
 
-    requisition_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    facility_id = Column(UUID(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
-    medication_id = Column(UUID(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False)
+    requisition_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False, index=True)
     quantity_requested = Column(Integer, nullable=False)
     status = Column(Enum(RequisitionStatus), default=RequisitionStatus.pending, nullable=False)
     requested_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,61 @@
+# app/models/stock_ledger.py
+
+from sqlalchemy import Column, Integer, Date, Enum, ForeignKey, Uuid, DateTime, Index
+from app.db.base_class import Base
+import uuid
+from datetime import datetime
+from enum import Enum as PyEnum
+
+class MovementType(PyEnum):  # Use Python's Enum
+    opening = "opening"  # Stock on hand when the ledger was introduced
+    receipt = "receipt"  # A new lot received at a facility
+    transfer_out = "transfer_out"
+    transfer_in = "transfer_in"
+    dispense = "dispense"
+    adjustment = "adjustment"  # Stock counts and manual corrections
+
+class StockMovement(Base):
+    """
+    Append-only ledger of signed stock changes per lot. Rows are never updated
+    or deleted; a correction is a new adjustment.
+
+    On PostgreSQL the table is range-partitioned by month on occurred_at (see
+    StockLedgerRepository.ensure_month_partitions), which is why occurred_at
+    is part of the primary key.
+    """
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        # Balance lookups sum one pair's movements after its latest snapshot;
+        # including the quantity lets PostgreSQL read them from the index alone.
+        Index(
+            "ix_stock_movements_facility_medication_occurred_at",
+            "facility_id", "medication_id", "occurred_at",
+            postgresql_include=["quantity"],
+        ),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    movement_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    occurred_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False)
+    expiry_date = Column(Date, nullable=True)  # The lot moved, when known
+    quantity = Column(Integer, nullable=False)  # Positive into the facility, negative out of it
+    movement_type = Column(Enum(MovementType), nullable=False)
+    reference_id = Column(Uuid(as_uuid=True), nullable=True)  # Transfer, lot or other source record
+
+class StockBalanceSnapshot(Base):
+    """
+    Balance of a (facility, medication) pair made up of every movement that
+    occurred before ``as_of``.
+    """
+    __tablename__ = "stock_balance_snapshots"
+    __table_args__ = (
+        # Finds the latest snapshot run across all pairs
+        Index("ix_stock_balance_snapshots_as_of", "as_of"),
+    )
+
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), primary_key=True)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), primary_key=True)
+    as_of = Column(DateTime, primary_key=True)
+    quantity = Column(Integer, nullable=False)
@@ -0,0 +1,50 @@
+# app/models/stock_summary.py
+
+from sqlalchemy import Column, Integer, Date, ForeignKey, Uuid, DateTime, Index
+from app.db.base_class import Base
+from datetime import datetime
+
+class FacilityStockSummary(Base):
+    """
+    Running stock totals per (facility, medication), maintained incrementally
+    from inventory (including transfers and dispensing) and requisition writes.
+    """
+    __tablename__ = "facility_stock_summary"
+
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), primary_key=True)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), primary_key=True)
+    quantity_on_hand = Column(Integer, nullable=False, default=0)
+    reorder_level = Column(Integer, nullable=False, default=0)
+    quantity_on_order = Column(Integer, nullable=False, default=0)  # Approved requisitions not yet received
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Partial index holding only the pairs below their reorder level, so a
+        # statewide reorder scan reads just those entries.
+        Index(
+            "ix_stock_summary_below_reorder",
+            "facility_id",
+            "medication_id",
+            postgresql_where=quantity_on_hand < reorder_level,
+            sqlite_where=quantity_on_hand < reorder_level,
+        ),
+        Index("ix_stock_summary_updated_at", "updated_at"),
+    )
+
+class FacilityExpirySummary(Base):
+    """
+    Quantity on hand per (facility, medication, expiry date), so near-expiry
+    totals for a facility, or one medication there, are a short range scan
+    instead of a pass over its inventory.
+    """
+    __tablename__ = "facility_expiry_summary"
+
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), primary_key=True)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), primary_key=True)
+    expiry_date = Column(Date, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Facility-wide totals range over expiry dates across all medications
+        Index("ix_expiry_summary_facility_expiry", "facility_id", "expiry_date"),
+    )
@@ -1,18 +1,24 @@
-from sqlalchemy import Column, Integer, ForeignKey, UUID, DateTime
+from sqlalchemy import Column, Integer, Enum, ForeignKey, Uuid, DateTime
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
 from datetime import datetime
+from enum import Enum as PyEnum
+
+class TransferStatus(PyEnum):  # Use Python's Enum
+    draft = "draft"  # Proposed by the redistribution planner, no stock moved yet
+    completed = "completed"
 
 class Transfer(Base):
     __tablename__ = "transfers"
 
-    transfer_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    from_facility_id = Column(UUID(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
-    to_facility_id = Column(UUID(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
-    medication_id = Column(UUID(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False)
+    transfer_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    from_facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False, index=True)
+    to_facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False, index=True)
+    medication_id = Column(Uuid(as_uuid=True), ForeignKey("medications.medication_id"), nullable=False, index=True)
     quantity_transferred = Column(Integer, nullable=False)
-    transfer_date = Column(DateTime, default=datetime.utcnow)
+    transfer_date = Column(DateTime, default=datetime.utcnow, index=True)
+    status = Column(Enum(TransferStatus), default=TransferStatus.completed, nullable=False, index=True)
 
     # Relationships
     from_facility = relationship("Facility", foreign_keys=[from_facility_id], back_populates="from_transfers")
@@ -1,6 +1,6 @@
 # app/models/user.py
 
-from sqlalchemy import Column, String, Enum, UUID, ForeignKey
+from sqlalchemy import Column, String, Enum, Uuid, ForeignKey
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
@@ -11,14 +11,21 @@ class UserRole(PyEnum):  # Use Python's Enum
     facility_staff = "facility_staff"
     state_official = "state_official"
 
+# Roles allowed to take statewide decisions: requisitions, transfers, redistribution
+DECIDING_ROLES = (UserRole.admin, UserRole.state_official)
+
 class User(Base):
     __tablename__ = "users"
 
-    user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    facility_id = Column(UUID(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False)
+    user_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    facility_id = Column(Uuid(as_uuid=True), ForeignKey("facilities.facility_id"), nullable=False, index=True)
     username = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False)  # Pass the Enum members
 
     # Relationships
     facility = relationship("Facility", back_populates="users")
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.admin
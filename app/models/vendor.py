@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, UUID
+from sqlalchemy import Column, String, Uuid
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import uuid
@@ -6,7 +6,7 @@ import uuid
 class Vendor(Base):
     __tablename__ = "vendors"
 
-    vendor_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    vendor_id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     vendor_name = Column(String, nullable=False)
     contact_name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)
@@ -0,0 +1,209 @@
+# app/relay.py
+
+"""
+Outbox relay.
+
+    python -m app.relay                                  # publish outbox events
+    python -m app.relay --benchmark 30 --writers 4       # throughput under write load
+
+Writes to inventory lots, transfers and requisitions leave events in the
+outbox within their own transactions (see OutboxRepository). The relay
+numbers the committed events in batches while holding the relay state row,
+so sequence numbers are gapless, only ever grow and are handed out by one
+relay at a time; a second relay simply waits its turn. Consumers read the
+numbered events from /api/v1/events and resume from the last sequence they
+saw. Events published longer than OUTBOX_RETENTION_DAYS ago are deleted by
+the outbox_prune job.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import statistics
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, registry
+from app.db import base  # Import all models so relationships between them resolve
+from app.db.retry import run_in_transaction
+from app.db.session import SessionLocal, engine
+from app.models.outbox import OutboxEvent
+from app.repositories.outbox_repository import OutboxRepository
+
+outbox_events_published_total = registry.register(Counter(
+    "outbox_events_published_total", "Outbox events numbered and published by the relay."
+))
+outbox_publish_lag_seconds = registry.register(Histogram(
+    "outbox_publish_lag_seconds", "Time from the oldest event in a relay batch being written to its publication."
+))
+
+class OutboxRelay:
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_RELAY_BATCH
+        self.interval = settings.OUTBOX_RELAY_INTERVAL if interval is None else interval
+
+    def ensure_state(self) -> None:
+        with self.session_factory() as db:
+            try:
+                OutboxRepository(db).ensure_relay_state()
+                db.commit()
+            except IntegrityError:
+                db.rollback()  # Another relay created it first
+
+    def relay_once(self) -> int:
+        """
+        Publish one batch of committed events. Returns the number published.
+        """
+        with self.session_factory() as db:
+            def work() -> Tuple[int, Optional[datetime]]:
+                repo = OutboxRepository(db)
+                last_sequence = repo.lock_relay_state()
+                event_ids = repo.unpublished(self.batch_size)
+                if not event_ids:
+                    return 0, None
+                now = datetime.utcnow()
+                oldest = db.get(OutboxEvent, event_ids[0]).created_at
+                if repo.publish(event_ids, last_sequence, now) is None:
+                    return 0, None
+                return len(event_ids), now - oldest
+
+            published, lag = run_in_transaction(db, work, operation="outbox_relay")
+        if published:
+            outbox_events_published_total.inc(amount=published)
+            outbox_publish_lag_seconds.observe(lag.total_seconds())
+        return published
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Publish until ``stop`` is set, waiting ``interval`` whenever the
+        outbox has been drained.
+        """
+        self.ensure_state()
+        logging.info("Outbox relay started")
+        while not stop.is_set():
+            try:
+                if self.relay_once() < self.batch_size:
+                    stop.wait(self.interval)
+            except Exception as e:
+                logging.error(f"Outbox relay error: {e}")
+                stop.wait(self.interval)
+        logging.info("Outbox relay stopped")
+
+def start_embedded_relay() -> Tuple[threading.Event, threading.Thread]:
+    """
+    Run the relay as a thread of the current process (used by the API when
+    OUTBOX_EMBEDDED_RELAY is set). Set the returned event to stop it.
+    """
+    stop = threading.Event()
+    thread = threading.Thread(target=OutboxRelay().run, args=(stop,), name="outbox-relay", daemon=True)
+    thread.start()
+    return stop, thread
+
+# Aggregate type of the synthetic events written by the benchmark
+BENCHMARK_AGGREGATE = "benchmark"
+
+def _benchmark_writer(stop, events_per_write: int, written) -> None:
+    # Stand-in for an inventory write: one short transaction adding its events
+    engine.dispose(close=False)
+    count = 0
+    with SessionLocal() as db:
+        while not stop.is_set():
+            now = datetime.utcnow()
+            db.execute(insert(OutboxEvent.__table__), [
+                {
+                    "aggregate_type": BENCHMARK_AGGREGATE,
+                    "aggregate_id": uuid.uuid4(),
+                    "event_type": "updated",
+                    "payload": {"quantity": count},
+                    "created_at": now,
+                }
+                for _ in range(events_per_write)
+            ])
+            db.commit()
+            count += events_per_write
+    with written.get_lock():
+        written.value += count
+
+def _relay_process(stop) -> None:
+    engine.dispose(close=False)
+    OutboxRelay().run(stop)
+
+def benchmark(seconds: float, writers: int, events_per_write: int) -> None:
+    """
+    Write synthetic events from ``writers`` processes for ``seconds`` while
+    a relay process publishes them, then report both rates and the
+    publication lag. The synthetic events are deleted afterwards.
+    """
+    OutboxRelay().ensure_state()
+    engine.dispose()
+    stop_writers, stop_relay = multiprocessing.Event(), multiprocessing.Event()
+    written = multiprocessing.Value("q", 0)
+    started_at = datetime.utcnow()
+    relay = multiprocessing.Process(target=_relay_process, args=(stop_relay,), name="outbox-relay")
+    relay.start()
+    processes = [
+        multiprocessing.Process(target=_benchmark_writer, args=(stop_writers, events_per_write, written), name=f"writer-{index}")
+        for index in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(seconds)
+    stop_writers.set()
+    for process in processes:
+        process.join()
+
+    table = OutboxEvent.__table__
+    mine = (table.c.aggregate_type == BENCHMARK_AGGREGATE, table.c.created_at >= started_at)
+    drain_started = time.perf_counter()
+    with SessionLocal() as db:
+        while db.execute(select(table.c.event_id).where(*mine, table.c.sequence.is_(None)).limit(1)).first():
+            db.rollback()
+            time.sleep(0.1)
+        drained = time.perf_counter() - drain_started
+        db.rollback()
+        stop_relay.set()
+        relay.join()
+        lags = sorted(
+            (row.published_at - row.created_at).total_seconds()
+            for row in db.execute(select(table.c.created_at, table.c.published_at).where(*mine))
+        )
+        db.execute(delete(table).where(*mine))
+        db.commit()
+
+    print(
+        f"{writers} writers x {events_per_write} events per transaction for {seconds:.0f}s: "
+        f"{written.value} events, {written.value / seconds:.0f} events/s written, "
+        f"{written.value / (seconds + drained):.0f} events/s published (backlog drained {drained:.1f}s after writes stopped); "
+        f"publication lag p50 {statistics.median(lags):.3f}s, p99 {lags[int(len(lags) * 0.99) - 1]:.3f}s, "
+        f"max {lags[-1]:.3f}s"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish outbox events.")
+    parser.add_argument("--benchmark", type=float, metavar="SECONDS", help="write synthetic events for this long and report relay throughput")
+    parser.add_argument("--writers", type=int, default=4, help="writer processes for --benchmark")
+    parser.add_argument("--events-per-write", type=int, default=10, help="events per writer transaction for --benchmark")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.writers, args.events_per_write)
+    else:
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+        OutboxRelay().run(stop_event)
@@ -0,0 +1,212 @@
+from typing import Any, Generic, Iterable, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from fastapi import HTTPException, status
+from app.core.pagination import build_keyset_query, paginate, primary_key_column
+from app.repositories.base import BaseRepository, CreateSchemaType, ModelType, UpdateSchemaType
+from app.schemas.bulk import BulkWriteResult
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    BaseRepository for AsyncSession. Single-row CRUD and keyset pages await
+    the database directly; bulk writes run the sync repository's
+    implementation on the session's connection through run_sync, so the chunk
+    hooks (and the stock summary maintenance they do) behave the same.
+    """
+
+    # Sync repository whose bulk methods and hooks are reused; subclasses set
+    # their counterpart (e.g. InventoryRepository) when it overrides hooks.
+    sync_repository: Optional[Type[BaseRepository]] = None
+
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
+        self.db = db
+        self.model = model
+        self.pk_column = primary_key_column(model)
+        self.columns = {column.key: column for column in model.__table__.columns}
+
+    def _sync(self, session) -> BaseRepository:
+        if self.sync_repository is not None:
+            return self.sync_repository(session)
+        return BaseRepository(session, self.model)
+
+    def loader_options(self, profile: Optional[str] = None) -> List[Any]:
+        # Profiles are declared on the sync repository; under AsyncSession they
+        # are the only way to reach relationships, which cannot lazy load.
+        return self._sync(self.db.sync_session).loader_options(profile)
+
+    async def get(self, id: Any, profile: Optional[str] = None) -> Optional[ModelType]:
+        try:
+            result = await self.db.execute(
+                select(self.model).options(*self.loader_options(profile)).where(self.pk_column == id)
+            )
+            return result.scalars().first()
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the data."
+            )
+
+    async def get_by_id(self, id: Any, profile: Optional[str] = None) -> Optional[ModelType]:
+        return await self.get(id, profile=profile)
+
+    async def get_multi(self, skip: int = 0, limit: int = 100, profile: Optional[str] = None) -> List[ModelType]:
+        try:
+            result = await self.db.execute(
+                select(self.model).options(*self.loader_options(profile)).offset(skip).limit(limit)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the data."
+            )
+
+    async def get_page(
+        self,
+        after: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100,
+        descending: bool = False,
+        profile: Optional[str] = None,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Retrieve one page of rows using keyset (cursor) pagination; see
+        BaseRepository.get_page.
+        """
+        stmt, columns = build_keyset_query(
+            self.model, after=after, order_by=order_by, limit=limit, descending=descending,
+            sortable=(self.sync_repository or BaseRepository).sortable_columns,
+        )
+        try:
+            rows = (await self.db.execute(stmt.options(*self.loader_options(profile)))).scalars().all()
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the data."
+            )
+        return paginate(rows, columns, limit)
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        # Native Python values (UUID, date, Enum) rather than their JSON forms;
+        # fields with no column (e.g. UserCreate.password) are left to the caller
+        obj_in_data = obj_in if isinstance(obj_in, dict) else obj_in.dict()
+        db_obj = self.model(**{key: value for key, value in obj_in_data.items() if key in self.columns})
+        try:
+            self.db.add(db_obj)
+            await self.db.commit()
+            self._sync(self.db.sync_session).invalidate_cached_responses()
+            await self.db.refresh(db_obj)
+            return db_obj
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A conflict occurred while inserting the data. This might be due to a duplicate entry or other integrity constraints."
+            )
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while inserting the data."
+            )
+
+    async def update(
+        self,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict,
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        try:
+            # Only mapped columns are set; reading relationships here would
+            # need a lazy load, which AsyncSession does not allow.
+            for field in self.columns:
+                if field in update_data:
+                    setattr(db_obj, field, update_data[field])
+            self.db.add(db_obj)
+            await self.db.commit()
+            self._sync(self.db.sync_session).invalidate_cached_responses()
+            await self.db.refresh(db_obj)
+            return db_obj
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A conflict occurred while updating the data. This might be due to a duplicate entry or other integrity constraints."
+            )
+        except StaleDataError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{self.model.__name__} was changed by another request. Reload it and try again."
+            )
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while updating the data."
+            )
+
+    async def remove(self, id: Any) -> ModelType:
+        obj = await self.get(id)
+        if obj is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{self.model.__name__} with id {id} not found",
+            )
+        try:
+            await self.db.delete(obj)
+            await self.db.commit()
+            self._sync(self.db.sync_session).invalidate_cached_responses()
+            return obj
+        except StaleDataError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{self.model.__name__} was changed by another request. Reload it and try again."
+            )
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while deleting the data."
+            )
+
+    async def bulk_create(
+        self,
+        objs_in: Iterable[CreateSchemaType | dict],
+        chunk_size: Optional[int] = None,
+        return_rows: bool = False,
+    ) -> BulkWriteResult:
+        return await self.db.run_sync(
+            lambda session: self._sync(session).bulk_create(objs_in, chunk_size=chunk_size, return_rows=return_rows)
+        )
+
+    async def bulk_update(
+        self,
+        objs_in: Iterable[Tuple[Any, UpdateSchemaType | dict]],
+        chunk_size: Optional[int] = None,
+    ) -> BulkWriteResult:
+        return await self.db.run_sync(lambda session: self._sync(session).bulk_update(objs_in, chunk_size=chunk_size))
+
+    async def bulk_upsert(
+        self,
+        objs_in: Iterable[CreateSchemaType | dict],
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+        return_rows: bool = False,
+    ) -> BulkWriteResult:
+        return await self.db.run_sync(
+            lambda session: self._sync(session).bulk_upsert(
+                objs_in,
+                conflict_columns=conflict_columns,
+                update_columns=update_columns,
+                chunk_size=chunk_size,
+                return_rows=return_rows,
+            )
+        )
@@ -1,25 +1,80 @@
 # Placeholder for app/repositories/base.py
-from typing import Generic, Type, TypeVar, Optional, List
+from itertools import islice
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Type, TypeVar, Optional, List, Sequence, Tuple
+from sqlalchemy import insert, select, update as sql_update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, NoResultFound
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 from fastapi.encoders import jsonable_encoder
 from app.db.base_class import Base
+from app.core.config import settings
+from app.core.pagination import build_keyset_query, paginate, primary_key_column
+from app.core.response_cache import response_cache
+from app.repositories.outbox_repository import OutboxRepository
+from app.schemas.bulk import BulkRowError, BulkWriteResult
 
 # Declare a generic type variable for models and schemas
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def upsert_insert(db: Session, table):
+    """
+    Return an INSERT for ``table`` that supports ON CONFLICT clauses on the
+    session's database (PostgreSQL or SQLite).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on the {dialect} dialect")
+    return dialect_insert(table)
+
+ProjectionType = TypeVar("ProjectionType", bound=BaseModel)
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Named loader option sets (selectinload/joinedload/load_only) that callers
+    # can ask for instead of the lazy relationship defaults, e.g. "detail".
+    load_profiles: Dict[str, Callable[[], List[Any]]] = {}
+
+    # Response cache namespace holding responses built from this table;
+    # committed writes through the repository invalidate it.
+    cache_namespace: Optional[str] = None
+
+    # Columns clients may order keyset pages by, besides the primary key.
+    # Never list secrets: a page cursor carries the last row's sort values.
+    sortable_columns: Tuple[str, ...] = ()
+
     def __init__(self, db: Session, model: Type[ModelType]):
         self.db = db
         self.model = model
+        self.pk_column = primary_key_column(model)
+        self.columns = {column.key: column for column in model.__table__.columns}
+        # Optimistic concurrency column (mapper version_id_col), if the model has one
+        self.version_column = model.__mapper__.version_id_col
+
+    def loader_options(self, profile: Optional[str] = None) -> List[Any]:
+        if profile is None:
+            return []
+        build = self.load_profiles.get(profile)
+        if build is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown load profile '{profile}' for {self.model.__name__}. Use one of: {', '.join(self.load_profiles)}.",
+            )
+        return build()
+
+    def invalidate_cached_responses(self) -> None:
+        if self.cache_namespace is not None:
+            response_cache.invalidate(self.cache_namespace)
 
-    def get(self, id: int) -> Optional[ModelType]:
+    def get(self, id: int, profile: Optional[str] = None) -> Optional[ModelType]:
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first()
+            return self.db.query(self.model).options(*self.loader_options(profile)).filter(self.pk_column == id).first()
         except NoResultFound:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -31,17 +86,77 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 detail="An error occurred while fetching the data."
             )
 
-    def get_by_id(self, id: int) -> Optional[ModelType]:
-        return self.get(id)  # Reuse the get method, already handles exceptions
+    def get_by_id(self, id: int, profile: Optional[str] = None) -> Optional[ModelType]:
+        return self.get(id, profile=profile)  # Reuse the get method, already handles exceptions
+
+    def get_multi(self, skip: int = 0, limit: int = 100, profile: Optional[str] = None) -> List[ModelType]:
+        try:
+            return self.db.query(self.model).options(*self.loader_options(profile)).offset(skip).limit(limit).all()
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the data."
+            )
+
+    def get_page(
+        self,
+        after: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100,
+        descending: bool = False,
+        profile: Optional[str] = None,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Retrieve one page of rows using keyset (cursor) pagination.
 
-    def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        Rows are ordered by ``order_by`` (the primary key by default) with the
+        primary key as a tie-breaker. Returns the page and an opaque cursor for
+        the next page, or None when this is the last one.
+        """
+        stmt, columns = build_keyset_query(
+            self.model, after=after, order_by=order_by, limit=limit, descending=descending,
+            sortable=self.sortable_columns,
+        )
+        try:
+            rows = self.db.execute(stmt.options(*self.loader_options(profile))).scalars().all()
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the data."
+            )
+        return paginate(rows, columns, limit)
+
+    def get_projected_page(
+        self,
+        schema: Type[ProjectionType],
+        after: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100,
+        descending: bool = False,
+        filters: Sequence[Any] = (),
+    ) -> Tuple[List[ProjectionType], Optional[str]]:
+        """
+        Like get_page, but select only the columns named by ``schema``'s fields
+        and return schema instances built straight from the Core rows, so no
+        ORM identities are created or tracked by the session.
+        """
+        stmt, columns = build_keyset_query(
+            self.model, after=after, order_by=order_by, limit=limit, descending=descending,
+            sortable=self.sortable_columns,
+        )
+        fields = list(schema.__fields__)
+        # The sort columns are fetched too so the next cursor can be built
+        selected = [self.columns[name] for name in fields] + [column for column in columns if column.key not in fields]
         try:
-            return self.db.query(self.model).offset(skip).limit(limit).all()
+            rows = self.db.execute(stmt.with_only_columns(*selected).where(*filters)).all()
         except SQLAlchemyError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while fetching the data."
             )
+        page, next_cursor = paginate(rows, columns, limit)
+        # Values come from typed columns, so the schema's validation is skipped
+        return [schema.construct(**{name: row._mapping[name] for name in fields}) for row in page], next_cursor
 
     def create(self, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -49,6 +164,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         try:
             self.db.add(db_obj)
             self.db.commit()
+            self.invalidate_cached_responses()
             self.db.refresh(db_obj)
             return db_obj
         except IntegrityError:
@@ -80,6 +196,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                     setattr(db_obj, field, update_data[field])
             self.db.add(db_obj)
             self.db.commit()
+            self.invalidate_cached_responses()
             self.db.refresh(db_obj)
             return db_obj
         except IntegrityError:
@@ -88,6 +205,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 status_code=status.HTTP_409_CONFLICT,
                 detail="A conflict occurred while updating the data. This might be due to a duplicate entry or other integrity constraints."
             )
+        except StaleDataError:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{self.model.__name__} was changed by another request. Reload it and try again."
+            )
         except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(
@@ -105,10 +228,266 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         try:
             self.db.delete(obj)
             self.db.commit()
+            self.invalidate_cached_responses()
             return obj
+        except StaleDataError:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{self.model.__name__} was changed by another request. Reload it and try again."
+            )
         except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while deleting the data."
             )
+
+    def _row_data(self, obj_in: BaseModel | dict) -> Dict[str, Any]:
+        # Keep native Python types (UUID, date, Enum) so the driver binds them directly
+        data = obj_in if isinstance(obj_in, dict) else obj_in.dict()
+        return {
+            key: value for key, value in data.items()
+            if key in self.columns and not (value is None and self.columns[key].default is not None)
+        }
+
+    def _missing_columns(self, row: Dict[str, Any]) -> List[str]:
+        return [
+            key for key, column in self.columns.items()
+            if not column.nullable and column.default is None and column.server_default is None
+            and not column.primary_key and row.get(key) is None
+        ]
+
+    def _chunks(self, rows: Iterable[Tuple[int, Dict[str, Any]]], chunk_size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _uniform_chunks(
+        self, rows: Iterable[Tuple[int, Dict[str, Any]]], chunk_size: int
+    ) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+        # Rows of one executemany must bind the same columns, so a chunk also
+        # ends where the columns given change; rows keep their input order
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        for index, row in rows:
+            if chunk and (len(chunk) >= chunk_size or row.keys() != chunk[0][1].keys()):
+                yield chunk
+                chunk = []
+            chunk.append((index, row))
+        if chunk:
+            yield chunk
+
+    def _prepare_rows(
+        self, objs_in: Iterable[BaseModel | dict], result: BulkWriteResult, require_all: bool = True
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        for index, obj_in in enumerate(objs_in):
+            try:
+                row = self._row_data(obj_in)
+            except (TypeError, ValueError) as e:
+                result.errors.append(BulkRowError(index=index, detail=f"Invalid row: {e}"))
+                continue
+            missing = self._missing_columns(row) if require_all else []
+            if missing:
+                result.errors.append(
+                    BulkRowError(index=index, detail=f"Missing required fields: {', '.join(missing)}")
+                )
+                continue
+            yield index, row
+
+    def before_bulk_chunk(self, stmt, params: List[Dict[str, Any]]) -> Any:
+        """
+        Hook run inside a bulk chunk's savepoint before the chunk is written.
+        Whatever it returns is handed to after_bulk_chunk.
+        """
+        return None
+
+    def after_bulk_chunk(self, stmt, params: List[Dict[str, Any]], state: Any) -> None:
+        """
+        Hook run inside a bulk chunk's savepoint after the chunk is written, so
+        any extra writes it makes commit or roll back with the chunk.
+        """
+
+    def _fill_versions(self, params: List[Dict[str, Any]]) -> None:
+        # ORM bulk UPDATE of a versioned model matches on the version it is
+        # given; rows sent without one are checked against the current version.
+        # A row that no longer exists fails that check and rejects its chunk.
+        version_key = self.version_column.key
+        ids = [row[self.pk_column.key] for row in params if version_key not in row]
+        if not ids:
+            return
+        current = dict(self.db.execute(
+            select(self.pk_column, self.version_column).where(self.pk_column.in_(ids))
+        ).all())
+        for row in params:
+            row.setdefault(version_key, current.get(row[self.pk_column.key]))
+
+    def _execute_chunks(
+        self,
+        stmt,
+        rows: Iterable[Tuple[int, Dict[str, Any]]],
+        result: BulkWriteResult,
+        chunk_size: int,
+        return_rows: bool = False,
+        event_type: str = "updated",
+        chunk_statement: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> BulkWriteResult:
+        """
+        Write ``rows`` chunk by chunk with ``stmt``. With ``chunk_statement``,
+        a chunk only holds rows giving the same columns and is written with
+        the statement it builds from its first row instead.
+        """
+        outbox = OutboxRepository(self.db)
+        chunks = self._chunks(rows, chunk_size) if chunk_statement is None else self._uniform_chunks(rows, chunk_size)
+        for chunk in chunks:
+            params = [row for _, row in chunk]
+            if chunk_statement is not None:
+                stmt = chunk_statement(params[0])
+            try:
+                # Each chunk runs in its own savepoint so a bad row only
+                # rejects the batch it was sent with.
+                with self.db.begin_nested():
+                    if not stmt.is_insert and self.version_column is not None:
+                        self._fill_versions(params)
+                    state = self.before_bulk_chunk(stmt, params)
+                    if stmt.is_insert:
+                        returned = self.db.execute(stmt, params).all()
+                        written_ids = [row._mapping[self.pk_column.key] for row in returned]
+                    else:
+                        self.db.execute(stmt, params)
+                        returned = None
+                        written_ids = [row[self.pk_column.key] for row in params]
+                    self.after_bulk_chunk(stmt, params, state)
+                    # Change events commit or roll back with the chunk (no-op for models without them)
+                    outbox.record_rows(self.model, event_type, self.pk_column.in_(written_ids))
+            except IntegrityError:
+                detail = "Batch rejected: duplicate entry or other integrity constraint violation."
+                result.errors.extend(BulkRowError(index=index, detail=detail) for index, _ in chunk)
+                continue
+            except StaleDataError:
+                detail = "Batch rejected: a row was changed or deleted by another request."
+                result.errors.extend(BulkRowError(index=index, detail=detail) for index, _ in chunk)
+                continue
+            except SQLAlchemyError:
+                detail = "Batch rejected: an error occurred while writing the data."
+                result.errors.extend(BulkRowError(index=index, detail=detail) for index, _ in chunk)
+                continue
+
+            if returned is None:
+                result.ids.extend(row[self.pk_column.key] for row in params)
+            elif return_rows:
+                mappings = [dict(row._mapping) for row in returned]
+                result.ids.extend(row[self.pk_column.key] for row in mappings)
+                result.rows.extend(mappings)
+            else:
+                result.ids.extend(row[0] for row in returned)
+
+        try:
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while committing the bulk write."
+            )
+        self.invalidate_cached_responses()
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    def _returning(self, stmt, return_rows: bool):
+        if return_rows:
+            return stmt.returning(*self.model.__table__.columns)
+        return stmt.returning(self.pk_column)
+
+    def bulk_create(
+        self,
+        objs_in: Iterable[CreateSchemaType | dict],
+        chunk_size: Optional[int] = None,
+        return_rows: bool = False,
+    ) -> BulkWriteResult:
+        """
+        Insert many rows using multi-row INSERT statements, one per chunk.
+
+        Returns the new primary keys (or full rows when ``return_rows`` is set)
+        and a per-row error report for rows that were rejected.
+        """
+        result = BulkWriteResult()
+        stmt = self._returning(insert(self.model), return_rows)
+        rows = self._prepare_rows(objs_in, result)
+        return self._execute_chunks(
+            stmt, rows, result, chunk_size or settings.BULK_CHUNK_SIZE, return_rows, event_type="created"
+        )
+
+    def bulk_update(
+        self,
+        objs_in: Iterable[Tuple[Any, UpdateSchemaType | dict]],
+        chunk_size: Optional[int] = None,
+    ) -> BulkWriteResult:
+        """
+        Update many rows by primary key from ``(id, changes)`` pairs.
+
+        Only the fields set on each update schema are written; rows are sent
+        as an executemany UPDATE per chunk.
+        """
+        result = BulkWriteResult()
+
+        def rows() -> Iterator[Tuple[int, Dict[str, Any]]]:
+            for index, (id, obj_in) in enumerate(objs_in):
+                data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+                row = {key: value for key, value in data.items() if key in self.columns}
+                if not row:
+                    result.errors.append(BulkRowError(index=index, detail="No fields to update."))
+                    continue
+                row[self.pk_column.key] = id
+                yield index, row
+
+        return self._execute_chunks(sql_update(self.model), rows(), result, chunk_size or settings.BULK_CHUNK_SIZE)
+
+    def bulk_upsert(
+        self,
+        objs_in: Iterable[CreateSchemaType | dict],
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+        return_rows: bool = False,
+    ) -> BulkWriteResult:
+        """
+        Insert many rows, updating existing ones that collide on ``conflict_columns``.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite. The
+        conflict columns default to the primary key and must be backed by a
+        unique index; ``update_columns`` defaults to every other column given.
+        An existing row only has the columns a row supplies overwritten, so a
+        partial row keeps the values it leaves out.
+        """
+        conflict_columns = list(conflict_columns or [self.pk_column.key])
+        version_key = self.version_column.key if self.version_column is not None else None
+        statements: Dict[frozenset, Any] = {}
+
+        def statement_for(row: Dict[str, Any]):
+            keys = frozenset(row)
+            if keys not in statements:
+                stmt = upsert_insert(self.db, self.model)
+                updated = update_columns if update_columns is not None else [
+                    key for key in self.columns
+                    if key not in conflict_columns and key not in (self.pk_column.key, version_key)
+                ]
+                set_ = {key: stmt.excluded[key] for key in updated if key in keys}
+                if version_key is not None:
+                    # Overwriting an existing row counts as a new version of it
+                    set_[version_key] = self.version_column + 1
+                if set_:
+                    stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_)
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+                statements[keys] = self._returning(stmt, return_rows)
+            return statements[keys]
+
+        result = BulkWriteResult()
+        rows = self._prepare_rows(objs_in, result)
+        return self._execute_chunks(
+            None, rows, result, chunk_size or settings.BULK_CHUNK_SIZE, return_rows, event_type="upserted",
+            chunk_statement=statement_for,
+        )
@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+from sqlalchemy import Integer, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models.purchase_order import PurchaseOrder
+from app.models.requisition import Requisition, RequisitionStatus
+from app.models.stock_summary import FacilityStockSummary
+from app.models.transfer import Transfer, TransferStatus
+
+# Requisitions that express real demand: drafts are unreviewed, rejections and
+# cancellations were refused or withdrawn
+DEMAND_STATUSES = (RequisitionStatus.pending, RequisitionStatus.approved, RequisitionStatus.received)
+
+class DemandRepository:
+    """
+    Demand history and stock positions for order forecasting.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _epoch_days(self, column):
+        # Fractional days since 1970-01-01, so periods and lead times are plain arithmetic
+        if self.db.get_bind().dialect.name == "postgresql":
+            return func.extract("epoch", column) / 86400.0
+        return func.julianday(column) - 2440587.5
+
+    def history_query(self, start: datetime, end: datetime, period_days: int, facility_id: Optional[UUID] = None) -> Select:
+        """
+        Demand per (facility, medication, period) between ``start`` and
+        ``end``, where period 0 begins at ``start``. A facility's demand is
+        what it asked to be replenished with: its pending and approved
+        requisitions plus the transfers it received.
+        """
+        requested = select(
+            Requisition.facility_id.label("facility_id"),
+            Requisition.medication_id.label("medication_id"),
+            Requisition.requested_at.label("occurred_at"),
+            Requisition.quantity_requested.label("quantity"),
+        ).where(
+            Requisition.status.in_(DEMAND_STATUSES),
+            Requisition.requested_at >= start,
+            Requisition.requested_at < end,
+        )
+        received = select(
+            Transfer.to_facility_id, Transfer.medication_id, Transfer.transfer_date, Transfer.quantity_transferred
+        ).where(
+            Transfer.status == TransferStatus.completed,
+            Transfer.transfer_date >= start,
+            Transfer.transfer_date < end,
+        )
+        if facility_id is not None:
+            requested = requested.where(Requisition.facility_id == facility_id)
+            received = received.where(Transfer.to_facility_id == facility_id)
+
+        demand = union_all(requested, received).subquery()
+        start_days = self._epoch_days(literal(start))
+        period = cast((self._epoch_days(demand.c.occurred_at) - start_days) / period_days, Integer).label("period")
+        return (
+            select(demand.c.facility_id, demand.c.medication_id, period, func.sum(demand.c.quantity))
+            .group_by(demand.c.facility_id, demand.c.medication_id, period)
+        )
+
+    def positions_query(self, facility_id: Optional[UUID] = None) -> Select:
+        summary = FacilityStockSummary
+        stmt = select(summary.facility_id, summary.medication_id, summary.quantity_on_hand, summary.quantity_on_order)
+        if facility_id is not None:
+            stmt = stmt.where(summary.facility_id == facility_id)
+        return stmt
+
+    def vendor_lead_times(self, since: datetime) -> Dict[UUID, float]:
+        """
+        Average days from order to expected delivery per vendor, over the
+        purchase orders placed since ``since``.
+        """
+        lead_time = self._epoch_days(PurchaseOrder.expected_delivery_date) - self._epoch_days(PurchaseOrder.order_date)
+        stmt = (
+            select(PurchaseOrder.vendor_id, func.avg(lead_time))
+            .where(PurchaseOrder.order_date >= since)
+            .group_by(PurchaseOrder.vendor_id)
+        )
+        return {vendor_id: float(days) for vendor_id, days in self.db.execute(stmt)}
+
+    def medication_vendors(self) -> Dict[UUID, UUID]:
+        """
+        The vendor of each medication's most recent purchase order.
+        """
+        ranked = (
+            select(
+                Requisition.medication_id,
+                PurchaseOrder.vendor_id,
+                func.row_number().over(
+                    partition_by=Requisition.medication_id,
+                    order_by=(PurchaseOrder.order_date.desc(), PurchaseOrder.purchase_order_id),
+                ).label("position"),
+            )
+            .join(Requisition, Requisition.requisition_id == PurchaseOrder.requisition_id)
+            .subquery()
+        )
+        stmt = select(ranked.c.medication_id, ranked.c.vendor_id).where(ranked.c.position == 1)
+        return dict(self.db.execute(stmt).all())
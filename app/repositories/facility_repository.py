@@ -1 +1,66 @@
-# Placeholder for app/repositories/facility_repository.py
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
+from app.models.facility import Facility
+from app.models.inventory import Inventory
+from app.models.medication import Medication
+from app.models.transfer import Transfer, TransferStatus
+from app.schemas.facility import FacilityCreate, FacilityUpdate
+from app.repositories.base import BaseRepository
+
+# Transfers newer than this many days make up a facility's recent transfers
+RECENT_TRANSFER_DAYS = 30
+
+def stock_lots_option():
+    # Lots with only the name of their medication, in one extra round trip
+    return selectinload(Facility.inventory).options(
+        joinedload(Inventory.medication).load_only(Medication.medication_name)
+    )
+
+def recent_transfer_options(since: datetime) -> List[Any]:
+    """
+    Completed transfers in both directions since ``since``, with the other facility's
+    and the medication's names: one round trip per direction. The
+    collections then hold only the recent transfers, so treat them as
+    read-only.
+    """
+    return [
+        selectinload(relationship.and_(Transfer.transfer_date >= since, Transfer.status == TransferStatus.completed)).options(
+            joinedload(counterpart).load_only(Facility.facility_name),
+            joinedload(Transfer.medication).load_only(Medication.medication_name),
+        )
+        for relationship, counterpart in (
+            (Facility.from_transfers, Transfer.to_facility),
+            (Facility.to_transfers, Transfer.from_facility),
+        )
+    ]
+
+def detail_options(since: datetime) -> List[Any]:
+    # Any other relationship raises instead of lazy loading row by row
+    return [stock_lots_option(), *recent_transfer_options(since), raiseload("*")]
+
+class FacilityRepository(BaseRepository[Facility, FacilityCreate, FacilityUpdate]):
+    cache_namespace = "facilities"
+    sortable_columns = ("facility_name",)
+    load_profiles = {
+        "summary": lambda: [load_only(Facility.facility_name, Facility.facility_type, Facility.state, Facility.city)],
+        "stock": lambda: [stock_lots_option()],
+        "detail": lambda: detail_options(datetime.utcnow() - timedelta(days=RECENT_TRANSFER_DAYS)),
+    }
+
+    def __init__(self, db: Session):
+        super().__init__(db, Facility)
+
+    def get_detail(self, facility_id: UUID, transfers_since: Optional[datetime] = None) -> Optional[Facility]:
+        """
+        Load a facility with its stock lots and recent transfers in four
+        round trips, whatever the number of lots and transfers.
+        """
+        since = transfers_since or datetime.utcnow() - timedelta(days=RECENT_TRANSFER_DAYS)
+        return (
+            self.db.query(Facility)
+            .options(*detail_options(since))
+            .filter(Facility.facility_id == facility_id)
+            .first()
+        )
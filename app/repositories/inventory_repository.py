@@ -1 +1,232 @@
-# Placeholder for app/repositories/inventory_repository.py
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql import Select
+from app.models.inventory import Inventory
+from app.models.stock_ledger import MovementType
+from app.schemas.bulk import BulkWriteResult
+from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.repositories.base import BaseRepository, upsert_insert
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.stock_ledger_repository import Movement, StockLedgerRepository, lot_movements
+from app.repositories.stock_summary_repository import StockDelta, StockSummaryRepository
+
+# Natural key of an inventory lot, backed by the uq_inventory_lot constraint
+LOT_KEY = ("facility_id", "medication_id", "expiry_date")
+
+class StockConflictError(StaleDataError):
+    """
+    A lot no longer held the stock a debit was planned against: another
+    transaction took from it after it was read.
+    """
+
+class LotQuantity(NamedTuple):
+    inventory_id: Optional[UUID]
+    expiry_date: date
+    quantity: int
+    reorder_level: int = 0
+
+class InventoryRepository(BaseRepository[Inventory, InventoryCreate, InventoryUpdate]):
+    def __init__(self, db: Session):
+        super().__init__(db, Inventory)
+
+    def upsert_lots(self, lots: Iterable[InventoryCreate | dict], chunk_size: Optional[int] = None) -> BulkWriteResult:
+        """
+        Insert or overwrite inventory lots keyed on (facility, medication, expiry date).
+        """
+        return self.bulk_upsert(
+            lots,
+            conflict_columns=LOT_KEY,
+            update_columns=["quantity", "reorder_level"],
+            chunk_size=chunk_size,
+        )
+
+    def before_bulk_chunk(self, stmt, params: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Capture the current state of every lot the chunk touches so the stock
+        summary can be moved by the difference.
+        """
+        table = Inventory.__table__
+        columns = [table.c.inventory_id, *(table.c[key] for key in LOT_KEY), table.c.quantity, table.c.reorder_level]
+        if stmt.is_insert:
+            keys = {tuple(row[key] for key in LOT_KEY) for row in params}
+            existing = self.db.execute(select(*columns).where(tuple_(*columns[1:4]).in_(keys)))
+            return {tuple(row[1:4]): dict(row._mapping) for row in existing}
+        existing = self.db.execute(
+            select(*columns).where(table.c.inventory_id.in_([row["inventory_id"] for row in params]))
+        )
+        return {row.inventory_id: dict(row._mapping) for row in existing}
+
+    def after_bulk_chunk(self, stmt, params: List[Dict[str, Any]], state: Dict[Any, Dict[str, Any]]) -> None:
+        deltas, movements = [], []
+        for row in params:
+            key = tuple(row[key] for key in LOT_KEY) if stmt.is_insert else row["inventory_id"]
+            previous = state.get(key)
+            if previous is None and not stmt.is_insert:
+                continue
+            current = {**(previous or {}), **row}
+            if previous is not None:
+                deltas.append(StockDelta(
+                    previous["facility_id"], previous["medication_id"], -previous["quantity"], previous["expiry_date"]
+                ))
+            deltas.append(StockDelta(
+                current["facility_id"], current["medication_id"], current["quantity"],
+                current["expiry_date"], current["reorder_level"],
+            ))
+            movements.extend(lot_movements(previous, current, current.get("inventory_id")))
+            # A lot repeated within the chunk replaces the value written just before it
+            state[key] = current
+        StockSummaryRepository(self.db).apply_deltas(deltas)
+        StockLedgerRepository(self.db).append(movements)
+
+    def available_lots_query(
+        self,
+        facility_id: UUID,
+        medication_id: UUID,
+        as_of: date,
+        exclude: Sequence[UUID] = (),
+        limit: int = 50,
+    ) -> Select:
+        """
+        Unexpired lots with stock, earliest expiry first; served by uq_inventory_lot.
+        """
+        table = Inventory.__table__
+        stmt = (
+            select(table.c.inventory_id, table.c.expiry_date, table.c.quantity, table.c.reorder_level)
+            .where(
+                table.c.facility_id == facility_id,
+                table.c.medication_id == medication_id,
+                table.c.expiry_date >= as_of,
+                table.c.quantity > 0,
+            )
+            .order_by(table.c.expiry_date, table.c.inventory_id)
+            .limit(limit)
+        )
+        if exclude:
+            stmt = stmt.where(table.c.inventory_id.notin_(exclude))
+        return stmt
+
+    def lock_available_lots(
+        self,
+        facility_id: UUID,
+        medication_id: UUID,
+        as_of: date,
+        skip_locked: bool = True,
+        exclude: Sequence[UUID] = (),
+        limit: int = 50,
+    ) -> List[LotQuantity]:
+        """
+        Lock and return unexpired lots with stock, earliest expiry first.
+
+        With ``skip_locked`` lots held by other transactions are passed over
+        instead of waited on (SELECT ... FOR UPDATE SKIP LOCKED). Backends
+        without row locks ignore the locking clause.
+        """
+        stmt = self.available_lots_query(facility_id, medication_id, as_of, exclude, limit)
+        stmt = stmt.with_for_update(skip_locked=skip_locked)
+        return [LotQuantity(*row) for row in self.db.execute(stmt)]
+
+    def debit_lots(
+        self,
+        facility_id: UUID,
+        medication_id: UUID,
+        lots: Sequence[LotQuantity],
+        movement_type: MovementType = MovementType.dispense,
+        reference_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Take the given quantities out of the lots in one executemany UPDATE,
+        recording a ``movement_type`` ledger entry and an outbox event per lot.
+
+        Each lot is only decremented while it still holds the quantity taken
+        (UPDATE ... WHERE quantity >= :taken), so stock cannot go negative
+        even where the lots could not be locked first. Raises
+        StockConflictError, leaving the transaction to be rolled back, if any
+        lot fell short.
+        """
+        table = Inventory.__table__
+        stmt = (
+            update(table)
+            .where(table.c.inventory_id == bindparam("lot_id"), table.c.quantity >= bindparam("taken"))
+            .values(quantity=table.c.quantity - bindparam("taken"), version=table.c.version + 1)
+        )
+        params = [{"lot_id": lot.inventory_id, "taken": lot.quantity} for lot in lots]
+        connection = self.db.connection()
+        if connection.dialect.supports_sane_multi_rowcount:
+            matched = connection.execute(stmt, params).rowcount
+        else:
+            matched = sum(connection.execute(stmt, row).rowcount for row in params)
+        if matched != len(params):
+            raise StockConflictError(
+                f"{len(params) - matched} of {len(params)} lots changed before they could be debited."
+            )
+        StockSummaryRepository(self.db).apply_deltas(
+            StockDelta(facility_id, medication_id, -lot.quantity, lot.expiry_date) for lot in lots
+        )
+        OutboxRepository(self.db).record_rows(
+            Inventory, "updated", table.c.inventory_id.in_([lot.inventory_id for lot in lots])
+        )
+        StockLedgerRepository(self.db).append(
+            Movement(facility_id, medication_id, -lot.quantity, movement_type, lot.expiry_date, reference_id)
+            for lot in lots
+        )
+
+    def credit_lots(
+        self,
+        facility_id: UUID,
+        medication_id: UUID,
+        lots: Sequence[LotQuantity],
+        movement_type: MovementType = MovementType.transfer_in,
+        reference_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Add quantities to the facility's lots with matching expiry dates,
+        creating lots that do not exist there yet, and record a
+        ``movement_type`` ledger entry and an outbox event per lot.
+        """
+        table = Inventory.__table__
+        stmt = upsert_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(LOT_KEY),
+            set_={"quantity": table.c.quantity + stmt.excluded.quantity, "version": table.c.version + 1},
+        )
+        self.db.connection().execute(stmt, [
+            {
+                "inventory_id": uuid.uuid4(),
+                "facility_id": facility_id,
+                "medication_id": medication_id,
+                "quantity": lot.quantity,
+                "reorder_level": lot.reorder_level,
+                "expiry_date": lot.expiry_date,
+            }
+            for lot in lots
+        ])
+        StockSummaryRepository(self.db).apply_deltas(
+            StockDelta(facility_id, medication_id, lot.quantity, lot.expiry_date, lot.reorder_level) for lot in lots
+        )
+        OutboxRepository(self.db).record_rows(
+            Inventory, "upserted",
+            table.c.facility_id == facility_id,
+            table.c.medication_id == medication_id,
+            table.c.expiry_date.in_([lot.expiry_date for lot in lots]),
+        )
+        StockLedgerRepository(self.db).append(
+            Movement(facility_id, medication_id, lot.quantity, movement_type, lot.expiry_date, reference_id)
+            for lot in lots
+        )
+
+    def export_query(self, facility_id: Optional[UUID] = None, medication_id: Optional[UUID] = None) -> Select:
+        """
+        Build a Core SELECT over the inventory table for streaming exports.
+        """
+        table = Inventory.__table__
+        stmt = select(table)
+        if facility_id is not None:
+            stmt = stmt.where(table.c.facility_id == facility_id)
+        if medication_id is not None:
+            stmt = stmt.where(table.c.medication_id == medication_id)
+        return stmt
@@ -0,0 +1,186 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.job import Job, JobSchedule, JobStatus
+
+# Columns a worker needs to run a claimed job
+CLAIMED_COLUMNS = ("job_id", "job_type", "payload", "attempts", "max_attempts")
+
+class JobRepository:
+    """
+    The durable job queue. Nothing here commits: claims and outcomes are
+    committed by the worker right away, enqueues with the caller's work.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        run_at: Optional[datetime] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        schedule_name: Optional[str] = None,
+    ) -> Job:
+        now = datetime.utcnow()
+        job = Job(
+            job_type=job_type,
+            payload=payload or {},
+            status=JobStatus.queued,
+            priority=priority,
+            run_at=run_at or now,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            schedule_name=schedule_name,
+            created_at=now,
+        )
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def enqueue_many(self, jobs: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        Enqueue plain job rows (job_type, payload, ...) with one multi-row
+        INSERT per chunk. Returns the number enqueued.
+        """
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        now = datetime.utcnow()
+        rows = [
+            {
+                "job_id": uuid.uuid4(),
+                "payload": {},
+                "status": JobStatus.queued,
+                "priority": 0,
+                "run_at": now,
+                "attempts": 0,
+                "max_attempts": settings.JOB_MAX_ATTEMPTS,
+                "created_at": now,
+                **job,
+            }
+            for job in jobs
+        ]
+        for start in range(0, len(rows), chunk_size):
+            self.db.execute(insert(Job.__table__), rows[start:start + chunk_size])
+        return len(rows)
+
+    def _claimable(self, now: datetime):
+        # Due queued jobs, and running jobs whose worker let the lease lapse
+        table = Job.__table__
+        return or_(
+            (table.c.status == JobStatus.queued) & (table.c.run_at <= now),
+            (table.c.status == JobStatus.running) & (table.c.locked_until < now),
+        )
+
+    def claim(self, worker_id: str, limit: int, lease: timedelta, now: Optional[datetime] = None) -> List:
+        """
+        Move up to ``limit`` claimable jobs, highest priority and earliest
+        first, to running under ``worker_id`` until now + ``lease``, counting
+        an attempt. Rows locked by another worker's claim are skipped
+        (FOR UPDATE SKIP LOCKED), so workers never wait on each other or
+        claim the same job. SQLite has no row locks but runs one writer at a
+        time, so the single UPDATE is atomic there. Returns the claimed rows.
+        """
+        now = now or datetime.utcnow()
+        table = Job.__table__
+        returning = tuple(table.c[name] for name in CLAIMED_COLUMNS)
+        candidates = (
+            select(table.c.job_id)
+            .where(self._claimable(now))
+            .order_by(table.c.priority.desc(), table.c.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        values = {
+            "status": JobStatus.running,
+            "locked_by": worker_id,
+            "locked_until": now + lease,
+            "attempts": table.c.attempts + 1,
+            "started_at": now,
+        }
+        if self.db.get_bind().dialect.update_returning:
+            stmt = update(table).where(table.c.job_id.in_(candidates.scalar_subquery())).values(**values)
+            return self.db.execute(stmt.returning(*returning)).all()
+
+        # Lock the candidates, then claim exactly those
+        ids = self.db.execute(candidates).scalars().all()
+        if not ids:
+            return []
+        self.db.execute(update(table).where(table.c.job_id.in_(ids)).values(**values))
+        return self.db.execute(select(*returning).where(table.c.job_id.in_(ids))).all()
+
+    def _held(self, job_ids: Sequence[UUID], worker_id: str):
+        # Only the worker holding the lease may touch a running job
+        table = Job.__table__
+        return (table.c.job_id.in_(job_ids), table.c.locked_by == worker_id, table.c.status == JobStatus.running)
+
+    def extend_leases(self, job_ids: Sequence[UUID], worker_id: str, locked_until: datetime) -> int:
+        if not job_ids:
+            return 0
+        stmt = update(Job.__table__).where(*self._held(job_ids, worker_id)).values(locked_until=locked_until)
+        return self.db.execute(stmt).rowcount
+
+    def complete(self, job_id: UUID, worker_id: str, result: Optional[Dict[str, Any]], now: datetime) -> bool:
+        stmt = update(Job.__table__).where(*self._held([job_id], worker_id)).values(
+            status=JobStatus.succeeded, result=result, last_error=None, finished_at=now, locked_by=None, locked_until=None
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def fail(self, job_id: UUID, worker_id: str, error: str, now: datetime, retry_at: Optional[datetime] = None) -> bool:
+        """
+        Record a failed attempt: back in the queue until ``retry_at``, or
+        failed for good without one.
+        """
+        if retry_at is not None:
+            values = {"status": JobStatus.queued, "run_at": retry_at}
+        else:
+            values = {"status": JobStatus.failed, "finished_at": now}
+        stmt = update(Job.__table__).where(*self._held([job_id], worker_id)).values(
+            last_error=error, locked_by=None, locked_until=None, **values
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def cancel(self, job_id: UUID, now: datetime) -> bool:
+        # Only queued jobs can be cancelled; a running one finishes its attempt
+        table = Job.__table__
+        stmt = update(table).where(table.c.job_id == job_id, table.c.status == JobStatus.queued).values(
+            status=JobStatus.cancelled, finished_at=now
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def get(self, job_id: UUID) -> Optional[Job]:
+        return self.db.get(Job, job_id)
+
+    def job_filters(self, status: Optional[JobStatus] = None, job_type: Optional[str] = None) -> list:
+        conditions = []
+        if status is not None:
+            conditions.append(Job.status == status)
+        if job_type is not None:
+            conditions.append(Job.job_type == job_type)
+        return conditions
+
+    def due_schedules(self, now: datetime) -> List[JobSchedule]:
+        stmt = select(JobSchedule).where(JobSchedule.enabled.is_(True), JobSchedule.next_run_at <= now)
+        return self.db.execute(stmt).scalars().all()
+
+    def advance_schedule(self, name: str, due_at: datetime, next_run_at: datetime, now: datetime) -> bool:
+        """
+        Move a schedule from ``due_at`` to ``next_run_at`` if no other worker
+        has done so yet. The worker that wins enqueues that run's job, so
+        each run is enqueued once however many workers see it due.
+        """
+        table = JobSchedule.__table__
+        stmt = update(table).where(table.c.name == name, table.c.next_run_at == due_at).values(
+            next_run_at=next_run_at, last_run_at=now
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def get_schedule(self, name: str) -> Optional[JobSchedule]:
+        return self.db.get(JobSchedule, name)
+
+    def list_schedules(self) -> List[JobSchedule]:
+        return self.db.execute(select(JobSchedule).order_by(JobSchedule.name)).scalars().all()
@@ -1 +1,28 @@
-# Placeholder for app/repositories/medication_repository.py
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from app.models.facility import Facility
+from app.models.inventory import Inventory
+from app.models.medication import Medication
+from app.schemas.medication import MedicationCreate, MedicationUpdate
+from app.repositories.base import BaseRepository
+
+def stock_by_facility_option():
+    # Lots with only the name of the facility holding them, in one extra round trip
+    return selectinload(Medication.inventory).options(
+        joinedload(Inventory.facility).load_only(Facility.facility_name)
+    )
+
+class MedicationRepository(BaseRepository[Medication, MedicationCreate, MedicationUpdate]):
+    cache_namespace = "medications"
+    sortable_columns = ("medication_name",)
+    load_profiles = {
+        "stock": lambda: [stock_by_facility_option()],
+        "detail": lambda: [stock_by_facility_option(), raiseload("*")],
+    }
+
+    def __init__(self, db: Session):
+        super().__init__(db, Medication)
+
+    def get_detail(self, medication_id: UUID) -> Optional[Medication]:
+        return self.get(medication_id, profile="detail")
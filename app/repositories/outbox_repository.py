@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.models.inventory import Inventory
+from app.models.outbox import OutboxEvent, OutboxRelayState
+from app.models.requisition import Requisition
+from app.models.transfer import Transfer
+
+# Models whose changes are written to the outbox, and their aggregate type
+OUTBOX_AGGREGATES = {
+    Inventory: "inventory",
+    Transfer: "transfer",
+    Requisition: "requisition",
+}
+
+# Name of the relay state row; there is one sequence for the whole feed
+RELAY_STATE = "default"
+
+def _aggregate_key(model) -> str:
+    return inspect(model).primary_key[0].key
+
+class OutboxRepository:
+    """
+    Writes outbox events inside the caller's transaction, and hands them
+    sequence numbers for the relay. Nothing here commits.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def append(self, model, event_type: str, rows: Iterable[Mapping[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        Write one ``event_type`` event per row of ``model`` (full column
+        mappings) in multi-row INSERTs. Models outside OUTBOX_AGGREGATES are
+        ignored. Returns the number of events written.
+        """
+        aggregate_type = OUTBOX_AGGREGATES.get(model)
+        if aggregate_type is None:
+            return 0
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        key = _aggregate_key(model)
+        now = datetime.utcnow()
+        events = [
+            {
+                "aggregate_type": aggregate_type,
+                "aggregate_id": row[key],
+                "event_type": event_type,
+                "payload": jsonable_encoder(dict(row)),
+                "created_at": now,
+            }
+            for row in rows
+        ]
+        for start in range(0, len(events), chunk_size):
+            self.db.connection().execute(insert(OutboxEvent.__table__), events[start:start + chunk_size])
+        return len(events)
+
+    def record_rows(self, model, event_type: str, *where) -> int:
+        """
+        Write an event for every ``model`` row matching ``where``, as it is
+        now. Used after Core UPDATEs and upserts, which leave no ORM state
+        behind to build the events from.
+        """
+        if model not in OUTBOX_AGGREGATES:
+            return 0
+        rows = self.db.connection().execute(select(model.__table__).where(*where)).mappings().all()
+        return self.append(model, event_type, rows)
+
+    def ensure_relay_state(self) -> None:
+        if self.db.get(OutboxRelayState, RELAY_STATE) is None:
+            self.db.add(OutboxRelayState(name=RELAY_STATE, last_sequence=0))
+            self.db.flush()
+
+    def lock_relay_state(self) -> int:
+        """
+        Lock the relay state row until the transaction ends and return the
+        last sequence handed out.
+        """
+        table = OutboxRelayState.__table__
+        stmt = select(table.c.last_sequence).where(table.c.name == RELAY_STATE).with_for_update()
+        return self.db.execute(stmt).scalar_one()
+
+    def unpublished(self, limit: int) -> List[int]:
+        table = OutboxEvent.__table__
+        stmt = select(table.c.event_id).where(table.c.sequence.is_(None)).order_by(table.c.event_id).limit(limit)
+        return self.db.execute(stmt).scalars().all()
+
+    def publish(self, event_ids: Sequence[int], last_sequence: int, now: datetime) -> Optional[int]:
+        """
+        Number the given events (in event_id order) from ``last_sequence`` + 1
+        and move the relay state past them. Returns the new last sequence, or
+        None without numbering anything if the state is no longer at
+        ``last_sequence`` (another relay published first; only possible
+        where the state row could not be locked, as on SQLite).
+        """
+        state = OutboxRelayState.__table__
+        new_last = last_sequence + len(event_ids)
+        advanced = self.db.execute(
+            update(state)
+            .where(state.c.name == RELAY_STATE, state.c.last_sequence == last_sequence)
+            .values(last_sequence=new_last, last_published_at=now)
+        ).rowcount
+        if not advanced:
+            return None
+        table = OutboxEvent.__table__
+        stmt = (
+            update(table)
+            .where(table.c.event_id == bindparam("id"))
+            .values(sequence=bindparam("seq"), published_at=now)
+        )
+        self.db.connection().execute(stmt, [
+            {"id": event_id, "seq": last_sequence + offset} for offset, event_id in enumerate(event_ids, start=1)
+        ])
+        return new_last
+
+    def prune(self, published_before: datetime, chunk_size: Optional[int] = None) -> int:
+        """
+        Delete one chunk of events published before ``published_before``.
+        Returns the number deleted; call again until it returns 0.
+        """
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = OutboxEvent.__table__
+        expired = (
+            select(table.c.event_id)
+            .where(table.c.published_at < published_before)
+            .order_by(table.c.published_at)
+            .limit(chunk_size)
+        )
+        stmt = delete(table).where(table.c.event_id.in_(expired.scalar_subquery()))
+        return self.db.execute(stmt).rowcount
+
+    def head_query(self) -> Select:
+        # The last sequence handed out
+        state = OutboxRelayState.__table__
+        return select(state.c.last_sequence).where(state.c.name == RELAY_STATE)
+
+    def oldest_query(self) -> Select:
+        # The first sequence still kept
+        return select(func.min(OutboxEvent.__table__.c.sequence))
+
+    def feed_query(self, after: int, upto: int, limit: int, aggregate_type: Optional[str] = None) -> Select:
+        """
+        Published events with after < sequence <= upto, in sequence order.
+        """
+        table = OutboxEvent.__table__
+        stmt = (
+            select(
+                table.c.sequence, table.c.aggregate_type, table.c.aggregate_id,
+                table.c.event_type, table.c.payload, table.c.created_at,
+            )
+            .where(table.c.sequence > after, table.c.sequence <= upto)
+            .order_by(table.c.sequence)
+            .limit(limit)
+        )
+        if aggregate_type is not None:
+            stmt = stmt.where(table.c.aggregate_type == aggregate_type)
+        return stmt
+
+def _column_values(obj, deleted: bool = False) -> dict:
+    # Values as the flush left them; a deleted row keeps what was loaded,
+    # since reading an unloaded attribute would query a row that is gone
+    state = inspect(obj)
+    keys = [attr.key for attr in state.mapper.column_attrs]
+    if deleted:
+        return {key: state.dict.get(key) for key in keys}
+    return {key: getattr(obj, key) for key in keys}
+
+@event.listens_for(Session, "after_flush")
+def record_outbox_events(session: Session, flush_context) -> None:
+    # Grouped so each (model, event type) is one multi-row INSERT
+    changes: Dict[Tuple[Any, str], List[dict]] = {}
+    for obj in session.new:
+        if type(obj) in OUTBOX_AGGREGATES:
+            changes.setdefault((type(obj), "created"), []).append(_column_values(obj))
+    for obj in session.dirty:
+        if type(obj) in OUTBOX_AGGREGATES and session.is_modified(obj, include_collections=False):
+            changes.setdefault((type(obj), "updated"), []).append(_column_values(obj))
+    for obj in session.deleted:
+        if type(obj) in OUTBOX_AGGREGATES:
+            changes.setdefault((type(obj), "deleted"), []).append(_column_values(obj, deleted=True))
+
+    repo = OutboxRepository(session)
+    for (model, event_type), rows in changes.items():
+        repo.append(model, event_type, rows)
@@ -1 +1,26 @@
 # Placeholder for app/repositories/purchase_order_repository.py
+import uuid
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.purchase_order import PurchaseOrder
+from app.schemas.purchase_order import PurchaseOrderCreate, PurchaseOrderUpdate
+from app.repositories.base import BaseRepository
+
+class PurchaseOrderRepository(BaseRepository[PurchaseOrder, PurchaseOrderCreate, PurchaseOrderUpdate]):
+    def __init__(self, db: Session):
+        super().__init__(db, PurchaseOrder)
+
+    def insert_orders(self, orders: Iterable[Dict], chunk_size: Optional[int] = None) -> List[Dict]:
+        """
+        Insert purchase orders with one multi-row INSERT per chunk inside the
+        caller's transaction, so they commit or roll back with whatever raised
+        them. Ids are assigned here; returns the rows as written.
+        """
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = PurchaseOrder.__table__
+        rows = [{"purchase_order_id": uuid.uuid4(), **order} for order in orders]
+        for start in range(0, len(rows), chunk_size):
+            self.db.connection().execute(insert(table), rows[start:start + chunk_size])
+        return rows
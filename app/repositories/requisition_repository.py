@@ -1 +1,94 @@
-# Placeholder for app/repositories/requisition_repository.py
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models.requisition import Requisition, RequisitionStatus
+from app.schemas.requisition import RequisitionCreate, RequisitionUpdate
+from app.core.config import settings
+from app.repositories.base import BaseRepository
+from app.repositories.outbox_repository import OutboxRepository
+
+class RequisitionRepository(BaseRepository[Requisition, RequisitionCreate, RequisitionUpdate]):
+    def __init__(self, db: Session):
+        super().__init__(db, Requisition)
+
+    def export_query(self, facility_id: Optional[UUID] = None, status: Optional[RequisitionStatus] = None) -> Select:
+        """
+        Build a Core SELECT over the requisition table for streaming exports.
+        """
+        table = Requisition.__table__
+        stmt = select(table)
+        if facility_id is not None:
+            stmt = stmt.where(table.c.facility_id == facility_id)
+        if status is not None:
+            stmt = stmt.where(table.c.status == status)
+        return stmt
+
+    def _scope(self, facility_id: Optional[UUID]) -> tuple:
+        # Limit a batch to one facility's requisitions when the caller is its staff
+        return (Requisition.__table__.c.facility_id == facility_id,) if facility_id is not None else ()
+
+    def transition(
+        self,
+        requisition_ids: Sequence[UUID],
+        to_status: RequisitionStatus,
+        decided_at: datetime,
+        from_statuses: Sequence[RequisitionStatus] = (RequisitionStatus.pending,),
+        facility_id: Optional[UUID] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List:
+        """
+        Move the given requisitions that are still in one of ``from_statuses``
+        to ``to_status`` with one set-based UPDATE per chunk of ids, stamping
+        approved_at when they are being approved. The status guard in the
+        WHERE clause means a requisition moved concurrently is left alone;
+        given ``facility_id``, requisitions of other facilities are too.
+        Returns the (requisition_id, facility_id, medication_id,
+        quantity_requested) rows that changed, each of which also gets an
+        outbox event. Does not commit.
+        """
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = Requisition.__table__
+        returning = (table.c.requisition_id, table.c.facility_id, table.c.medication_id, table.c.quantity_requested)
+        values = {"status": to_status}
+        if to_status == RequisitionStatus.approved:
+            values["approved_at"] = decided_at
+        changed = []
+        for start in range(0, len(requisition_ids), chunk_size):
+            chunk = requisition_ids[start:start + chunk_size]
+            guard = (table.c.requisition_id.in_(chunk), table.c.status.in_(from_statuses), *self._scope(facility_id))
+            stmt = update(table).where(*guard).values(**values)
+            if self.db.get_bind().dialect.update_returning:
+                changed.extend(self.db.execute(stmt.returning(*returning)).all())
+            else:
+                # Lock the rows that will change, then change exactly those
+                rows = self.db.execute(select(*returning).where(*guard).with_for_update()).all()
+                if rows:
+                    self.db.execute(
+                        update(table)
+                        .where(table.c.requisition_id.in_([row.requisition_id for row in rows]))
+                        .values(**values)
+                    )
+                changed.extend(rows)
+        if changed:
+            outbox = OutboxRepository(self.db)
+            changed_ids = [row.requisition_id for row in changed]
+            for start in range(0, len(changed_ids), chunk_size):
+                outbox.record_rows(Requisition, "updated", table.c.requisition_id.in_(changed_ids[start:start + chunk_size]))
+        return changed
+
+    def get_statuses(
+        self, requisition_ids: Sequence[UUID], facility_id: Optional[UUID] = None, chunk_size: Optional[int] = None
+    ) -> Dict[UUID, RequisitionStatus]:
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = Requisition.__table__
+        statuses = {}
+        for start in range(0, len(requisition_ids), chunk_size):
+            chunk = requisition_ids[start:start + chunk_size]
+            statuses.update(self.db.execute(
+                select(table.c.requisition_id, table.c.status)
+                .where(table.c.requisition_id.in_(chunk), *self._scope(facility_id))
+            ).all())
+        return statuses
@@ -0,0 +1,273 @@
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+from uuid import UUID
+from sqlalchemy import event, func, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.models.inventory import Inventory
+from app.models.stock_ledger import MovementType, StockBalanceSnapshot, StockMovement
+from app.repositories.base import upsert_insert
+from app.repositories.stock_summary_repository import INVENTORY_KEYS, _changed, _snapshot
+
+# Lower bound for balances of pairs that have no snapshot yet
+LEDGER_EPOCH = datetime(1970, 1, 1)
+
+_NOT_LOADED = object()
+
+# Snapshots must lie at least this far in the past, so transactions that
+# stamped their movements just before as_of have committed by then.
+SNAPSHOT_SETTLE_TIME = timedelta(minutes=5)
+
+class ClosedPeriodError(ValueError):
+    """
+    A movement was dated before the latest snapshot, which would change a
+    balance that has already been snapshotted.
+    """
+
+class Movement(NamedTuple):
+    """
+    One signed stock change to append to the ledger.
+    """
+    facility_id: UUID
+    medication_id: UUID
+    quantity: int
+    movement_type: MovementType
+    expiry_date: Optional[date] = None
+    reference_id: Optional[UUID] = None
+    occurred_at: Optional[datetime] = None  # Now when not given
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+class StockLedgerRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def latest_snapshot_time(self) -> Optional[datetime]:
+        return self.db.execute(select(func.max(StockBalanceSnapshot.as_of))).scalar_one()
+
+    def append(self, movements: Iterable[Movement], chunk_size: Optional[int] = None) -> int:
+        """
+        Append movements in multi-row INSERTs of ``chunk_size`` rows, inside the
+        caller's transaction. Zero quantities are skipped. Returns the number
+        of rows written.
+
+        Movements stamped by the caller must not be older than the latest
+        snapshot (the period is closed); raises ClosedPeriodError otherwise.
+        """
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = StockMovement.__table__
+        now = datetime.utcnow()
+        closed_before = _NOT_LOADED
+        written = 0
+        rows: List[dict] = []
+
+        for movement in movements:
+            if not movement.quantity:
+                continue
+            if movement.occurred_at is not None:
+                if closed_before is _NOT_LOADED:
+                    closed_before = self.latest_snapshot_time()
+                if closed_before is not None and movement.occurred_at < closed_before:
+                    raise ClosedPeriodError(
+                        f"Movements cannot be dated before the latest balance snapshot ({closed_before.isoformat()})."
+                    )
+            rows.append({
+                "movement_id": uuid.uuid4(),
+                "occurred_at": movement.occurred_at or now,
+                "facility_id": movement.facility_id,
+                "medication_id": movement.medication_id,
+                "expiry_date": movement.expiry_date,
+                "quantity": movement.quantity,
+                "movement_type": movement.movement_type,
+                "reference_id": movement.reference_id,
+            })
+            if len(rows) >= chunk_size:
+                self.db.connection().execute(insert(table), rows)
+                written += len(rows)
+                rows = []
+        if rows:
+            self.db.connection().execute(insert(table), rows)
+            written += len(rows)
+        return written
+
+    def balance_query(self, facility_id: UUID, medication_id: UUID, at: datetime) -> Select:
+        """
+        Balance of a pair made up of the movements before ``at``: the latest
+        snapshot at or before ``at`` plus the movements since that snapshot.
+        Both parts are short index range scans, however long the ledger is.
+        """
+        snapshot = StockBalanceSnapshot
+        latest = (
+            select(snapshot.as_of, snapshot.quantity)
+            .where(snapshot.facility_id == facility_id, snapshot.medication_id == medication_id, snapshot.as_of <= at)
+            .order_by(snapshot.as_of.desc())
+            .limit(1)
+        )
+        snapshot_as_of = latest.with_only_columns(snapshot.as_of).scalar_subquery()
+        snapshot_quantity = latest.with_only_columns(snapshot.quantity).scalar_subquery()
+        moved = (
+            select(func.coalesce(func.sum(StockMovement.quantity), 0))
+            .where(
+                StockMovement.facility_id == facility_id,
+                StockMovement.medication_id == medication_id,
+                StockMovement.occurred_at >= func.coalesce(snapshot_as_of, LEDGER_EPOCH),
+                StockMovement.occurred_at < at,
+            )
+            .scalar_subquery()
+        )
+        return select((func.coalesce(snapshot_quantity, 0) + moved).label("quantity"), snapshot_as_of.label("snapshot_as_of"))
+
+    def balance_as_of(self, facility_id: UUID, medication_id: UUID, at: datetime):
+        """
+        Return (quantity, as_of of the snapshot it started from or None).
+        """
+        return self.db.execute(self.balance_query(facility_id, medication_id, at)).one()
+
+    def movement_filters(
+        self,
+        facility_id: Optional[UUID] = None,
+        medication_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list:
+        conditions = []
+        if facility_id is not None:
+            conditions.append(StockMovement.facility_id == facility_id)
+        if medication_id is not None:
+            conditions.append(StockMovement.medication_id == medication_id)
+        if start is not None:
+            conditions.append(StockMovement.occurred_at >= start)
+        if end is not None:
+            conditions.append(StockMovement.occurred_at < end)
+        return conditions
+
+    def movements_query(self, **filters) -> Select:
+        return select(StockMovement.__table__).where(*self.movement_filters(**filters))
+
+    def take_snapshots(self, as_of: datetime) -> int:
+        """
+        Snapshot the balance of every pair as of ``as_of``, from the previous
+        snapshot run plus the movements since it, in one INSERT ... SELECT.
+        Every pair seen so far is carried forward, so each run is complete on
+        its own. Re-running for the same ``as_of`` recomputes it. Does not commit.
+        """
+        if as_of > datetime.utcnow() - SNAPSHOT_SETTLE_TIME:
+            raise ValueError(f"Snapshots must be at least {SNAPSHOT_SETTLE_TIME} in the past.")
+
+        snapshot = StockBalanceSnapshot.__table__
+        movements = StockMovement.__table__
+        previous_run = self.db.execute(
+            select(func.max(snapshot.c.as_of)).where(snapshot.c.as_of < as_of)
+        ).scalar_one()
+
+        moved = select(movements.c.facility_id, movements.c.medication_id, movements.c.quantity).where(
+            movements.c.occurred_at < as_of
+        )
+        if previous_run is not None:
+            # A literal lower bound, so PostgreSQL prunes older partitions
+            moved = moved.where(movements.c.occurred_at >= previous_run)
+            carried = select(snapshot.c.facility_id, snapshot.c.medication_id, snapshot.c.quantity).where(
+                snapshot.c.as_of == previous_run
+            )
+            combined = union_all(carried, moved).subquery()
+        else:
+            combined = moved.subquery()
+
+        totals = select(
+            combined.c.facility_id, combined.c.medication_id, literal(as_of, StockBalanceSnapshot.as_of.type),
+            func.sum(combined.c.quantity),
+        ).group_by(combined.c.facility_id, combined.c.medication_id)
+        stmt = upsert_insert(self.db, snapshot).from_select(
+            ["facility_id", "medication_id", "as_of", "quantity"], totals
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["facility_id", "medication_id", "as_of"],
+            set_={"quantity": stmt.excluded.quantity},
+        )
+        return self.db.execute(stmt).rowcount
+
+    def ensure_month_partitions(self, start: date, months: int = 3) -> List[str]:
+        """
+        Create the monthly partitions of stock_movements from ``start``'s month
+        for ``months`` months, and the default partition if it is missing
+        (PostgreSQL only; other backends do not partition). Run ahead of time:
+        rows for a month without a partition land in the default partition,
+        after which that month's partition cannot be added.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return []
+        self.db.execute(text("CREATE TABLE IF NOT EXISTS stock_movements_default PARTITION OF stock_movements DEFAULT"))
+        created = []
+        first = month_start(start)
+        for _ in range(months):
+            following = next_month(first)
+            name = f"stock_movements_p{first:%Y_%m}"
+            self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF stock_movements "
+                f"FOR VALUES FROM ('{first.isoformat()}') TO ('{following.isoformat()}')"
+            ))
+            created.append(name)
+            first = following
+        return created
+
+# --- Ledger entries for ORM writes to inventory ------------------------------
+#
+# Lots created, changed or deleted through the ORM (BaseRepository.create/
+# update/remove) are recorded as receipts and adjustments after each flush,
+# in the same transaction. Core writes append their own movements (see
+# InventoryRepository.after_bulk_chunk, debit_lots and credit_lots).
+
+def lot_movements(previous: Optional[dict], current: Optional[dict], lot_id: Optional[UUID]) -> List[Movement]:
+    """
+    Ledger entries for one lot write, from its values before (None for a new
+    lot) and after (None for a deleted one): a new lot is a receipt, a changed
+    one is adjusted by the difference, and a re-keyed one is emptied and
+    refilled under its new key.
+    """
+    def movement(values: dict, quantity: int, movement_type: MovementType) -> Movement:
+        return Movement(
+            facility_id=values["facility_id"],
+            medication_id=values["medication_id"],
+            quantity=quantity,
+            movement_type=movement_type,
+            expiry_date=values["expiry_date"],
+            reference_id=lot_id,
+        )
+
+    if previous is None:
+        return [movement(current, current["quantity"], MovementType.receipt)]
+    if current is None:
+        return [movement(previous, -previous["quantity"], MovementType.adjustment)]
+    if all(previous[key] == current[key] for key in ("facility_id", "medication_id", "expiry_date")):
+        return [movement(current, current["quantity"] - previous["quantity"], MovementType.adjustment)]
+    return [
+        movement(previous, -previous["quantity"], MovementType.adjustment),
+        movement(current, current["quantity"], MovementType.adjustment),
+    ]
+
+@event.listens_for(Session, "after_flush")
+def record_inventory_movements(session: Session, flush_context) -> None:
+    movements: List[Movement] = []
+
+    for obj in session.new:
+        if isinstance(obj, Inventory):
+            movements.extend(lot_movements(None, _snapshot(obj, INVENTORY_KEYS), obj.inventory_id))
+
+    for obj in session.dirty:
+        if isinstance(obj, Inventory) and _changed(obj, INVENTORY_KEYS):
+            movements.extend(lot_movements(
+                _snapshot(obj, INVENTORY_KEYS, previous=True), _snapshot(obj, INVENTORY_KEYS), obj.inventory_id
+            ))
+
+    for obj in session.deleted:
+        if isinstance(obj, Inventory):
+            movements.extend(lot_movements(_snapshot(obj, INVENTORY_KEYS, previous=True), None, obj.inventory_id))
+
+    if movements:
+        StockLedgerRepository(session).append(movements)
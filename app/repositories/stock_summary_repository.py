@@ -0,0 +1,378 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import and_, bindparam, delete, event, func, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models.facility import Facility
+from app.models.inventory import Inventory
+from app.models.requisition import Requisition, RequisitionStatus
+from app.models.stock_summary import FacilityExpirySummary, FacilityStockSummary
+from app.repositories.base import upsert_insert
+
+class StockDelta(NamedTuple):
+    """
+    A signed change to the stock of one medication at one facility.
+    """
+    facility_id: UUID
+    medication_id: UUID
+    quantity: int = 0
+    expiry_date: Optional[date] = None  # None when the change is not tied to a lot
+    reorder_level: Optional[int] = None  # Set when the change may move the pair's reorder level
+    on_order: int = 0
+
+# Requisitions that stop the reorder scan from raising another for their pair
+OPEN_STATUSES = (RequisitionStatus.draft, RequisitionStatus.pending, RequisitionStatus.approved)
+
+class StockSummaryRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _upsert_stock(self, rows: List[dict]) -> None:
+        table = FacilityStockSummary.__table__
+        stmt = upsert_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["facility_id", "medication_id"],
+            set_={
+                "quantity_on_hand": table.c.quantity_on_hand + stmt.excluded.quantity_on_hand,
+                "quantity_on_order": table.c.quantity_on_order + stmt.excluded.quantity_on_order,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.connection().execute(stmt, rows)
+
+    def _refresh_reorder_levels(self, pairs: List[Tuple[UUID, UUID]]) -> None:
+        # The pair's reorder level is the highest of its lots, as in rebuild()
+        table = FacilityStockSummary.__table__
+        highest = (
+            select(func.coalesce(func.max(Inventory.reorder_level), 0))
+            .where(Inventory.facility_id == table.c.facility_id, Inventory.medication_id == table.c.medication_id)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(table)
+            .where(table.c.facility_id == bindparam("pair_facility_id"), table.c.medication_id == bindparam("pair_medication_id"))
+            .values(reorder_level=highest)
+        )
+        self.db.connection().execute(stmt, [
+            {"pair_facility_id": facility_id, "pair_medication_id": medication_id} for facility_id, medication_id in pairs
+        ])
+
+    def _upsert_expiry(self, rows: List[dict]) -> None:
+        table = FacilityExpirySummary.__table__
+        stmt = upsert_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["facility_id", "medication_id", "expiry_date"],
+            set_={"quantity": table.c.quantity + stmt.excluded.quantity},
+        )
+        self.db.connection().execute(stmt, rows)
+
+    def apply_deltas(self, deltas: Iterable[StockDelta]) -> None:
+        """
+        Fold a batch of stock deltas into the summary tables.
+
+        Deltas are first combined per key so each summary row is written once,
+        and keys are written in sorted order so concurrent writers lock rows in
+        the same order. Pairs whose deltas carry a reorder level have it
+        recomputed from their lots afterwards; plain debits skip that.
+        """
+        stock: Dict[Tuple[UUID, UUID], List[int]] = {}
+        levels: Set[Tuple[UUID, UUID]] = set()
+        expiry: Dict[Tuple[UUID, UUID, date], int] = defaultdict(int)
+        for delta in deltas:
+            key = (delta.facility_id, delta.medication_id)
+            entry = stock.setdefault(key, [0, 0])
+            entry[0] += delta.quantity
+            entry[1] += delta.on_order
+            if delta.reorder_level is not None:
+                levels.add(key)
+            if delta.expiry_date is not None and delta.quantity:
+                expiry[(delta.facility_id, delta.medication_id, delta.expiry_date)] += delta.quantity
+
+        if stock:
+            now = datetime.utcnow()
+            self._upsert_stock([
+                {
+                    "facility_id": facility_id,
+                    "medication_id": medication_id,
+                    "quantity_on_hand": quantity,
+                    "reorder_level": 0,  # Only for new rows; set below from the lots
+                    "quantity_on_order": on_order,
+                    "updated_at": now,
+                }
+                for (facility_id, medication_id), (quantity, on_order) in sorted(stock.items())
+            ])
+        if levels:
+            self._refresh_reorder_levels(sorted(levels))
+
+        expiry_rows = [
+            {"facility_id": facility_id, "medication_id": medication_id, "expiry_date": expiry_date, "quantity": quantity}
+            for (facility_id, medication_id, expiry_date), quantity in sorted(expiry.items()) if quantity
+        ]
+        if expiry_rows:
+            self._upsert_expiry(expiry_rows)
+
+    def get_facility_levels(self, facility_id: UUID) -> List[FacilityStockSummary]:
+        return self.db.query(FacilityStockSummary).filter(FacilityStockSummary.facility_id == facility_id).all()
+
+    def get_reorder_level(self, facility_id: UUID, medication_id: UUID) -> Optional[int]:
+        stmt = select(FacilityStockSummary.reorder_level).where(
+            FacilityStockSummary.facility_id == facility_id,
+            FacilityStockSummary.medication_id == medication_id,
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def get_expiring_quantity(
+        self,
+        facility_id: UUID,
+        within_days: int,
+        today: Optional[date] = None,
+        medication_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Quantity at a facility, of every medication or just ``medication_id``,
+        whose lots expire between today and ``within_days`` from now.
+        """
+        today = today or date.today()
+        stmt = select(func.coalesce(func.sum(FacilityExpirySummary.quantity), 0)).where(
+            FacilityExpirySummary.facility_id == facility_id,
+            FacilityExpirySummary.expiry_date >= today,
+            FacilityExpirySummary.expiry_date <= today + timedelta(days=within_days),
+        )
+        if medication_id is not None:
+            stmt = stmt.where(FacilityExpirySummary.medication_id == medication_id)
+        return self.db.execute(stmt).scalar_one()
+
+    def below_reorder_query(self, since: Optional[datetime] = None):
+        """
+        Select every (facility, medication) pair whose stock is under its
+        reorder level and that has no open requisition: one still to be
+        decided (draft or pending) or approved and not yet received.
+
+        The predicate matches ix_stock_summary_below_reorder, so the scan reads
+        only the qualifying index entries. ``since`` limits it to pairs whose
+        stock changed at or after that time.
+        """
+        summary = FacilityStockSummary
+        open_requisition = (
+            select(Requisition.requisition_id)
+            .where(
+                Requisition.facility_id == summary.facility_id,
+                Requisition.medication_id == summary.medication_id,
+                Requisition.status.in_(OPEN_STATUSES),
+            )
+            .exists()
+        )
+        stmt = select(
+            summary.facility_id, summary.medication_id, summary.quantity_on_hand, summary.reorder_level
+        ).where(summary.quantity_on_hand < summary.reorder_level, ~open_requisition)
+        if since is not None:
+            stmt = stmt.where(summary.updated_at >= since)
+        return stmt
+
+    def surplus_query(self, state: str, as_of: date) -> Select:
+        """
+        Select the pairs in ``state`` holding more unexpired stock than their
+        reorder level: facility, medication, city, the surplus and the earliest
+        unexpired expiry date (the lots a first-expiry-first-out transfer
+        would draw on).
+        """
+        summary = FacilityStockSummary
+        usable = (
+            select(
+                Inventory.facility_id,
+                Inventory.medication_id,
+                func.sum(Inventory.quantity).label("quantity"),
+                func.min(Inventory.expiry_date).label("earliest_expiry"),
+            )
+            .join(Facility, Facility.facility_id == Inventory.facility_id)
+            .where(Facility.state == state, Inventory.expiry_date >= as_of, Inventory.quantity > 0)
+            .group_by(Inventory.facility_id, Inventory.medication_id)
+            .subquery()
+        )
+        return (
+            select(
+                usable.c.facility_id,
+                usable.c.medication_id,
+                Facility.city,
+                usable.c.quantity - summary.reorder_level,
+                usable.c.earliest_expiry,
+            )
+            .join(summary, and_(summary.facility_id == usable.c.facility_id, summary.medication_id == usable.c.medication_id))
+            .join(Facility, Facility.facility_id == usable.c.facility_id)
+            .where(usable.c.quantity > summary.reorder_level)
+        )
+
+    def shortfall_query(self, state: str) -> Select:
+        """
+        Select the pairs in ``state`` under their reorder level: facility,
+        medication, city and the quantity that would bring them up to it.
+        """
+        summary = FacilityStockSummary
+        return (
+            select(summary.facility_id, summary.medication_id, Facility.city, summary.reorder_level - summary.quantity_on_hand)
+            .join(Facility, Facility.facility_id == summary.facility_id)
+            .where(Facility.state == state, summary.quantity_on_hand < summary.reorder_level)
+        )
+
+    def rebuild(self) -> None:
+        """
+        Recompute both summary tables from inventory and requisitions. Used to
+        seed the summary and to repair it; normal writes keep it current.
+        """
+        stock = FacilityStockSummary.__table__
+        expiry = FacilityExpirySummary.__table__
+        now = datetime.utcnow()
+
+        on_order = (
+            select(
+                Requisition.facility_id,
+                Requisition.medication_id,
+                func.sum(Requisition.quantity_requested).label("quantity_on_order"),
+            )
+            .where(Requisition.status == RequisitionStatus.approved)
+            .group_by(Requisition.facility_id, Requisition.medication_id)
+            .subquery()
+        )
+        on_hand = (
+            select(
+                Inventory.facility_id,
+                Inventory.medication_id,
+                func.sum(Inventory.quantity).label("quantity_on_hand"),
+                func.max(Inventory.reorder_level).label("reorder_level"),
+            )
+            .group_by(Inventory.facility_id, Inventory.medication_id)
+            .subquery()
+        )
+
+        self.db.execute(delete(stock))
+        self.db.execute(delete(expiry))
+        self.db.execute(
+            insert(stock).from_select(
+                ["facility_id", "medication_id", "quantity_on_hand", "reorder_level", "quantity_on_order", "updated_at"],
+                select(
+                    on_hand.c.facility_id,
+                    on_hand.c.medication_id,
+                    on_hand.c.quantity_on_hand,
+                    on_hand.c.reorder_level,
+                    func.coalesce(on_order.c.quantity_on_order, 0),
+                    literal(now),
+                ).outerjoin(
+                    on_order,
+                    and_(
+                        on_order.c.facility_id == on_hand.c.facility_id,
+                        on_order.c.medication_id == on_hand.c.medication_id,
+                    ),
+                ),
+            )
+        )
+        # Requisitions approved for medications the facility holds no stock of yet
+        self.db.execute(
+            insert(stock).from_select(
+                ["facility_id", "medication_id", "quantity_on_hand", "reorder_level", "quantity_on_order", "updated_at"],
+                select(
+                    on_order.c.facility_id,
+                    on_order.c.medication_id,
+                    literal(0),
+                    literal(0),
+                    on_order.c.quantity_on_order,
+                    literal(now),
+                ).where(
+                    ~select(stock.c.facility_id)
+                    .where(stock.c.facility_id == on_order.c.facility_id, stock.c.medication_id == on_order.c.medication_id)
+                    .exists()
+                ),
+            )
+        )
+        self.db.execute(
+            insert(expiry).from_select(
+                ["facility_id", "medication_id", "expiry_date", "quantity"],
+                select(Inventory.facility_id, Inventory.medication_id, Inventory.expiry_date, func.sum(Inventory.quantity))
+                .group_by(Inventory.facility_id, Inventory.medication_id, Inventory.expiry_date),
+            )
+        )
+        self.db.commit()
+
+# --- Incremental maintenance from ORM writes ---------------------------------
+#
+# Inventory and requisition rows written through the ORM (including
+# BaseRepository.create/update/remove) are turned into deltas after each flush,
+# inside the same transaction. Core writes bypass the unit of work and report
+# their own deltas (see InventoryRepository.after_bulk_chunk and the lot
+# debit/credit methods used by transfers and dispensing).
+
+INVENTORY_KEYS = ("facility_id", "medication_id", "expiry_date", "quantity", "reorder_level")
+REQUISITION_KEYS = ("facility_id", "medication_id", "quantity_requested", "status")
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    # Registered with active_history=True so that the value being replaced is
+    # loaded first and shows up in the attribute history at flush time.
+    pass
+
+for _key in INVENTORY_KEYS:
+    event.listen(getattr(Inventory, _key), "set", _load_previous_value, active_history=True)
+for _key in REQUISITION_KEYS:
+    event.listen(getattr(Requisition, _key), "set", _load_previous_value, active_history=True)
+
+def _snapshot(obj, keys, previous: bool = False) -> dict:
+    # Attribute values as they were before (previous=True) or are after the flush
+    state = inspect(obj)
+    values = {}
+    for key in keys:
+        history = state.attrs[key].history
+        if previous and history.deleted:
+            values[key] = history.deleted[0]
+        elif not previous and history.added:
+            values[key] = history.added[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        else:
+            values[key] = getattr(obj, key)
+    return values
+
+def _changed(obj, keys) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+def _lot_delta(values: dict, sign: int) -> StockDelta:
+    # Removals carry the level too: dropping the lot with the highest one lowers the pair's
+    return StockDelta(
+        facility_id=values["facility_id"],
+        medication_id=values["medication_id"],
+        quantity=sign * values["quantity"],
+        expiry_date=values["expiry_date"],
+        reorder_level=values["reorder_level"],
+    )
+
+def _on_order(values: dict) -> int:
+    return values["quantity_requested"] if values["status"] == RequisitionStatus.approved else 0
+
+@event.listens_for(Session, "after_flush")
+def track_stock_changes(session: Session, flush_context) -> None:
+    deltas: List[StockDelta] = []
+
+    for obj in session.new:
+        if isinstance(obj, Inventory):
+            deltas.append(_lot_delta(_snapshot(obj, INVENTORY_KEYS), 1))
+        elif isinstance(obj, Requisition) and obj.status == RequisitionStatus.approved:
+            deltas.append(StockDelta(obj.facility_id, obj.medication_id, on_order=obj.quantity_requested))
+
+    for obj in session.dirty:
+        if isinstance(obj, Inventory) and _changed(obj, INVENTORY_KEYS):
+            deltas.append(_lot_delta(_snapshot(obj, INVENTORY_KEYS, previous=True), -1))
+            deltas.append(_lot_delta(_snapshot(obj, INVENTORY_KEYS), 1))
+        elif isinstance(obj, Requisition) and _changed(obj, REQUISITION_KEYS):
+            previous = _snapshot(obj, REQUISITION_KEYS, previous=True)
+            current = _snapshot(obj, REQUISITION_KEYS)
+            deltas.append(StockDelta(previous["facility_id"], previous["medication_id"], on_order=-_on_order(previous)))
+            deltas.append(StockDelta(current["facility_id"], current["medication_id"], on_order=_on_order(current)))
+
+    for obj in session.deleted:
+        if isinstance(obj, Inventory):
+            deltas.append(_lot_delta(_snapshot(obj, INVENTORY_KEYS, previous=True), -1))
+        elif isinstance(obj, Requisition) and obj.status == RequisitionStatus.approved:
+            deltas.append(StockDelta(obj.facility_id, obj.medication_id, on_order=-obj.quantity_requested))
+
+    if deltas:
+        StockSummaryRepository(session).apply_deltas(deltas)
@@ -1 +1,65 @@
-# Placeholder for app/repositories/transfer_repository.py
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.models.facility import Facility
+from app.models.transfer import Transfer, TransferStatus
+from app.schemas.transfer import TransferCreate, TransferUpdate
+from app.repositories.base import BaseRepository
+from app.repositories.outbox_repository import OutboxRepository
+
+class TransferRepository(BaseRepository[Transfer, TransferCreate, TransferUpdate]):
+    def __init__(self, db: Session):
+        super().__init__(db, Transfer)
+
+    def export_query(
+        self,
+        facility_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        status: Optional[TransferStatus] = None,
+    ) -> Select:
+        """
+        Build a Core SELECT over the transfers table for streaming exports.
+        A facility filter matches transfers in either direction.
+        """
+        table = Transfer.__table__
+        stmt = select(table)
+        if facility_id is not None:
+            stmt = stmt.where(or_(table.c.from_facility_id == facility_id, table.c.to_facility_id == facility_id))
+        if start is not None:
+            stmt = stmt.where(table.c.transfer_date >= start)
+        if end is not None:
+            stmt = stmt.where(table.c.transfer_date < end)
+        if status is not None:
+            stmt = stmt.where(table.c.status == status)
+        return stmt
+
+    def lock_draft(self, transfer_id: UUID) -> Optional[Transfer]:
+        # Locked so a draft cannot be confirmed twice concurrently
+        stmt = select(Transfer).where(Transfer.transfer_id == transfer_id).with_for_update()
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def delete_drafts(self, state: str) -> int:
+        """
+        Delete the draft transfers out of facilities in ``state``, inside the
+        caller's transaction, with an outbox event for each. Returns the
+        number deleted.
+        """
+        table = Transfer.__table__
+        in_state = select(Facility.facility_id).where(Facility.state == state)
+        guard = (table.c.status == TransferStatus.draft, table.c.from_facility_id.in_(in_state))
+        stmt = delete(table).where(*guard)
+        if self.db.get_bind().dialect.delete_returning:
+            deleted = self.db.execute(stmt.returning(*table.columns)).mappings().all()
+        else:
+            # Lock the drafts that will go, then delete exactly those
+            deleted = self.db.execute(select(table).where(*guard).with_for_update()).mappings().all()
+            ids = [row["transfer_id"] for row in deleted]
+            for start in range(0, len(ids), settings.BULK_CHUNK_SIZE):
+                self.db.execute(delete(table).where(table.c.transfer_id.in_(ids[start:start + settings.BULK_CHUNK_SIZE])))
+        OutboxRepository(self.db).append(Transfer, "deleted", deleted)
+        return len(deleted)
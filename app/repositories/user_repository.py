@@ -1,12 +1,18 @@
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status  # Import HTTPException and status codes
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
 from app.core.security import get_password_hash
+from app.core.auth import invalidate_principal
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
+    sortable_columns = ("username",)
+
     def __init__(self, db: Session):
         super().__init__(db, User)
 
@@ -39,25 +45,85 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Create a new user with hashed password.
         """
         obj_in.password_hash = get_password_hash(obj_in.password)
-        return super().create(obj_in)
+        # Only mapped columns; the plain password is never stored
+        return super().create(obj_in.dict(include={"username", "facility_id", "role", "password_hash"}))
+
+    def update(self, db_obj: User, obj_in) -> User:
+        """
+        Update a user and drop its cached principal.
+        """
+        username = db_obj.username
+        user = super().update(db_obj, obj_in)
+        invalidate_principal(username)
+        invalidate_principal(user.username)
+        return user
+
+    def remove(self, id) -> User:
+        user = self.get(id)
+        username = user.username if user is not None else None
+        removed = super().remove(id)
+        invalidate_principal(username)
+        return removed
 
     def update_user_password(self, db_obj: User, new_password: str) -> User:
         """
         Update a user's password.
         """
         db_obj.password_hash = get_password_hash(new_password)
-        return super().update(db_obj, db_obj)
+        return self.update(db_obj, {})
+
+    def set_password_hash(self, db_obj: User, password_hash: str) -> User:
+        """
+        Store an already computed password hash (e.g. a rehash at a new bcrypt cost).
+        """
+        db_obj.password_hash = password_hash
+        return self.update(db_obj, {})
 
     def deactivate_user(self, db_obj: User) -> User:
         """
         Deactivate a user.
         """
         db_obj.is_active = False
-        return super().update(db_obj, db_obj)
+        return self.update(db_obj, {})
 
     def activate_user(self, db_obj: User) -> User:
         """
         Activate a user.
         """
         db_obj.is_active = True
-        return super().update(db_obj, db_obj)
+        return self.update(db_obj, {})
+
+class AsyncUserRepository(AsyncBaseRepository[User, UserCreate, UserUpdate]):
+    sync_repository = UserRepository
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, User)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """
+        Retrieve a user by their username.
+        """
+        try:
+            result = await self.db.execute(select(User).where(User.username == username))
+            return result.scalars().first()
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"An error occurred while retrieving the user with username {username}.",
+            )
+
+    async def update(self, db_obj: User, obj_in) -> User:
+        """
+        Update a user and drop its cached principal.
+        """
+        username = db_obj.username
+        user = await super().update(db_obj, obj_in)
+        invalidate_principal(username)
+        invalidate_principal(user.username)
+        return user
+
+    async def set_password_hash(self, db_obj: User, password_hash: str) -> User:
+        """
+        Store an already computed password hash (e.g. a rehash at a new bcrypt cost).
+        """
+        return await self.update(db_obj, {"password_hash": password_hash})
@@ -1 +1,11 @@
-# Placeholder for app/repositories/vendor_repository.py
+from sqlalchemy.orm import Session
+from app.models.vendor import Vendor
+from app.schemas.vendor import VendorCreate, VendorUpdate
+from app.repositories.base import BaseRepository
+
+class VendorRepository(BaseRepository[Vendor, VendorCreate, VendorUpdate]):
+    cache_namespace = "vendors"
+    sortable_columns = ("vendor_name",)
+
+    def __init__(self, db: Session):
+        super().__init__(db, Vendor)
@@ -0,0 +1,21 @@
+# app/schemas/bulk.py
+
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+class BulkRowError(BaseModel):
+    index: int  # Position of the row in the submitted batch
+    detail: str
+
+class BulkWriteResult(BaseModel):
+    ids: List[Any] = []
+    rows: List[Dict[str, Any]] = []  # Only populated when full rows were requested
+    errors: List[BulkRowError] = []
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.ids)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
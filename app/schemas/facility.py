@@ -1 +1,62 @@
-# Placeholder for app/schemas/facility.py
+# app/schemas/facility.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from uuid import UUID
+from app.models.facility import FacilityType
+
+class FacilityBase(BaseModel):
+    facility_name: str
+    facility_type: FacilityType
+    address: str
+    state: str
+    city: str
+
+class FacilityCreate(FacilityBase):
+    pass
+
+class FacilityUpdate(BaseModel):
+    facility_name: Optional[str] = None
+    facility_type: Optional[FacilityType] = None
+    address: Optional[str] = None
+    state: Optional[str] = None
+    city: Optional[str] = None
+
+class Facility(FacilityBase):
+    facility_id: UUID
+
+    class Config:
+        orm_mode = True
+
+class FacilityListItem(BaseModel):
+    """
+    Row of a facility listing, read as a column projection.
+    """
+    facility_id: UUID
+    facility_name: str
+    facility_type: FacilityType
+    state: str
+    city: str
+
+class FacilityStockLine(BaseModel):
+    inventory_id: UUID
+    medication_id: UUID
+    medication_name: str
+    quantity: int
+    reorder_level: int
+    expiry_date: date
+
+class FacilityTransferLine(BaseModel):
+    transfer_id: UUID
+    direction: str  # "in" or "out"
+    counterpart_facility_id: UUID
+    counterpart_facility_name: str
+    medication_id: UUID
+    medication_name: str
+    quantity_transferred: int
+    transfer_date: datetime
+
+class FacilityDetail(Facility):
+    inventory: List[FacilityStockLine] = []
+    recent_transfers: List[FacilityTransferLine] = []  # Newest first
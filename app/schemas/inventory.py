@@ -1 +1,135 @@
-# Placeholder for app/schemas/inventory.py
+# app/schemas/inventory.py
+
+from pydantic import BaseModel, conint, root_validator
+from typing import List, Optional
+from datetime import date, datetime
+from uuid import UUID
+from app.models.inventory_import import ImportStatus
+
+class InventoryBase(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    quantity: conint(ge=0)
+    reorder_level: conint(ge=0)
+    expiry_date: date
+
+class InventoryCreate(InventoryBase):
+    pass
+
+class InventoryUpdate(BaseModel):
+    quantity: Optional[conint(ge=0)] = None
+    reorder_level: Optional[conint(ge=0)] = None
+    expiry_date: Optional[date] = None
+
+class Inventory(InventoryBase):
+    inventory_id: UUID
+
+    class Config:
+        orm_mode = True
+
+class StockChange(BaseModel):
+    """
+    The state of one lot on a facility's live stock feed. Clients keep the
+    highest version seen per inventory_id and ignore older ones.
+    """
+    inventory_id: UUID
+    medication_id: UUID
+    expiry_date: date
+    quantity: int
+    reorder_level: int
+    version: int
+    deleted: bool = False  # The lot was removed
+    sequence: Optional[int] = None  # Change feed position; not set in snapshots
+
+    class Config:
+        orm_mode = True
+
+class StockCountRow(BaseModel):
+    """
+    One line of a facility stock-count file. Facilities and medications may be
+    referenced either by id or by name (plus strength for medications).
+    """
+    facility_id: Optional[UUID] = None
+    facility_name: Optional[str] = None
+    medication_id: Optional[UUID] = None
+    medication_name: Optional[str] = None
+    strength: Optional[str] = None
+    quantity: conint(ge=0)
+    reorder_level: conint(ge=0)
+    expiry_date: date
+
+    @root_validator(pre=True)
+    def blank_to_none(cls, values):
+        # Empty spreadsheet cells arrive as "" rather than missing keys
+        return {key: (None if value == "" else value) for key, value in values.items()}
+
+    @root_validator(skip_on_failure=True)
+    def check_references(cls, values):
+        if values.get("facility_id") is None and not values.get("facility_name"):
+            raise ValueError("facility_id or facility_name is required")
+        if values.get("medication_id") is None and not values.get("medication_name"):
+            raise ValueError("medication_id or medication_name is required")
+        return values
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+class InventoryImportStatus(BaseModel):
+    job_id: UUID
+    filename: Optional[str] = None
+    status: ImportStatus = ImportStatus.queued
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    errors: List[ImportRowError] = []
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class DispenseRequest(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    quantity: conint(gt=0)
+
+class LotAllocation(BaseModel):
+    inventory_id: UUID
+    expiry_date: date
+    quantity: int
+
+class DispenseResult(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    quantity: int
+    allocations: List[LotAllocation] = []
+
+class NearExpiryBucket(BaseModel):
+    within_days: int  # Lots expiring after the previous bucket's horizon and within this one
+    lots: int
+    quantity: int
+
+class NearExpiryReport(BaseModel):
+    as_of: date
+    state: Optional[str] = None
+    city: Optional[str] = None
+    buckets: List[NearExpiryBucket] = []
+    total_quantity: int = 0
+
+class NearExpiryLot(BaseModel):
+    inventory_id: UUID
+    facility_id: UUID
+    facility_name: str
+    medication_id: UUID
+    medication_name: str
+    quantity: int
+    expiry_date: date
+
+class RedistributionSuggestion(BaseModel):
+    medication_id: UUID
+    from_facility_id: UUID
+    to_facility_id: UUID
+    quantity: int
+    earliest_expiry: date
+    same_city: bool
@@ -0,0 +1,49 @@
+# app/schemas/job.py
+
+from pydantic import BaseModel, conint
+from typing import Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
+from app.models.job import JobStatus
+
+class JobCreate(BaseModel):
+    job_type: str
+    payload: Dict[str, Any] = {}
+    run_at: Optional[datetime] = None  # Now when not given
+    priority: int = 0  # Higher runs first
+    max_attempts: Optional[conint(ge=1, le=100)] = None
+
+class Job(BaseModel):
+    job_id: UUID
+    job_type: str
+    payload: Dict[str, Any]
+    status: JobStatus
+    priority: int
+    run_at: datetime  # For a queued job, when it (or its next retry) becomes due
+    attempts: int
+    max_attempts: int
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    schedule_name: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class JobScheduleUpdate(BaseModel):
+    job_type: str
+    payload: Dict[str, Any] = {}
+    cron: str  # Five fields, UTC (see app.core.cron)
+    enabled: bool = True
+
+class JobSchedule(JobScheduleUpdate):
+    name: str
+    next_run_at: datetime
+    last_run_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
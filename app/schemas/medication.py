@@ -1 +1,47 @@
-# Placeholder for app/schemas/medication.py
+# app/schemas/medication.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+from uuid import UUID
+
+class MedicationBase(BaseModel):
+    medication_name: str
+    dosage_form: str
+    strength: str
+    manufacturer: str
+
+class MedicationCreate(MedicationBase):
+    pass
+
+class MedicationUpdate(BaseModel):
+    medication_name: Optional[str] = None
+    dosage_form: Optional[str] = None
+    strength: Optional[str] = None
+    manufacturer: Optional[str] = None
+
+class Medication(MedicationBase):
+    medication_id: UUID
+
+    class Config:
+        orm_mode = True
+
+class MedicationListItem(BaseModel):
+    """
+    Row of a medication listing, read as a column projection.
+    """
+    medication_id: UUID
+    medication_name: str
+    dosage_form: str
+    strength: str
+
+class MedicationStockLine(BaseModel):
+    inventory_id: UUID
+    facility_id: UUID
+    facility_name: str
+    quantity: int
+    expiry_date: date
+
+class MedicationDetail(Medication):
+    stock: List[MedicationStockLine] = []
+    quantity_on_hand: int = 0
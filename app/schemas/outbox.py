@@ -0,0 +1,17 @@
+# app/schemas/outbox.py
+
+from pydantic import BaseModel
+from typing import Any, Dict
+from datetime import datetime
+from uuid import UUID
+
+class OutboxEvent(BaseModel):
+    sequence: int  # Position in the feed; resume from the last one seen
+    aggregate_type: str  # inventory, transfer or requisition
+    aggregate_id: UUID
+    event_type: str  # created, updated, upserted or deleted
+    payload: Dict[str, Any]  # The row after the change; before it for deletes
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
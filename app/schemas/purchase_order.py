@@ -1 +1,53 @@
 # Placeholder for app/schemas/purchase_order.py
+from pydantic import BaseModel, conint
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+class PurchaseOrderBase(BaseModel):
+    vendor_id: UUID
+    requisition_id: UUID
+    quantity_ordered: conint(gt=0)
+    expected_delivery_date: datetime
+
+class PurchaseOrderCreate(PurchaseOrderBase):
+    pass
+
+class PurchaseOrderUpdate(BaseModel):
+    quantity_ordered: Optional[conint(gt=0)] = None
+    expected_delivery_date: Optional[datetime] = None
+
+class PurchaseOrder(PurchaseOrderBase):
+    purchase_order_id: UUID
+    order_date: datetime
+
+    class Config:
+        orm_mode = True
+
+class VendorOrderSummary(BaseModel):
+    vendor_id: UUID
+    purchase_orders: int
+    quantity_ordered: int
+
+class OrderSuggestion(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    model: str  # Forecasting model chosen for this series
+    forecast_per_period: float  # Forecast demand in the next period
+    cover_demand: float  # Forecast demand until the order after this one arrives
+    safety_stock: float
+    quantity_on_hand: int
+    quantity_on_order: int
+    suggested_quantity: int
+
+class VendorOrderSuggestions(BaseModel):
+    vendor_id: Optional[UUID]  # None when no vendor is known for the medications
+    lead_time_days: float
+    expected_delivery_date: datetime
+    suggestions: List[OrderSuggestion]
+
+class OrderSuggestionReport(BaseModel):
+    generated_at: datetime
+    period_days: int
+    series: int  # (facility, medication) pairs forecast
+    vendors: List[VendorOrderSuggestions]
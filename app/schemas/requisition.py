@@ -1 +1,74 @@
-# Placeholder for app/schemas/requisition.py
+# app/schemas/requisition.py
+
+from pydantic import BaseModel, conint, conlist
+from typing import Dict, List, Optional
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+from app.core.config import settings
+from app.models.requisition import RequisitionStatus
+from app.schemas.purchase_order import VendorOrderSummary
+
+class RequisitionBase(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    quantity_requested: conint(gt=0)
+
+class RequisitionCreate(RequisitionBase):
+    pass
+
+class RequisitionUpdate(BaseModel):
+    quantity_requested: Optional[conint(gt=0)] = None
+    status: Optional[RequisitionStatus] = None
+    approved_at: Optional[datetime] = None
+
+class Requisition(RequisitionBase):
+    requisition_id: UUID
+    status: RequisitionStatus
+    requested_at: datetime
+    approved_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class ReorderScanResult(BaseModel):
+    checked_at: datetime  # Pass back as `since` for the next incremental scan
+    since: Optional[datetime] = None
+    pairs_below_reorder: int
+    requisitions_created: int
+    requisitions_failed: int = 0
+
+class RequisitionBatch(BaseModel):
+    requisition_ids: conlist(UUID, min_items=1, max_items=settings.REQUISITION_BATCH_MAX_SIZE)
+
+class RequisitionApprovalBatch(RequisitionBatch):
+    create_purchase_orders: bool = False
+    # Vendor for each medication's purchase orders, falling back to vendor_id;
+    # approved requisitions with neither get no purchase order.
+    vendor_id: Optional[UUID] = None
+    medication_vendors: Dict[UUID, UUID] = {}
+    lead_time_days: conint(ge=0) = settings.PURCHASE_ORDER_LEAD_TIME_DAYS
+
+class BatchOutcome(str, Enum):
+    submitted = "submitted"
+    approved = "approved"
+    rejected = "rejected"
+    received = "received"
+    cancelled = "cancelled"
+    not_draft = "not_draft"  # Left unchanged by a submission: already submitted or decided
+    not_pending = "not_pending"  # Left unchanged: already decided
+    not_approved = "not_approved"  # Left unchanged by a receipt or cancellation: not awaiting delivery
+    not_found = "not_found"
+
+class RequisitionOutcome(BaseModel):
+    requisition_id: UUID
+    outcome: BatchOutcome
+    status: Optional[RequisitionStatus] = None  # Status after the batch, when the requisition exists
+    purchase_order_id: Optional[UUID] = None
+
+class RequisitionBatchResult(BaseModel):
+    decided_at: datetime
+    changed: int
+    unchanged: int
+    outcomes: List[RequisitionOutcome]
+    purchase_orders: List[VendorOrderSummary] = []
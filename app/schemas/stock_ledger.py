@@ -0,0 +1,31 @@
+# app/schemas/stock_ledger.py
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+from uuid import UUID
+from app.models.stock_ledger import MovementType
+
+class StockMovement(BaseModel):
+    movement_id: UUID
+    occurred_at: datetime
+    facility_id: UUID
+    medication_id: UUID
+    expiry_date: Optional[date]
+    quantity: int  # Positive for stock in, negative for stock out
+    movement_type: MovementType
+    reference_id: Optional[UUID]  # Transfer or inventory lot behind the movement
+
+    class Config:
+        orm_mode = True
+
+class StockBalance(BaseModel):
+    facility_id: UUID
+    medication_id: UUID
+    as_of: datetime
+    quantity: int
+    snapshot_as_of: Optional[datetime]  # Snapshot the balance was computed from, if any
+
+class SnapshotResult(BaseModel):
+    as_of: datetime
+    balances: int  # Facility/medication pairs snapshotted
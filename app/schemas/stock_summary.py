@@ -0,0 +1,26 @@
+# app/schemas/stock_summary.py
+
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+from uuid import UUID
+
+class MedicationStockLevel(BaseModel):
+    medication_id: UUID
+    quantity_on_hand: int
+    reorder_level: int
+    quantity_below_reorder: int  # How far on-hand stock is below the reorder level
+    quantity_on_order: int
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class FacilityStockSummary(BaseModel):
+    facility_id: UUID
+    quantity_on_hand: int
+    quantity_on_order: int
+    medications_below_reorder: int
+    expiring_within_days: int
+    quantity_expiring: int
+    medications: List[MedicationStockLevel] = []
@@ -1 +1,44 @@
-# Placeholder for app/schemas/transfer.py
+# app/schemas/transfer.py
+
+from pydantic import BaseModel, conint, validator
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from app.models.transfer import TransferStatus
+
+class TransferBase(BaseModel):
+    from_facility_id: UUID
+    to_facility_id: UUID
+    medication_id: UUID
+    quantity_transferred: conint(gt=0)
+
+class TransferCreate(TransferBase):
+    @validator("to_facility_id")
+    def different_facilities(cls, to_facility_id, values):
+        if to_facility_id == values.get("from_facility_id"):
+            raise ValueError("A transfer must move stock between two different facilities")
+        return to_facility_id
+
+class TransferUpdate(BaseModel):
+    quantity_transferred: Optional[conint(gt=0)] = None
+
+class Transfer(TransferBase):
+    transfer_id: UUID
+    transfer_date: datetime
+    status: TransferStatus
+
+    class Config:
+        orm_mode = True
+
+class RedistributionPlanResult(BaseModel):
+    state: str
+    planned_at: datetime
+    donors: int  # Facility/medication pairs with unexpired stock above their reorder level
+    recipients: int  # Pairs below their reorder level
+    quantity_needed: int
+    quantity_planned: int
+    quantity_unmet: int  # Need no facility in the state can spare
+    transfers_planned: int
+    drafts_replaced: int = 0  # Earlier draft transfers from the state that were discarded
+    transfers_created: int = 0
+    transfers_failed: int = 0
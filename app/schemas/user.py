@@ -3,6 +3,8 @@
 
 from pydantic import BaseModel
 from typing import Optional
+from uuid import UUID
+from app.models.user import UserRole
 
 class Token(BaseModel):
     access_token: str
@@ -10,11 +12,29 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
+    # Signed principal claims; present in tokens issued with principal_claims()
+    user_id: Optional[UUID] = None
+    role: Optional[str] = None
+    facility_id: Optional[UUID] = None
 
-class User(BaseModel):
+class UserCreate(BaseModel):
     username: str
+    password: str
+    facility_id: UUID
+    role: UserRole
     email: Optional[str] = None
-    is_active: bool
+    password_hash: Optional[str] = None  # Set from password by the repository
+
+class UserUpdate(BaseModel):
+    username: Optional[str] = None
+    facility_id: Optional[UUID] = None
+    role: Optional[UserRole] = None
+
+class User(BaseModel):
+    user_id: UUID
+    username: str
+    facility_id: UUID
+    role: UserRole
 
     class Config:
         orm_mode = True
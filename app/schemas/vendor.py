@@ -1 +1,38 @@
-# Placeholder for app/schemas/vendor.py
+# app/schemas/vendor.py
+
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+
+class VendorBase(BaseModel):
+    vendor_name: str
+    contact_name: str
+    phone_number: str
+    email: str
+    address: str
+
+class VendorCreate(VendorBase):
+    pass
+
+class VendorUpdate(BaseModel):
+    vendor_name: Optional[str] = None
+    contact_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+
+class Vendor(VendorBase):
+    vendor_id: UUID
+
+    class Config:
+        orm_mode = True
+
+class VendorListItem(BaseModel):
+    """
+    Row of a vendor listing, read as a column projection.
+    """
+    vendor_id: UUID
+    vendor_name: str
+    contact_name: str
+    phone_number: str
+    email: str
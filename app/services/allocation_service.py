@@ -0,0 +1,78 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.models.stock_ledger import MovementType
+from app.repositories.inventory_repository import InventoryRepository, LotQuantity
+
+class FefoAllocator:
+    """
+    First-expiry-first-out allocation of stock across inventory lots.
+
+    Allocation runs inside the caller's transaction and does not commit: the
+    chosen lots stay locked until the caller commits or rolls back, so two
+    concurrent allocations can never draw the same units.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 50):
+        self.inventory_repo = InventoryRepository(db)
+        self.batch_size = batch_size
+
+    def _take(self, lots: List[LotQuantity], remaining: int, allocations: List[LotQuantity]) -> int:
+        for lot in lots:
+            if remaining <= 0:
+                break
+            taken = min(lot.quantity, remaining)
+            allocations.append(lot._replace(quantity=taken))
+            remaining -= taken
+        return remaining
+
+    def allocate(
+        self,
+        facility_id: UUID,
+        medication_id: UUID,
+        quantity: int,
+        as_of: Optional[date] = None,
+        movement_type: MovementType = MovementType.dispense,
+        reference_id: Optional[UUID] = None,
+    ) -> List[LotQuantity]:
+        """
+        Lock the earliest-expiring unexpired lots covering ``quantity``, split
+        the quantity across them and decrement them, recording the debits in
+        the stock ledger as ``movement_type`` against ``reference_id``.
+        Returns the quantity taken from each lot; raises 409 if the facility
+        does not hold enough stock.
+        """
+        as_of = as_of or date.today()
+        allocations: List[LotQuantity] = []
+        remaining = quantity
+
+        # First pass: lots locked by concurrent allocations are skipped rather
+        # than waited on, so parallel transfers from one store do not queue up.
+        # If that leaves a shortfall, wait for the remaining lots instead of
+        # failing on stock that is only momentarily locked.
+        for skip_locked in (True, False):
+            while remaining > 0:
+                lots = self.inventory_repo.lock_available_lots(
+                    facility_id,
+                    medication_id,
+                    as_of,
+                    skip_locked=skip_locked,
+                    exclude=[lot.inventory_id for lot in allocations],
+                    limit=self.batch_size,
+                )
+                if not lots:
+                    break
+                remaining = self._take(lots, remaining, allocations)
+            if remaining <= 0:
+                break
+
+        if remaining > 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Insufficient stock: {quantity - remaining} of {quantity} units available.",
+            )
+
+        self.inventory_repo.debit_lots(facility_id, medication_id, allocations, movement_type, reference_id)
+        return allocations
@@ -0,0 +1,219 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import build_keyset_query, paginate
+from app.models.facility import Facility
+from app.models.inventory import Inventory
+from app.models.medication import Medication
+from app.models.stock_summary import FacilityStockSummary
+from app.schemas.inventory import NearExpiryBucket, NearExpiryLot, NearExpiryReport, RedistributionSuggestion
+import logging
+
+# Bucket totals are shared across requests and recomputed at most once per TTL
+near_expiry_cache = TTLCache(maxsize=512, ttl=settings.NEAR_EXPIRY_CACHE_TTL)
+
+def near_expiry_horizons() -> List[int]:
+    return sorted({int(days) for days in settings.NEAR_EXPIRY_HORIZONS.split(",") if days.strip()})
+
+class NearExpiryService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _in_window(self, stmt, as_of: date, within_days: int, state: Optional[str], city: Optional[str]):
+        # The window predicate is a range on the leading column of
+        # ix_inventory_expiry_facility_medication.
+        stmt = stmt.where(
+            Inventory.expiry_date >= as_of,
+            Inventory.expiry_date <= as_of + timedelta(days=within_days),
+            Inventory.quantity > 0,
+        )
+        if state is not None or city is not None:
+            stmt = stmt.join(Facility, Facility.facility_id == Inventory.facility_id)
+            if state is not None:
+                stmt = stmt.where(Facility.state == state)
+            if city is not None:
+                stmt = stmt.where(Facility.city == city)
+        return stmt
+
+    def _compute_report(self, as_of: date, state: Optional[str], city: Optional[str]) -> NearExpiryReport:
+        horizons = near_expiry_horizons()
+        bucket = case(
+            *[(Inventory.expiry_date <= as_of + timedelta(days=days), days) for days in horizons]
+        ).label("within_days")
+        stmt = self._in_window(
+            select(bucket, func.count(), func.sum(Inventory.quantity)), as_of, horizons[-1], state, city
+        ).group_by(bucket)
+
+        totals = {days: (lots, quantity) for days, lots, quantity in self.db.execute(stmt)}
+        buckets = [
+            NearExpiryBucket(within_days=days, lots=totals.get(days, (0, 0))[0], quantity=totals.get(days, (0, 0))[1])
+            for days in horizons
+        ]
+        return NearExpiryReport(
+            as_of=as_of,
+            state=state,
+            city=city,
+            buckets=buckets,
+            total_quantity=sum(bucket.quantity for bucket in buckets),
+        )
+
+    def get_report(self, state: Optional[str] = None, city: Optional[str] = None, as_of: Optional[date] = None) -> NearExpiryReport:
+        """
+        Near-expiry lot counts and quantities per horizon bucket (30/60/90 days
+        by default), optionally limited to a state and city.
+        """
+        as_of = as_of or date.today()
+        try:
+            return near_expiry_cache.get_or_set(
+                ("report", as_of, state, city), lambda: self._compute_report(as_of, state, city)
+            )
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while computing near-expiry totals: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while computing near-expiry totals."
+            )
+
+    def list_lots(
+        self,
+        within_days: int,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[NearExpiryLot], Optional[str]]:
+        """
+        Lots expiring within ``within_days``, earliest first, one keyset page at a time.
+        """
+        as_of = date.today()
+        stmt, columns = build_keyset_query(
+            Inventory, after=after, order_by="expiry_date", limit=limit, sortable=("expiry_date",)
+        )
+        stmt = self._in_window(
+            stmt.add_columns(Facility.facility_name, Medication.medication_name), as_of, within_days, state, city
+        ).join(Medication, Medication.medication_id == Inventory.medication_id)
+        if state is None and city is None:
+            stmt = stmt.join(Facility, Facility.facility_id == Inventory.facility_id)
+
+        try:
+            rows = self.db.execute(stmt).all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while listing near-expiry lots: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while listing near-expiry lots."
+            )
+        _, next_cursor = paginate([row[0] for row in rows], columns, limit)
+        lots = [
+            NearExpiryLot(
+                inventory_id=lot.inventory_id,
+                facility_id=lot.facility_id,
+                facility_name=facility_name,
+                medication_id=lot.medication_id,
+                medication_name=medication_name,
+                quantity=lot.quantity,
+                expiry_date=lot.expiry_date,
+            )
+            for lot, facility_name, medication_name in rows[:limit]
+        ]
+        return lots, next_cursor
+
+    def suggest_redistribution(
+        self, within_days: int = 90, state: Optional[str] = None, city: Optional[str] = None
+    ) -> List[RedistributionSuggestion]:
+        """
+        Match near-expiry stock that a facility holds above its reorder level
+        to facilities below their reorder level in the same state, preferring
+        the same city and moving the earliest-expiring stock first.
+        """
+        as_of = date.today()
+        summary = FacilityStockSummary
+        near = self._in_window(
+            select(
+                Inventory.facility_id,
+                Inventory.medication_id,
+                func.sum(Inventory.quantity).label("quantity"),
+                func.min(Inventory.expiry_date).label("earliest_expiry"),
+            ),
+            as_of, within_days, state, city,
+        ).group_by(Inventory.facility_id, Inventory.medication_id).subquery()
+
+        donors_stmt = (
+            select(
+                near.c.facility_id,
+                near.c.medication_id,
+                near.c.quantity,
+                summary.quantity_on_hand - summary.reorder_level,
+                near.c.earliest_expiry,
+                Facility.state,
+                Facility.city,
+            )
+            .join(summary, (summary.facility_id == near.c.facility_id) & (summary.medication_id == near.c.medication_id))
+            .join(Facility, Facility.facility_id == near.c.facility_id)
+            .where(summary.quantity_on_hand > summary.reorder_level)
+        )
+        recipients_stmt = (
+            select(
+                summary.facility_id,
+                summary.medication_id,
+                summary.reorder_level - summary.quantity_on_hand,
+                Facility.state,
+                Facility.city,
+            )
+            .join(Facility, Facility.facility_id == summary.facility_id)
+            .where(
+                summary.quantity_on_hand < summary.reorder_level,
+                summary.medication_id.in_(select(near.c.medication_id)),
+            )
+        )
+        if state is not None:
+            recipients_stmt = recipients_stmt.where(Facility.state == state)
+
+        try:
+            donors = self.db.execute(donors_stmt).all()
+            recipients = self.db.execute(recipients_stmt).all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while planning redistribution: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while planning redistribution."
+            )
+
+        # Shortfalls per (medication, state), largest first
+        needs = defaultdict(list)
+        for facility_id, medication_id, need, facility_state, facility_city in recipients:
+            needs[(medication_id, facility_state)].append([need, facility_id, facility_city])
+        for group in needs.values():
+            group.sort(key=lambda entry: -entry[0])
+
+        suggestions: List[RedistributionSuggestion] = []
+        for facility_id, medication_id, near_quantity, spare, earliest_expiry, facility_state, facility_city in sorted(
+            donors, key=lambda donor: donor[4]
+        ):
+            available = min(near_quantity, spare)
+            group = needs.get((medication_id, facility_state), [])
+            # Same-city recipients first, then the rest of the state
+            for entry in sorted(group, key=lambda entry: entry[2] != facility_city):
+                if available <= 0:
+                    break
+                need, to_facility_id, to_city = entry
+                if need <= 0 or to_facility_id == facility_id:
+                    continue
+                quantity = min(need, available)
+                entry[0] -= quantity
+                available -= quantity
+                suggestions.append(RedistributionSuggestion(
+                    medication_id=medication_id,
+                    from_facility_id=facility_id,
+                    to_facility_id=to_facility_id,
+                    quantity=quantity,
+                    earliest_expiry=earliest_expiry,
+                    same_city=to_city == facility_city,
+                ))
+        return suggestions
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterator, Optional
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.session import engine
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+def _json_default(value: Any) -> Any:
+    plain = _plain(value)
+    if plain is value:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return plain
+
+def stream_rows(stmt: Select, file_format: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield an export of ``stmt`` as encoded CSV or NDJSON chunks.
+
+    Rows are read as Core tuples through a server-side cursor, one partition of
+    ``chunk_size`` rows at a time, so memory stays constant however large the
+    table is. The CSV header is sent before the first row is fetched.
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+        columns = list(result.keys())
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if file_format == "csv":
+            writer.writerow(columns)
+            yield buffer.getvalue().encode()
+
+        for partition in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            if file_format == "csv":
+                writer.writerows([_plain(value) for value in row] for row in partition)
+            else:
+                for row in partition:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode()
+
+def export_response(stmt: Select, file_format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(stmt, file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'},
+    )
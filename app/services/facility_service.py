@@ -1 +1,174 @@
-# Placeholder for app/services/facility_service.py
+import random
+import sys
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.models.facility import Facility
+from app.repositories.facility_repository import FacilityRepository
+from app.schemas.facility import FacilityDetail, FacilityListItem, FacilityStockLine, FacilityTransferLine
+import logging
+
+class FacilityService:
+    def __init__(self, db: Session):
+        self.facility_repo = FacilityRepository(db)
+
+    def list_facilities(
+        self,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[FacilityListItem], Optional[str]]:
+        filters = []
+        if state is not None:
+            filters.append(Facility.state == state)
+        if city is not None:
+            filters.append(Facility.city == city)
+        return self.facility_repo.get_projected_page(
+            FacilityListItem, after=after, order_by="facility_name", limit=limit, filters=filters
+        )
+
+    def get_detail(self, facility_id: UUID, transfer_days: int = 30) -> FacilityDetail:
+        """
+        The facility, its stock lots with medication names and its transfers
+        of the last ``transfer_days`` days in both directions, newest first.
+        """
+        try:
+            facility = self.facility_repo.get_detail(facility_id, datetime.utcnow() - timedelta(days=transfer_days))
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while loading facility {facility_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while loading the facility."
+            )
+        if facility is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Facility with id {facility_id} not found",
+            )
+
+        inventory = [
+            FacilityStockLine(
+                inventory_id=lot.inventory_id,
+                medication_id=lot.medication_id,
+                medication_name=lot.medication.medication_name,
+                quantity=lot.quantity,
+                reorder_level=lot.reorder_level,
+                expiry_date=lot.expiry_date,
+            )
+            for lot in sorted(facility.inventory, key=lambda lot: (lot.medication.medication_name, lot.expiry_date))
+        ]
+        transfers = [
+            FacilityTransferLine(
+                transfer_id=transfer.transfer_id,
+                direction=direction,
+                counterpart_facility_id=counterpart.facility_id,
+                counterpart_facility_name=counterpart.facility_name,
+                medication_id=transfer.medication_id,
+                medication_name=transfer.medication.medication_name,
+                quantity_transferred=transfer.quantity_transferred,
+                transfer_date=transfer.transfer_date,
+            )
+            for direction, transfer, counterpart in [
+                *(("out", transfer, transfer.to_facility) for transfer in facility.from_transfers),
+                *(("in", transfer, transfer.from_facility) for transfer in facility.to_transfers),
+            ]
+        ]
+        transfers.sort(key=lambda line: line.transfer_date, reverse=True)
+        return FacilityDetail(
+            facility_id=facility.facility_id,
+            facility_name=facility.facility_name,
+            facility_type=facility.facility_type,
+            address=facility.address,
+            state=facility.state,
+            city=facility.city,
+            inventory=inventory,
+            recent_transfers=transfers,
+        )
+
+def _benchmark(database_url: str, lots: int = 180, transfers: int = 43, facilities: int = 200, page_size: int = 60) -> None:
+    # Models must all be registered before the schema is created
+    from app.core.query_budget import track_queries
+    from app.db.base import Base
+    from app.models.facility import FacilityType
+    from app.models.inventory import Inventory
+    from app.models.medication import Medication
+    from app.models.transfer import Transfer
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    facility_ids = [uuid.uuid4() for _ in range(facilities)]
+    medication_ids = [uuid.uuid4() for _ in range(lots // 3)]
+    detail_id = facility_ids[0]
+    with engine.begin() as connection:
+        connection.execute(insert(Facility), [
+            {"facility_id": facility_id, "facility_name": f"Facility {index}", "facility_type": FacilityType.hospital,
+             "address": f"{index} Hospital Road", "state": "Lagos", "city": f"City {index % 20}"}
+            for index, facility_id in enumerate(facility_ids)
+        ])
+        connection.execute(insert(Medication), [
+            {"medication_id": medication_id, "medication_name": f"Medication {index}", "dosage_form": "tablet",
+             "strength": "500mg", "manufacturer": "Emzor"}
+            for index, medication_id in enumerate(medication_ids)
+        ])
+        # Three lots of each medication at the facility shown
+        connection.execute(insert(Inventory), [
+            {"facility_id": detail_id, "medication_id": medication_id, "quantity": rng.randint(10, 500),
+             "reorder_level": 20, "expiry_date": date(2030, month, 1), "version": 1}
+            for medication_id in medication_ids for month in (3, 6, 9)
+        ])
+        # Recent transfers both ways, each with another facility
+        connection.execute(insert(Transfer), [
+            {"from_facility_id": detail_id if index % 2 else counterpart, "to_facility_id": counterpart if index % 2 else detail_id,
+             "medication_id": rng.choice(medication_ids), "quantity_transferred": rng.randint(1, 50),
+             "transfer_date": datetime.utcnow() - timedelta(days=rng.randint(0, 20))}
+            for index, counterpart in enumerate(rng.sample(facility_ids[1:], transfers))
+        ])
+
+    def measure(load):
+        # Round trips and peak Python memory of one load in a fresh session,
+        # after a first load has filled the statement cache
+        with Session(engine) as db:
+            load(db)
+        with Session(engine) as db:
+            tracemalloc.start()
+            with track_queries(engine) as tracker:
+                result = load(db)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return result, tracker.count, peak / 1024
+
+    def lazy_detail(db):
+        # The relationship defaults: every lot's medication and every transfer's
+        # counterpart and medication load on first access
+        service = FacilityService(db)
+        service.facility_repo.get_detail = lambda facility_id, since: db.get(Facility, facility_id)
+        return service.get_detail(detail_id)
+
+    lazy, lazy_queries, lazy_memory = measure(lazy_detail)
+    profiled, profiled_queries, profiled_memory = measure(lambda db: FacilityService(db).get_detail(detail_id))
+    assert lazy == profiled, "The loading profile changed the facility detail"
+    print(f"Facility detail with {lots} lots and {transfers} transfers: lazy defaults {lazy_queries} round trips, "
+          f"peak {lazy_memory:.0f} KiB; detail profile {profiled_queries} round trips, peak {profiled_memory:.0f} KiB")
+
+    def orm_page(db):
+        page, _ = FacilityRepository(db).get_page(order_by="facility_name", limit=page_size)
+        return [FacilityListItem(**{name: getattr(facility, name) for name in FacilityListItem.__fields__}) for facility in page]
+
+    orm, orm_queries, orm_memory = measure(orm_page)
+    projected, projected_queries, projected_memory = measure(lambda db: FacilityService(db).list_facilities(limit=page_size)[0])
+    assert orm == projected, "The projection changed the facility list"
+    print(f"Facility list page of {page_size}: ORM entities peak {orm_memory:.0f} KiB, "
+          f"column projection peak {projected_memory:.0f} KiB ({orm_queries} and {projected_queries} round trips)")
+
+if __name__ == "__main__":
+    # python -m app.services.facility_service [database url]
+    # Point the URL at a scratch database: the benchmark creates its tables and fills them
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else "sqlite:///facility_benchmark.db")
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.forecasting import MODELS, cover_demand, fit_forecast, order_quantities, safety_stock
+from app.repositories.demand_repository import DemandRepository
+from app.schemas.purchase_order import OrderSuggestion, OrderSuggestionReport, VendorOrderSuggestions
+import logging
+
+# Lead times are averaged over the purchase orders of the last year
+LEAD_TIME_LOOKBACK = timedelta(days=365)
+
+class ForecastService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.demand_repo = DemandRepository(db)
+
+    def _load_history(
+        self, start: datetime, end: datetime, facility_id: Optional[UUID]
+    ) -> Tuple[List[Tuple[UUID, UUID]], np.ndarray]:
+        # Series keys in first-seen order and their (series, periods) demand matrix
+        periods = settings.FORECAST_HISTORY_PERIODS
+        index: Dict[Tuple[UUID, UUID], int] = {}
+        rows, columns, quantities = [], [], []
+        stmt = self.demand_repo.history_query(start, end, settings.FORECAST_PERIOD_DAYS, facility_id)
+        for facility, medication, period, quantity in self.db.execute(stmt.execution_options(yield_per=10000)):
+            key = (facility, medication)
+            row = index.get(key)
+            if row is None:
+                row = index[key] = len(index)
+            rows.append(row)
+            columns.append(min(period, periods - 1))
+            quantities.append(quantity)
+
+        history = np.zeros((len(index), periods), dtype=np.float32)
+        np.add.at(history, (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)), quantities)
+        return list(index), history
+
+    def suggest_orders(
+        self,
+        facility_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+        include_zero: bool = False,
+    ) -> OrderSuggestionReport:
+        """
+        Forecast demand for every (facility, medication) pair with history and
+        suggest how much to order, grouped by the vendor that supplied the
+        medication last (``vendor_id`` for medications never ordered). Each
+        vendor's expected delivery date follows from its average lead time.
+        """
+        generated_at = datetime.utcnow()
+        period_days = settings.FORECAST_PERIOD_DAYS
+        start = generated_at - timedelta(days=period_days * settings.FORECAST_HISTORY_PERIODS)
+        try:
+            keys, history = self._load_history(start, generated_at, facility_id)
+            positions = {
+                (facility, medication): (on_hand, on_order)
+                for facility, medication, on_hand, on_order in self.db.execute(self.demand_repo.positions_query(facility_id))
+            }
+            lead_times = self.demand_repo.vendor_lead_times(generated_at - LEAD_TIME_LOOKBACK)
+            medication_vendors = self.demand_repo.medication_vendors()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while loading demand history: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while loading demand history."
+            )
+
+        report = OrderSuggestionReport(generated_at=generated_at, period_days=period_days, series=len(keys), vendors=[])
+        if not keys:
+            return report
+
+        vendors = [medication_vendors.get(medication, vendor_id) for _, medication in keys]
+        vendor_lead_time = {
+            vendor: lead_times.get(vendor, float(settings.PURCHASE_ORDER_LEAD_TIME_DAYS)) for vendor in set(vendors)
+        }
+        # Stock ordered now has to last until the order after it arrives
+        cover_periods = {
+            vendor: ceil((days + settings.FORECAST_REVIEW_DAYS) / period_days) for vendor, days in vendor_lead_time.items()
+        }
+        cover = np.array([cover_periods[vendor] for vendor in vendors], dtype=np.int64)
+        stock = np.array([positions.get(key, (0, 0)) for key in keys], dtype=np.float32).reshape(-1, 2)
+
+        forecast = fit_forecast(history, horizon=int(cover.max()), season=settings.FORECAST_SEASON_PERIODS)
+        demand = cover_demand(forecast.values, cover)
+        safety = safety_stock(forecast.error, cover, settings.FORECAST_SERVICE_Z)
+        quantities = order_quantities(demand, safety, stock[:, 0], stock[:, 1])
+
+        grouped: Dict[Optional[UUID], List[OrderSuggestion]] = defaultdict(list)
+        for position in (range(len(keys)) if include_zero else np.flatnonzero(quantities)):
+            facility, medication = keys[position]
+            grouped[vendors[position]].append(OrderSuggestion(
+                facility_id=facility,
+                medication_id=medication,
+                model=MODELS[forecast.model[position]],
+                forecast_per_period=round(float(forecast.values[position, 0]), 2),
+                cover_demand=round(float(demand[position]), 2),
+                safety_stock=round(float(safety[position]), 2),
+                quantity_on_hand=int(stock[position, 0]),
+                quantity_on_order=int(stock[position, 1]),
+                suggested_quantity=int(quantities[position]),
+            ))
+        report.vendors = [
+            VendorOrderSuggestions(
+                vendor_id=vendor,
+                lead_time_days=round(vendor_lead_time[vendor], 2),
+                expected_delivery_date=generated_at + timedelta(days=vendor_lead_time[vendor]),
+                suggestions=suggestions,
+            )
+            for vendor, suggestions in grouped.items()
+        ]
+        return report
@@ -0,0 +1,231 @@
+import csv
+import json
+import logging
+import os
+import uuid
+from contextlib import suppress
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.facility import Facility
+from app.models.inventory_import import ImportStatus, InventoryImport
+from app.models.medication import Medication
+from app.repositories.inventory_repository import LOT_KEY, InventoryRepository
+from app.repositories.job_repository import JobRepository
+from app.schemas.inventory import ImportRowError, InventoryCreate, InventoryImportStatus, StockCountRow
+
+# Cap the errors reported per import
+MAX_REPORTED_ERRORS = 1000
+
+def create_import_job(
+    db: Session, filename: Optional[str] = None, path: Optional[str] = None, file_format: Optional[str] = None
+) -> InventoryImportStatus:
+    """
+    Record a queued import. Given the spooled file, an ``inventory_import``
+    job for the workers is enqueued in the same transaction.
+    """
+    job = InventoryImport(job_id=uuid.uuid4(), filename=filename, status=ImportStatus.queued, created_at=datetime.utcnow())
+    db.add(job)
+    if path is not None:
+        JobRepository(db).enqueue(
+            "inventory_import", payload={"job_id": str(job.job_id), "path": path, "format": file_format}
+        )
+    db.commit()
+    return InventoryImportStatus.from_orm(job)
+
+def get_import_job(db: Session, job_id: uuid.UUID) -> Optional[InventoryImportStatus]:
+    job = db.get(InventoryImport, job_id)
+    return InventoryImportStatus.from_orm(job) if job else None
+
+def read_rows(path: str, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, raw row) pairs from a CSV or NDJSON file one line at a time.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if file_format == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+        elif file_format == "ndjson":
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    try:
+                        yield line_number, json.loads(line)
+                    except ValueError:
+                        yield line_number, None
+        else:
+            raise ValueError(f"Unsupported import format: {file_format}")
+
+class ReferenceLookup:
+    """
+    In-memory maps from facility and medication ids/names to ids, built with
+    one query per table at the start of an import.
+    """
+
+    def __init__(self, db: Session):
+        self.facilities: Dict[str, Optional[uuid.UUID]] = {}
+        self.medications: Dict[str, Optional[uuid.UUID]] = {}
+
+        for facility_id, name in db.execute(select(Facility.facility_id, Facility.facility_name)):
+            self.facilities[str(facility_id)] = facility_id
+            self._add(self.facilities, name, facility_id)
+
+        for medication_id, name, strength in db.execute(
+            select(Medication.medication_id, Medication.medication_name, Medication.strength)
+        ):
+            self.medications[str(medication_id)] = medication_id
+            self._add(self.medications, name, medication_id)
+            self._add(self.medications, f"{name}|{strength}", medication_id)
+
+    @staticmethod
+    def _key(value: str) -> str:
+        return " ".join(value.split()).lower()
+
+    def _add(self, mapping: Dict[str, Optional[uuid.UUID]], name: str, id: uuid.UUID) -> None:
+        key = self._key(name)
+        # A name shared by several rows is ambiguous; keep the key but map it to None
+        mapping[key] = id if mapping.get(key, id) == id else None
+
+    def _resolve(self, mapping, id, name, label) -> uuid.UUID:
+        if id is not None:
+            if str(id) not in mapping:
+                raise LookupError(f"Unknown {label} id {id}")
+            return id
+        key = self._key(name)
+        if key not in mapping:
+            raise LookupError(f"Unknown {label} '{name}'")
+        if mapping[key] is None:
+            raise LookupError(f"Ambiguous {label} '{name}'; use the {label} id instead")
+        return mapping[key]
+
+    def resolve(self, row: StockCountRow) -> InventoryCreate:
+        medication_name = row.medication_name
+        if row.medication_id is None and row.strength:
+            medication_name = f"{row.medication_name}|{row.strength}"
+        return InventoryCreate(
+            facility_id=self._resolve(self.facilities, row.facility_id, row.facility_name, "facility"),
+            medication_id=self._resolve(self.medications, row.medication_id, medication_name, "medication"),
+            quantity=row.quantity,
+            reorder_level=row.reorder_level,
+            expiry_date=row.expiry_date,
+        )
+
+class InventoryImportService:
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.inventory_repo = InventoryRepository(db)
+        self.chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+
+    def _update(self, job_id: uuid.UUID, read: int = 0, imported: int = 0, errors: List[ImportRowError] = (), **fields) -> None:
+        # Committed on its own, after the chunk it reports on
+        job = self.db.get(InventoryImport, job_id)
+        if job is None:
+            return
+        job.rows_read += read
+        job.rows_imported += imported
+        job.rows_failed += len(errors)
+        reported = errors[:max(MAX_REPORTED_ERRORS - len(job.errors), 0)]
+        if reported:
+            job.errors = job.errors + [error.dict() for error in reported]
+        for key, value in fields.items():
+            setattr(job, key, value)
+        self.db.commit()
+
+    def _reset(self, job_id: uuid.UUID) -> None:
+        # The upserts are idempotent, but counters from an interrupted attempt must not add up
+        job = self.db.get(InventoryImport, job_id)
+        if job is None:
+            return
+        job.status = ImportStatus.running
+        job.rows_read = job.rows_imported = job.rows_failed = 0
+        job.errors = []
+        job.finished_at = None
+        self.db.commit()
+
+    def _fail(self, job_id: uuid.UUID) -> None:
+        job = self.db.get(InventoryImport, job_id)
+        if job is None:
+            return
+        job.status = ImportStatus.failed
+        job.finished_at = datetime.utcnow()
+        job.errors = job.errors + [ImportRowError(line=0, detail="The import stopped because of an unexpected error.").dict()]
+        self.db.commit()
+
+    def _validate_chunk(self, lookup: ReferenceLookup, chunk: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, InventoryCreate]], List[ImportRowError]]:
+        lots: Dict[tuple, Tuple[int, InventoryCreate]] = {}
+        errors: List[ImportRowError] = []
+        for line, raw in chunk:
+            if not isinstance(raw, dict):
+                errors.append(ImportRowError(line=line, detail="Row is not a JSON object."))
+                continue
+            try:
+                lot = lookup.resolve(StockCountRow.parse_obj(raw))
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                errors.append(ImportRowError(line=line, detail=detail))
+                continue
+            except LookupError as e:
+                errors.append(ImportRowError(line=line, detail=str(e)))
+                continue
+            # The last count of a lot within the chunk wins; ON CONFLICT cannot
+            # touch the same row twice in one statement.
+            lots[tuple(getattr(lot, key) for key in LOT_KEY)] = (line, lot)
+        return list(lots.values()), errors
+
+    def run_import(self, job_id: uuid.UUID, path: str, file_format: str) -> ImportStatus:
+        """
+        Stream a stock-count file into the inventory table chunk by chunk.
+
+        Memory use is bounded by the chunk size: rows are validated, resolved
+        and upserted one chunk at a time and the status counters are updated
+        after each chunk. Every run starts the counters afresh, so a retried
+        import reports only its last attempt. Returns the final status.
+        """
+        try:
+            self._reset(job_id)
+            lookup = ReferenceLookup(self.db)
+            rows = read_rows(path, file_format)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                lots, errors = self._validate_chunk(lookup, chunk)
+                result = self.inventory_repo.upsert_lots((lot for _, lot in lots), chunk_size=self.chunk_size)
+                errors.extend(ImportRowError(line=lots[error.index][0], detail=error.detail) for error in result.errors)
+                errors.sort(key=lambda error: error.line)
+                self._update(job_id, read=len(chunk), imported=result.succeeded, errors=errors)
+            self._update(job_id, status=ImportStatus.completed, finished_at=datetime.utcnow())
+            return ImportStatus.completed
+        except Exception as e:
+            # Whatever stopped it (including a failed commit surfacing as an
+            # HTTPException), the import must not be left running
+            logging.error(f"Inventory import {job_id} failed: {e}")
+            self.db.rollback()
+            try:
+                self._fail(job_id)
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                logging.error(f"Could not record the failure of inventory import {job_id}: {e}")
+            return ImportStatus.failed
+
+def remove_spooled_file(path: str) -> None:
+    with suppress(FileNotFoundError):
+        os.remove(path)
+
+def run_import_job(db: Session, job_id: uuid.UUID, path: str, file_format: str) -> None:
+    """
+    Job entry point. The spooled file is removed once the import completes;
+    a failed attempt raises so the worker retries it from the same file, and
+    the job's failure handler removes the file when no attempts remain.
+    """
+    if InventoryImportService(db).run_import(job_id, path, file_format) == ImportStatus.completed:
+        remove_spooled_file(path)
+        return
+    raise RuntimeError(f"Inventory import {job_id} failed; see its errors")
@@ -1 +1,130 @@
-# Placeholder for app/services/inventory_service.py
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.db.retry import db_transaction_retries_total, is_transient_conflict, run_in_transaction
+from app.schemas.inventory import DispenseRequest, DispenseResult, LotAllocation
+from app.services.allocation_service import FefoAllocator
+import logging
+
+class InventoryService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.allocator = FefoAllocator(db)
+
+    def dispense(self, dispense_in: DispenseRequest) -> DispenseResult:
+        """
+        Dispense stock at a facility, drawing from the earliest-expiring lots.
+        """
+        try:
+            allocations = run_in_transaction(
+                self.db,
+                lambda: self.allocator.allocate(dispense_in.facility_id, dispense_in.medication_id, dispense_in.quantity),
+                operation="dispense",
+            )
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            if is_transient_conflict(e):
+                logging.error(f"Dispense still conflicting after retries: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The stock changed while it was being dispensed. Please try again."
+                )
+            logging.error(f"Database error while dispensing stock: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while dispensing stock."
+            )
+        return DispenseResult(
+            facility_id=dispense_in.facility_id,
+            medication_id=dispense_in.medication_id,
+            quantity=dispense_in.quantity,
+            allocations=[
+                LotAllocation(inventory_id=lot.inventory_id, expiry_date=lot.expiry_date, quantity=lot.quantity)
+                for lot in allocations
+            ],
+        )
+
+def _benchmark(workers: int, dispenses: int, database_url: str, lots: int = 20, seed: int = 0) -> None:
+    # Models must all be registered before the schema is created
+    from app.db.base import Base
+    from app.models.facility import Facility, FacilityType
+    from app.models.inventory import Inventory
+    from app.models.medication import Medication
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autoflush=False, bind=engine)
+    # One megastore lot set holding about three quarters of what the workers ask for
+    quantity = max(workers * dispenses * 3 * 3 // (4 * lots), 1)
+    with SessionFactory() as db:
+        facility = Facility(facility_name="Central Megastore", facility_type=FacilityType.megastore,
+                            address="1 Warehouse Road", state="Lagos", city="Ikeja")
+        medication = Medication(medication_name="Amoxicillin", dosage_form="capsule", strength="500mg",
+                                manufacturer="Emzor")
+        db.add_all([facility, medication])
+        db.flush()
+        db.add_all([
+            Inventory(facility_id=facility.facility_id, medication_id=medication.medication_id, quantity=quantity,
+                      reorder_level=10, expiry_date=date(2030 + index // 12, 1 + index % 12, 1))
+            for index in range(lots)
+        ])
+        db.commit()
+        facility_id, medication_id = facility.facility_id, medication.medication_id
+    pair = (Inventory.facility_id == facility_id, Inventory.medication_id == medication_id)
+
+    def dispense_many(worker: int):
+        rng = random.Random(seed + worker)
+        latencies, dispensed, refused = [], 0, 0
+        with SessionFactory() as db:
+            service = InventoryService(db)
+            for _ in range(dispenses):
+                requested = rng.randint(1, 5)
+                started = time.perf_counter()
+                try:
+                    service.dispense(DispenseRequest(facility_id=facility_id, medication_id=medication_id, quantity=requested))
+                    dispensed += requested
+                except HTTPException:
+                    refused += 1
+                latencies.append(time.perf_counter() - started)
+        return latencies, dispensed, refused
+
+    retries_before = sum(db_transaction_retries_total.values().values())
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(dispense_many, range(workers)))
+    elapsed = time.perf_counter() - started
+    retries = sum(db_transaction_retries_total.values().values()) - retries_before
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    dispensed = sum(result[1] for result in results)
+    refused = sum(result[2] for result in results)
+    with SessionFactory() as db:
+        remaining = db.execute(select(func.sum(Inventory.quantity)).where(*pair)).scalar_one()
+        lowest = db.execute(select(func.min(Inventory.quantity)).where(*pair)).scalar_one()
+    assert lowest >= 0 and remaining == quantity * lots - dispensed, "Stock was overdrawn or lost"
+
+    def percentile(share: float) -> float:
+        return latencies[min(int(share * len(latencies)), len(latencies) - 1)] * 1000
+
+    print(
+        f"{workers} workers x {dispenses} dispenses against {lots} lots: {len(latencies) / elapsed:.0f} dispenses/s, "
+        f"p50 {percentile(0.5):.1f}ms, p99 {percentile(0.99):.1f}ms; {dispensed} units dispensed, {refused} refused "
+        f"as out of stock, {retries} conflicts retried; lowest lot {lowest}, {remaining} units left"
+    )
+
+if __name__ == "__main__":
+    # python -m app.services.inventory_service [workers] [dispenses per worker] [database url]
+    # Point the URL at a scratch database: the benchmark creates its tables and adds a megastore's lots
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    dispenses = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    database_url = sys.argv[3] if len(sys.argv) > 3 else "sqlite:///dispense_benchmark.db"
+    _benchmark(workers, dispenses, database_url)
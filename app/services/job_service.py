@@ -0,0 +1,218 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.core.cron import CronSchedule
+from app.core.pagination import build_keyset_query, paginate
+from app.models.job import Job, JobSchedule, JobStatus
+from app.repositories.job_repository import JobRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.stock_ledger_repository import StockLedgerRepository
+from app.schemas.job import Job as JobSchema, JobCreate, JobScheduleUpdate
+from app.services.inventory_import_service import remove_spooled_file, run_import_job
+from app.services.redistribution_service import RedistributionService
+from app.services.reorder_service import ReorderService
+from app.services.stock_ledger_service import StockLedgerService
+from app.services.stock_summary_service import StockSummaryService
+import logging
+
+JobHandler = Callable[[Session, Dict[str, Any]], Optional[Dict[str, Any]]]
+JobFailureHandler = Callable[[Dict[str, Any]], None]
+
+# Job types a worker can run, by name. A handler gets its own session and the
+# job's payload, and returns a JSON-serializable result; raising fails the attempt.
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+# Clean-up run with the payload once a job has failed for good (no retries left)
+JOB_FAILURE_HANDLERS: Dict[str, JobFailureHandler] = {}
+
+def job_handler(job_type: str, on_failure: Optional[JobFailureHandler] = None) -> Callable[[JobHandler], JobHandler]:
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[job_type] = handler
+        if on_failure is not None:
+            JOB_FAILURE_HANDLERS[job_type] = on_failure
+        return handler
+    return register
+
+@job_handler("noop")
+def run_noop(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Does nothing; for checking that workers are alive and for queue benchmarks
+    return {}
+
+@job_handler("reorder_scan")
+def run_reorder_scan(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    since = payload.get("since")
+    result = ReorderService(db).scan(
+        since=datetime.fromisoformat(since) if since else None, dry_run=payload.get("dry_run", False)
+    )
+    return jsonable_encoder(result)
+
+@job_handler("ledger_snapshot")
+def run_ledger_snapshot(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Keep monthly ledger partitions ahead of the calendar; committed with the snapshots
+    partitions = StockLedgerRepository(db).ensure_month_partitions(date.today(), months=payload.get("months_ahead", 3))
+    result = StockLedgerService(db).take_snapshots()
+    return {**jsonable_encoder(result), "partitions": partitions}
+
+@job_handler("stock_summary_rebuild")
+def run_stock_summary_rebuild(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    StockSummaryService(db).rebuild()
+    return {}
+
+@job_handler("redistribution_plan")
+def run_redistribution_plan(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    result = RedistributionService(db).plan(state=payload["state"], dry_run=payload.get("dry_run", False))
+    return jsonable_encoder(result)
+
+@job_handler("inventory_import", on_failure=lambda payload: remove_spooled_file(payload["path"]))
+def run_inventory_import(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Enqueued by the import endpoint; progress and errors are kept on the import itself
+    run_import_job(db, UUID(payload["job_id"]), payload["path"], payload["format"])
+    return {"import_id": payload["job_id"]}
+
+@job_handler("outbox_prune")
+def run_outbox_prune(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # One chunk per transaction, so the delete never holds many rows locked
+    published_before = datetime.utcnow() - timedelta(days=payload.get("retention_days", settings.OUTBOX_RETENTION_DAYS))
+    repo = OutboxRepository(db)
+    deleted = 0
+    while True:
+        chunk = repo.prune(published_before)
+        db.commit()
+        deleted += chunk
+        if not chunk:
+            return {"published_before": published_before.isoformat(), "deleted": deleted}
+
+# (name, job type, cron) of the schedules created by ensure_default_schedules
+DEFAULT_SCHEDULES = (
+    ("reorder-scan", "reorder_scan", "0 * * * *"),
+    ("ledger-snapshot", "ledger_snapshot", "30 0 * * *"),
+    ("stock-summary-rebuild", "stock_summary_rebuild", "0 3 * * 0"),
+    ("outbox-prune", "outbox_prune", "15 * * * *"),
+)
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_repo = JobRepository(db)
+
+    def _check_job_type(self, job_type: str) -> None:
+        if job_type not in JOB_HANDLERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown job type. Use one of: {', '.join(sorted(JOB_HANDLERS))}."
+            )
+
+    def enqueue(self, job_in: JobCreate) -> Job:
+        self._check_job_type(job_in.job_type)
+        try:
+            job = self.job_repo.enqueue(
+                job_in.job_type,
+                payload=job_in.payload,
+                run_at=job_in.run_at,
+                priority=job_in.priority,
+                max_attempts=job_in.max_attempts,
+            )
+            self.db.commit()
+            return job
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logging.error(f"Database error while enqueueing a job: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while enqueueing the job."
+            )
+
+    def get_job(self, job_id: UUID) -> Job:
+        job = self.job_repo.get(job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return job
+
+    def list_jobs(
+        self,
+        job_status: Optional[JobStatus] = None,
+        job_type: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[JobSchema], Optional[str]]:
+        """
+        Jobs matching the filters, newest first, one keyset page at a time.
+        """
+        stmt, columns = build_keyset_query(
+            Job, after=after, order_by="created_at", limit=limit, descending=True, sortable=("created_at",)
+        )
+        stmt = stmt.where(*self.job_repo.job_filters(status=job_status, job_type=job_type))
+        try:
+            rows = self.db.execute(stmt).scalars().all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while listing jobs: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while listing jobs."
+            )
+        jobs, next_cursor = paginate(rows, columns, limit)
+        return [JobSchema.from_orm(job) for job in jobs], next_cursor
+
+    def cancel_job(self, job_id: UUID) -> Job:
+        job = self.get_job(job_id)
+        if not self.job_repo.cancel(job_id, datetime.utcnow()):
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only queued jobs can be cancelled.")
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def list_schedules(self) -> List[JobSchedule]:
+        return self.job_repo.list_schedules()
+
+    def put_schedule(self, name: str, schedule_in: JobScheduleUpdate) -> JobSchedule:
+        """
+        Create or replace a schedule. Its next run is the first cron match
+        from now.
+        """
+        self._check_job_type(schedule_in.job_type)
+        try:
+            next_run_at = CronSchedule(schedule_in.cron).next_after(datetime.utcnow())
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        try:
+            schedule = self.db.merge(JobSchedule(name=name, next_run_at=next_run_at, **schedule_in.dict()))
+            self.db.commit()
+            return schedule
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logging.error(f"Database error while saving job schedule {name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while saving the job schedule."
+            )
+
+    def delete_schedule(self, name: str) -> JobSchedule:
+        schedule = self.job_repo.get_schedule(name)
+        if not schedule:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job schedule not found")
+        self.db.delete(schedule)
+        self.db.commit()
+        return schedule
+
+    def ensure_default_schedules(self) -> List[str]:
+        """
+        Create the DEFAULT_SCHEDULES that do not exist yet, leaving existing
+        ones (and any changes made to them) alone. Returns the names created.
+        """
+        now = datetime.utcnow()
+        created = []
+        for name, job_type, cron in DEFAULT_SCHEDULES:
+            if self.job_repo.get_schedule(name) is None:
+                self.db.add(JobSchedule(
+                    name=name, job_type=job_type, payload={}, cron=cron, enabled=True,
+                    next_run_at=CronSchedule(cron).next_after(now),
+                ))
+                created.append(name)
+        self.db.commit()
+        return created
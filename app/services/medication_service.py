@@ -1 +1,80 @@
-# Placeholder for app/services/medication_service.py
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.models.medication import Medication
+from app.repositories.medication_repository import MedicationRepository
+from app.schemas.medication import MedicationCreate, MedicationDetail, MedicationListItem, MedicationStockLine, MedicationUpdate
+import logging
+
+class MedicationService:
+    def __init__(self, db: Session):
+        self.medication_repo = MedicationRepository(db)
+
+    def list_medications(
+        self,
+        name: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[MedicationListItem], Optional[str]]:
+        filters = [Medication.medication_name.ilike(f"{name}%")] if name else []
+        return self.medication_repo.get_projected_page(
+            MedicationListItem, after=after, order_by="medication_name", limit=limit, filters=filters
+        )
+
+    def get_detail(self, medication_id: UUID) -> MedicationDetail:
+        """
+        The medication with its stock lots at every facility, earliest expiry first.
+        """
+        try:
+            medication = self.medication_repo.get_detail(medication_id)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while loading medication {medication_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while loading the medication."
+            )
+        if medication is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Medication with id {medication_id} not found",
+            )
+
+        stock = [
+            MedicationStockLine(
+                inventory_id=lot.inventory_id,
+                facility_id=lot.facility_id,
+                facility_name=lot.facility.facility_name,
+                quantity=lot.quantity,
+                expiry_date=lot.expiry_date,
+            )
+            for lot in sorted(medication.inventory, key=lambda lot: lot.expiry_date)
+        ]
+        return MedicationDetail(
+            medication_id=medication.medication_id,
+            medication_name=medication.medication_name,
+            dosage_form=medication.dosage_form,
+            strength=medication.strength,
+            manufacturer=medication.manufacturer,
+            stock=stock,
+            quantity_on_hand=sum(line.quantity for line in stock),
+        )
+
+    def get_medication(self, medication_id: UUID) -> Medication:
+        medication = self.medication_repo.get(medication_id)
+        if medication is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Medication with id {medication_id} not found",
+            )
+        return medication
+
+    def create_medication(self, medication_in: MedicationCreate) -> Medication:
+        return self.medication_repo.create(medication_in)
+
+    def update_medication(self, medication_id: UUID, medication_in: MedicationUpdate) -> Medication:
+        return self.medication_repo.update(self.get_medication(medication_id), medication_in)
+
+    def delete_medication(self, medication_id: UUID) -> Medication:
+        return self.medication_repo.remove(medication_id)
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.repositories.outbox_repository import OUTBOX_AGGREGATES, OutboxRepository
+from app.schemas.outbox import OutboxEvent as OutboxEventSchema
+import logging
+
+# Events read per query while streaming
+STREAM_BATCH_SIZE = 500
+
+def format_sse(event: OutboxEventSchema) -> str:
+    # The id is echoed back by EventSource as Last-Event-ID when it reconnects
+    return f"id: {event.sequence}\nevent: {event.aggregate_type}.{event.event_type}\ndata: {event.json()}\n\n"
+
+class OutboxFeedService:
+    """
+    Reads the published change feed for long polls and event streams. Every
+    read uses a short session of its own, so a waiting consumer holds no
+    database connection between polls.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    def _check_aggregate_type(self, aggregate_type: Optional[str]) -> None:
+        if aggregate_type is not None and aggregate_type not in OUTBOX_AGGREGATES.values():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown aggregate type. Use one of: {', '.join(sorted(OUTBOX_AGGREGATES.values()))}."
+            )
+
+    async def start_position(self, after: Optional[int], aggregate_type: Optional[str] = None) -> int:
+        """
+        Validate a consumer's position: None starts at the newest event,
+        a position whose following events were already pruned raises 410 (the
+        consumer must reload its state), and one past the newest raises 400.
+        """
+        self._check_aggregate_type(aggregate_type)
+        try:
+            async with self.session_factory() as db:
+                repo = OutboxRepository(db)
+                head = (await db.execute(repo.head_query())).scalar_one_or_none() or 0
+                oldest = (await db.execute(repo.oldest_query())).scalar_one()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while reading the change feed position: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while reading the change feed."
+            )
+        if after is None:
+            return head
+        if after > head:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Sequence {after} is past the newest event ({head})."
+            )
+        first_kept = oldest if oldest is not None else head + 1
+        if after < first_kept - 1:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Events after sequence {after} have been pruned; the oldest kept is {first_kept}."
+            )
+        return after
+
+    async def read(self, after: int, limit: int, aggregate_type: Optional[str] = None) -> Tuple[List[OutboxEventSchema], int]:
+        """
+        Up to ``limit`` published events after ``after``, and the position to
+        read from next. Events filtered out by ``aggregate_type`` still move
+        the position, so a quiet type is not scanned again.
+        """
+        async with self.session_factory() as db:
+            repo = OutboxRepository(db)
+            head = (await db.execute(repo.head_query())).scalar_one_or_none() or 0
+            rows = (await db.execute(repo.feed_query(after, head, limit, aggregate_type))).all()
+        events = [OutboxEventSchema(**row._mapping) for row in rows]
+        if len(events) < limit:
+            return events, max(after, head)
+        return events, events[-1].sequence
+
+    async def poll(
+        self, after: int, limit: int, aggregate_type: Optional[str] = None, wait: float = 0
+    ) -> Tuple[List[OutboxEventSchema], int]:
+        """
+        Like read, but wait up to ``wait`` seconds for events to be published
+        when there are none yet (long polling).
+        """
+        deadline = time.monotonic() + wait
+        try:
+            while True:
+                events, after = await self.read(after, limit, aggregate_type)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events, after
+                await asyncio.sleep(min(settings.OUTBOX_FEED_POLL_INTERVAL, remaining))
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while reading the change feed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while reading the change feed."
+            )
+
+    async def stream(
+        self,
+        after: int,
+        aggregate_type: Optional[str],
+        is_disconnected: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[str]:
+        """
+        Server-sent events for everything published after ``after``, until
+        the client goes away. Idle streams get a comment line every
+        OUTBOX_STREAM_KEEPALIVE seconds so proxies keep them open.
+        """
+        last_sent = time.monotonic()
+        while not await is_disconnected():
+            try:
+                events, after = await self.read(after, STREAM_BATCH_SIZE, aggregate_type)
+            except SQLAlchemyError as e:
+                # Headers are gone already; the client reconnects from its Last-Event-ID
+                logging.error(f"Database error while streaming the change feed: {e}")
+                return
+            for event in events:
+                yield format_sse(event)
+            if events:
+                last_sent = time.monotonic()
+            if len(events) < STREAM_BATCH_SIZE:
+                if time.monotonic() - last_sent >= settings.OUTBOX_STREAM_KEEPALIVE:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                await asyncio.sleep(settings.OUTBOX_FEED_POLL_INTERVAL)
@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import Dict, Hashable
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.redistribution import plan_redistribution
+from app.models.transfer import TransferStatus
+from app.repositories.stock_summary_repository import StockSummaryRepository
+from app.repositories.transfer_repository import TransferRepository
+from app.schemas.transfer import RedistributionPlanResult
+import logging
+
+def _codes(values, mapping: Dict[Hashable, int]) -> np.ndarray:
+    # Dense integer codes for ids and city names, shared through ``mapping``
+    return np.array([mapping.setdefault(value, len(mapping)) for value in values], dtype=np.int64)
+
+class RedistributionService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.summary_repo = StockSummaryRepository(db)
+        self.transfer_repo = TransferRepository(db)
+
+    def plan(self, state: str, dry_run: bool = False) -> RedistributionPlanResult:
+        """
+        Propose transfers that bring every facility in ``state`` up to its
+        reorder level from facilities holding unexpired stock above theirs,
+        preferring the same city and the earliest-expiring stock, and write
+        them as draft transfers in bulk. Drafts from an earlier plan for the
+        state are replaced. Confirm a draft to move its stock.
+        """
+        planned_at = datetime.utcnow()
+        today = planned_at.date()
+        try:
+            donors = self.db.execute(self.summary_repo.surplus_query(state, today)).all()
+            recipients = self.db.execute(self.summary_repo.shortfall_query(state)).all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while loading stock positions for redistribution: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while planning redistribution."
+            )
+
+        medications: Dict[Hashable, int] = {}
+        cities: Dict[Hashable, int] = {}
+        try:
+            plan = plan_redistribution(
+                donor_group=_codes((row[1] for row in donors), medications),
+                donor_city=_codes((row[2] for row in donors), cities),
+                donor_supply=np.array([row[3] for row in donors], dtype=np.int64),
+                donor_days=np.array([(row[4] - today).days for row in donors], dtype=np.int64),
+                recipient_group=_codes((row[1] for row in recipients), medications),
+                recipient_city=_codes((row[2] for row in recipients), cities),
+                recipient_need=np.array([row[3] for row in recipients], dtype=np.int64),
+                same_city_cost=settings.REDISTRIBUTION_SAME_CITY_COST,
+                other_city_cost=settings.REDISTRIBUTION_OTHER_CITY_COST,
+                expiry_weight=settings.REDISTRIBUTION_EXPIRY_WEIGHT,
+                horizon_days=settings.REDISTRIBUTION_EXPIRY_HORIZON_DAYS,
+                batch_size=settings.REDISTRIBUTION_BATCH_SIZE,
+            )
+        except ValueError as e:
+            logging.error(f"Redistribution plan for {state} failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while planning redistribution."
+            )
+
+        quantity_needed = sum(row[3] for row in recipients)
+        result = RedistributionPlanResult(
+            state=state,
+            planned_at=planned_at,
+            donors=len(donors),
+            recipients=len(recipients),
+            quantity_needed=quantity_needed,
+            quantity_planned=int(plan.quantity.sum()),
+            quantity_unmet=int(plan.unmet.sum()),
+            transfers_planned=len(plan.quantity),
+        )
+        if dry_run:
+            return result
+
+        drafts = (
+            {
+                "from_facility_id": donors[donor][0],
+                "to_facility_id": recipients[recipient][0],
+                "medication_id": donors[donor][1],
+                "quantity_transferred": int(quantity),
+                "status": TransferStatus.draft,
+                "transfer_date": planned_at,
+            }
+            for donor, recipient, quantity in zip(plan.donor, plan.recipient, plan.quantity)
+        )
+        try:
+            # Committed together with the new drafts by bulk_create
+            result.drafts_replaced = self.transfer_repo.delete_drafts(state)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logging.error(f"Database error while replacing draft transfers: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while replacing draft transfers."
+            )
+        written = self.transfer_repo.bulk_create(drafts)
+        result.transfers_created = written.succeeded
+        result.transfers_failed = written.failed
+        return result
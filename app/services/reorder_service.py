@@ -0,0 +1,134 @@
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from math import ceil
+from typing import Optional
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.models.requisition import RequisitionStatus
+from app.repositories.requisition_repository import RequisitionRepository
+from app.repositories.stock_summary_repository import StockSummaryRepository
+from app.schemas.requisition import ReorderScanResult
+import logging
+
+class ReorderService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.summary_repo = StockSummaryRepository(db)
+        self.requisition_repo = RequisitionRepository(db)
+
+    def scan(self, since: Optional[datetime] = None, dry_run: bool = False) -> ReorderScanResult:
+        """
+        Find every (facility, medication) pair under its reorder level in one
+        query against the stock summary and raise draft requisitions for them
+        in bulk. With ``since`` only pairs whose stock changed after that time
+        are re-checked. Drafts are then submitted, or approved or rejected
+        directly, through RequisitionService.
+        """
+        checked_at = datetime.utcnow()
+        try:
+            candidates = self.db.execute(self.summary_repo.below_reorder_query(since)).all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while scanning for reorders: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while scanning for reorders."
+            )
+
+        result = ReorderScanResult(
+            checked_at=checked_at, since=since, pairs_below_reorder=len(candidates), requisitions_created=0
+        )
+        if dry_run or not candidates:
+            return result
+
+        # Top the stock up to a multiple of its reorder level
+        drafts = (
+            {
+                "facility_id": facility_id,
+                "medication_id": medication_id,
+                "quantity_requested": max(ceil(reorder_level * settings.REORDER_TOP_UP_FACTOR) - on_hand, 1),
+                "status": RequisitionStatus.draft,
+                "requested_at": checked_at,
+            }
+            for facility_id, medication_id, on_hand, reorder_level in candidates
+        )
+        written = self.requisition_repo.bulk_create(drafts)
+        result.requisitions_created = written.succeeded
+        result.requisitions_failed = written.failed
+        return result
+
+def _benchmark(facilities: int, medications: int, database_url: str, below_share: float = 0.02, seed: int = 0) -> None:
+    # Models must all be registered before the schema is created
+    from app.db.base import Base
+    from app.models.facility import Facility, FacilityType
+    from app.models.medication import Medication
+    from app.models.stock_summary import FacilityStockSummary
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    loaded_at = datetime.utcnow() - timedelta(days=1)
+    facility_ids = [uuid.uuid4() for _ in range(facilities)]
+    medication_ids = [uuid.uuid4() for _ in range(medications)]
+
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(insert(Facility), [
+            {"facility_id": facility_id, "facility_name": f"Facility {index}", "facility_type": FacilityType.clinic,
+             "address": f"{index} Hospital Road", "state": "Lagos", "city": f"City {index % 200}"}
+            for index, facility_id in enumerate(facility_ids)
+        ])
+        connection.execute(insert(Medication), [
+            {"medication_id": medication_id, "medication_name": f"Medication {index}", "dosage_form": "tablet",
+             "strength": "500mg", "manufacturer": "Emzor"}
+            for index, medication_id in enumerate(medication_ids)
+        ])
+        # A statewide summary where ``below_share`` of the pairs are under their reorder level
+        for facility_id in facility_ids:
+            rows = []
+            for medication_id in medication_ids:
+                reorder_level = rng.randint(10, 200)
+                on_hand = rng.randint(0, reorder_level - 1) if rng.random() < below_share else rng.randint(reorder_level, 4 * reorder_level)
+                rows.append({"facility_id": facility_id, "medication_id": medication_id, "quantity_on_hand": on_hand,
+                             "reorder_level": reorder_level, "quantity_on_order": 0, "updated_at": loaded_at})
+            connection.execute(insert(FacilityStockSummary), rows)
+    seeded = time.perf_counter()
+
+    with Session(engine) as db:
+        full_started = time.perf_counter()
+        full = ReorderService(db).scan()
+        full_finished = time.perf_counter()
+
+        # A day of dispensing moves about 1% of the pairs, some of them under their level
+        since = datetime.utcnow()
+        changed = rng.sample(facility_ids, max(facilities // 100, 1))
+        db.execute(
+            update(FacilityStockSummary)
+            .where(FacilityStockSummary.facility_id.in_(changed))
+            .values(quantity_on_hand=FacilityStockSummary.quantity_on_hand // 4, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        incremental_started = time.perf_counter()
+        incremental = ReorderService(db).scan(since=since)
+        incremental_finished = time.perf_counter()
+
+    print(
+        f"{facilities} facilities x {medications} medications ({facilities * medications} pairs, seeded in "
+        f"{seeded - started:.1f}s): full scan {full.pairs_below_reorder} below reorder, "
+        f"{full.requisitions_created} drafts in {full_finished - full_started:.2f}s; "
+        f"incremental scan over {len(changed)} changed facilities {incremental.pairs_below_reorder} below reorder, "
+        f"{incremental.requisitions_created} drafts in {incremental_finished - incremental_started:.2f}s"
+    )
+
+if __name__ == "__main__":
+    # python -m app.services.reorder_service [facilities] [medications] [database url]
+    # Point the URL at a scratch database: the benchmark creates its tables and fills them
+    facilities = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    medications = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    database_url = sys.argv[3] if len(sys.argv) > 3 else "sqlite:///reorder_benchmark.db"
+    _benchmark(facilities, medications, database_url)
@@ -0,0 +1,126 @@
+import asyncio
+from typing import AsyncIterator, Callable, Optional
+from uuid import UUID
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.fanout import FanoutHub
+from app.core.metrics import Counter, Gauge, registry
+from app.db.async_session import AsyncSessionLocal
+from app.models.facility import Facility
+from app.repositories.inventory_repository import InventoryRepository
+from app.schemas.inventory import StockChange
+from app.schemas.outbox import OutboxEvent as OutboxEventSchema
+from app.services.outbox_service import STREAM_BATCH_SIZE, OutboxFeedService
+import logging
+
+stock_feed_subscribers = registry.register(Gauge(
+    "stock_feed_subscribers", "Open live stock feed streams in this process."
+))
+stock_feed_resyncs_total = registry.register(Counter(
+    "stock_feed_resyncs_total", "Live stock feed streams sent a fresh snapshot after falling too far behind."
+))
+
+class StockFeedService:
+    """
+    Live stock levels per facility. One task per process follows the
+    inventory events of the change feed while anyone is subscribed and fans
+    them out through a hub keyed by inventory_id, so each stream gets the
+    latest state of every changed lot and a slow one never queues more than
+    STOCK_FEED_MAX_PENDING lots before it is sent a fresh snapshot instead.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal, max_pending: int = settings.STOCK_FEED_MAX_PENDING):
+        self.session_factory = session_factory
+        self.feed = OutboxFeedService(session_factory)
+        self.hub = FanoutHub(max_pending)
+        self._follower: Optional[asyncio.Task] = None
+        self._starting = asyncio.Lock()
+
+    async def check_facility(self, facility_id: UUID) -> None:
+        try:
+            async with self.session_factory() as db:
+                facility = await db.get(Facility, facility_id)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while opening the stock feed for facility {facility_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while opening the stock feed."
+            )
+        if facility is None:
+            logging.error(f"Facility with ID {facility_id} not found.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Facility not found."
+            )
+
+    def publish(self, event: OutboxEventSchema) -> int:
+        """
+        Queue one inventory change for the streams of its facility; the
+        message is serialised once however many streams receive it.
+        """
+        change = StockChange(**event.payload, deleted=event.event_type == "deleted", sequence=event.sequence)
+        return self.hub.publish(event.payload["facility_id"], event.aggregate_id, change.json())
+
+    async def _ensure_follower(self) -> None:
+        async with self._starting:
+            if self._follower is None or self._follower.done():
+                position = await self.feed.start_position(None, "inventory")
+                self._follower = asyncio.create_task(self._follow(position))
+
+    async def _follow(self, after: int) -> None:
+        # Stops once the last stream closes; the next one starts it again from the head
+        while len(self.hub):
+            try:
+                events, after = await self.feed.read(after, STREAM_BATCH_SIZE, "inventory")
+            except SQLAlchemyError as e:
+                logging.error(f"Database error while following the change feed for stock streams: {e}")
+                events = []
+            for event in events:
+                self.publish(event)
+            if len(events) < STREAM_BATCH_SIZE:
+                await asyncio.sleep(settings.OUTBOX_FEED_POLL_INTERVAL)
+
+    async def _snapshot(self, facility_id: UUID) -> str:
+        async with self.session_factory() as db:
+            rows = (await db.execute(InventoryRepository(db).export_query(facility_id=facility_id))).all()
+        lots = ",".join(StockChange(**row._mapping).json() for row in rows)
+        return f"event: snapshot\ndata: [{lots}]\n\n"
+
+    async def stream(self, facility_id: UUID) -> AsyncIterator[str]:
+        """
+        Server-sent events for one facility: a ``snapshot`` of all its lots,
+        then a ``stock`` event per changed lot, until the client goes away.
+        A client that falls too far behind gets another ``snapshot`` in place
+        of the changes it missed.
+        """
+        with self.hub.subscription(str(facility_id)) as subscription:
+            stock_feed_subscribers.inc()
+            try:
+                # Follow the feed before reading the snapshot so no change falls between them
+                await self._ensure_follower()
+                yield await self._snapshot(facility_id)
+                while True:
+                    try:
+                        messages, resync = await asyncio.wait_for(subscription.get(), settings.OUTBOX_STREAM_KEEPALIVE)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    if resync:
+                        stock_feed_resyncs_total.inc()
+                        yield await self._snapshot(facility_id)
+                    if messages:
+                        yield "".join(f"event: stock\ndata: {message}\n\n" for message in messages)
+            except (HTTPException, SQLAlchemyError) as e:
+                # Headers are gone already; the client reconnects and gets a new snapshot
+                logging.error(f"Error while streaming stock for facility {facility_id}: {e}")
+            finally:
+                stock_feed_subscribers.dec()
+
+    async def close(self) -> None:
+        if self._follower is not None:
+            self._follower.cancel()
+            await asyncio.gather(self._follower, return_exceptions=True)
+
+# Shared by every stream in the process
+stock_feed = StockFeedService()
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.core.pagination import build_keyset_query, paginate
+from app.models.stock_ledger import StockMovement
+from app.repositories.stock_ledger_repository import SNAPSHOT_SETTLE_TIME, StockLedgerRepository
+from app.schemas.stock_ledger import SnapshotResult, StockBalance, StockMovement as StockMovementSchema
+import logging
+
+class StockLedgerService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.ledger_repo = StockLedgerRepository(db)
+
+    def get_balance(self, facility_id: UUID, medication_id: UUID, as_of: Optional[datetime] = None) -> StockBalance:
+        """
+        Balance of a medication at a facility from the movements before ``as_of`` (now by default).
+        """
+        as_of = as_of or datetime.utcnow()
+        try:
+            quantity, snapshot_as_of = self.ledger_repo.balance_as_of(facility_id, medication_id, as_of)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while reading a stock balance: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while reading the stock balance."
+            )
+        return StockBalance(
+            facility_id=facility_id,
+            medication_id=medication_id,
+            as_of=as_of,
+            quantity=quantity,
+            snapshot_as_of=snapshot_as_of,
+        )
+
+    def list_movements(
+        self,
+        facility_id: Optional[UUID] = None,
+        medication_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[StockMovementSchema], Optional[str]]:
+        """
+        Movements matching the filters, newest first, one keyset page at a time.
+        """
+        stmt, columns = build_keyset_query(
+            StockMovement, after=after, order_by="occurred_at", limit=limit, descending=True, sortable=("occurred_at",)
+        )
+        stmt = stmt.where(*self.ledger_repo.movement_filters(
+            facility_id=facility_id, medication_id=medication_id, start=start, end=end
+        ))
+        try:
+            rows = self.db.execute(stmt).scalars().all()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while listing stock movements: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while listing stock movements."
+            )
+        movements, next_cursor = paginate(rows, columns, limit)
+        return [StockMovementSchema.from_orm(movement) for movement in movements], next_cursor
+
+    def take_snapshots(self, as_of: Optional[datetime] = None) -> SnapshotResult:
+        """
+        Snapshot every balance as of ``as_of`` (by default as late as allowed).
+        """
+        as_of = as_of or datetime.utcnow() - SNAPSHOT_SETTLE_TIME
+        try:
+            balances = self.ledger_repo.take_snapshots(as_of)
+            self.db.commit()
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logging.error(f"Database error while taking balance snapshots: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while taking balance snapshots."
+            )
+        return SnapshotResult(as_of=as_of, balances=balances)
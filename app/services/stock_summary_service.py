@@ -0,0 +1,54 @@
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.repositories.stock_summary_repository import StockSummaryRepository
+from app.schemas.stock_summary import FacilityStockSummary, MedicationStockLevel
+import logging
+
+class StockSummaryService:
+    def __init__(self, db: Session):
+        self.summary_repo = StockSummaryRepository(db)
+
+    def get_facility_summary(self, facility_id: UUID, expiring_within_days: int = 90) -> FacilityStockSummary:
+        try:
+            levels = self.summary_repo.get_facility_levels(facility_id)
+            quantity_expiring = self.summary_repo.get_expiring_quantity(facility_id, expiring_within_days)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while reading the stock summary: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while reading the stock summary."
+            )
+
+        medications = [
+            MedicationStockLevel(
+                medication_id=level.medication_id,
+                quantity_on_hand=level.quantity_on_hand,
+                reorder_level=level.reorder_level,
+                quantity_below_reorder=max(level.reorder_level - level.quantity_on_hand, 0),
+                quantity_on_order=level.quantity_on_order,
+                updated_at=level.updated_at,
+            )
+            for level in levels
+        ]
+        return FacilityStockSummary(
+            facility_id=facility_id,
+            quantity_on_hand=sum(level.quantity_on_hand for level in medications),
+            quantity_on_order=sum(level.quantity_on_order for level in medications),
+            medications_below_reorder=sum(1 for level in medications if level.quantity_below_reorder),
+            expiring_within_days=expiring_within_days,
+            quantity_expiring=quantity_expiring,
+            medications=medications,
+        )
+
+    def rebuild(self) -> None:
+        try:
+            self.summary_repo.rebuild()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while rebuilding the stock summary: {e}")
+            self.summary_repo.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while rebuilding the stock summary."
+            )
@@ -1 +1,222 @@
-# Placeholder for app/services/transfer_service.py
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from fastapi import HTTPException, status
+from app.db.retry import db_transaction_retries_total, is_transient_conflict, run_in_transaction
+from app.models.stock_ledger import MovementType
+from app.models.transfer import Transfer, TransferStatus
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.stock_summary_repository import StockSummaryRepository
+from app.repositories.transfer_repository import TransferRepository
+from app.schemas.transfer import TransferCreate
+from app.services.allocation_service import FefoAllocator
+import logging
+
+class TransferService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.transfer_repo = TransferRepository(db)
+        self.inventory_repo = InventoryRepository(db)
+        self.summary_repo = StockSummaryRepository(db)
+        self.allocator = FefoAllocator(db)
+
+    def _move_stock(
+        self,
+        from_facility_id: uuid.UUID,
+        to_facility_id: uuid.UUID,
+        medication_id: uuid.UUID,
+        quantity: int,
+        transfer_id: uuid.UUID,
+    ) -> None:
+        allocations = self.allocator.allocate(
+            from_facility_id,
+            medication_id,
+            quantity,
+            movement_type=MovementType.transfer_out,
+            reference_id=transfer_id,
+        )
+
+        # New lots at the destination take its existing reorder level if it has one
+        reorder_level = self.summary_repo.get_reorder_level(to_facility_id, medication_id)
+        if reorder_level is not None:
+            allocations = [lot._replace(reorder_level=reorder_level) for lot in allocations]
+        self.inventory_repo.credit_lots(
+            to_facility_id,
+            medication_id,
+            allocations,
+            movement_type=MovementType.transfer_in,
+            reference_id=transfer_id,
+        )
+
+    def _apply_transfer(self, transfer_in: TransferCreate, transfer_id: uuid.UUID) -> Transfer:
+        self._move_stock(
+            transfer_in.from_facility_id,
+            transfer_in.to_facility_id,
+            transfer_in.medication_id,
+            transfer_in.quantity_transferred,
+            transfer_id,
+        )
+        transfer = Transfer(transfer_id=transfer_id, **transfer_in.dict())
+        self.db.add(transfer)
+        self.db.flush()
+        return transfer
+
+    def _apply_draft(self, transfer_id: uuid.UUID) -> Transfer:
+        transfer = self.transfer_repo.lock_draft(transfer_id)
+        if transfer is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transfer not found")
+        if transfer.status != TransferStatus.draft:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only draft transfers can be confirmed.")
+        self._move_stock(
+            transfer.from_facility_id,
+            transfer.to_facility_id,
+            transfer.medication_id,
+            transfer.quantity_transferred,
+            transfer.transfer_id,
+        )
+        transfer.status = TransferStatus.completed
+        transfer.transfer_date = datetime.utcnow()
+        self.db.flush()
+        return transfer
+
+    def _record(self, work: Callable[[], Transfer], action: str) -> Transfer:
+        # Run a transfer write with retries and map its failures to HTTP errors
+        try:
+            transfer = run_in_transaction(self.db, work, operation="transfer")
+            self.db.refresh(transfer)
+            return transfer
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except IntegrityError as e:
+            self.db.rollback()
+            logging.error(f"Integrity error while {action}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A conflict occurred while {action}. Check the facility and medication ids."
+            )
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            if is_transient_conflict(e):
+                logging.error(f"Transfer still conflicting after retries: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The stock changed while the transfer was being recorded. Please try again."
+                )
+            logging.error(f"Database error while {action}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"An error occurred while {action}."
+            )
+
+    def create_transfer(self, transfer_in: TransferCreate) -> Transfer:
+        """
+        Move stock between facilities in one transaction: lots are drawn from
+        the source first-expiry-first-out and credited to the destination with
+        their expiry dates intact. A transaction that loses a race for the
+        same lots is rolled back and retried with backoff (see run_in_transaction).
+        """
+        # Generated up front so both sides' ledger entries can reference the transfer
+        transfer_id = uuid.uuid4()
+        return self._record(lambda: self._apply_transfer(transfer_in, transfer_id), "creating the transfer")
+
+    def confirm_draft(self, transfer_id: uuid.UUID) -> Transfer:
+        """
+        Carry out a draft transfer proposed by the redistribution planner:
+        its stock moves as in create_transfer and it becomes completed,
+        dated now. Raises 409 if it is not a draft or the source no longer
+        holds enough stock.
+        """
+        return self._record(lambda: self._apply_draft(transfer_id), "confirming the transfer")
+
+def _benchmark(workers: int, transfers: int, database_url: str, facilities: int = 10, seed: int = 0) -> None:
+    # Models must all be registered before the schema is created
+    from app.db.base import Base
+    from app.models.facility import Facility, FacilityType
+    from app.models.inventory import Inventory
+    from app.models.medication import Medication
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autoflush=False, bind=engine)
+    with SessionFactory() as db:
+        medication = Medication(medication_name="Artemether/Lumefantrine", dosage_form="tablet", strength="20/120mg",
+                                manufacturer="Emzor")
+        stores = [
+            Facility(facility_name=f"Facility {index}", facility_type=FacilityType.hospital,
+                     address=f"{index} Hospital Road", state="Lagos", city="Ikeja")
+            for index in range(facilities)
+        ]
+        db.add_all([medication, *stores])
+        db.flush()
+        # Two lots per facility, so transfers split across lots and create new ones at the destination
+        db.add_all([
+            Inventory(facility_id=store.facility_id, medication_id=medication.medication_id, quantity=500,
+                      reorder_level=50, expiry_date=date(2031, month, 1))
+            for store in stores for month in (3, 9)
+        ])
+        db.commit()
+        facility_ids, medication_id = [store.facility_id for store in stores], medication.medication_id
+    medication_stock = select(func.sum(Inventory.quantity)).where(Inventory.medication_id == medication_id)
+    with SessionFactory() as db:
+        opening = db.execute(medication_stock).scalar_one()
+
+    def transfer_many(worker: int):
+        rng = random.Random(seed + worker)
+        latencies, moved, refused = [], 0, 0
+        with SessionFactory() as db:
+            service = TransferService(db)
+            for _ in range(transfers):
+                from_facility_id, to_facility_id = rng.sample(facility_ids, 2)
+                quantity = rng.randint(1, 40)
+                started = time.perf_counter()
+                try:
+                    service.create_transfer(TransferCreate(
+                        from_facility_id=from_facility_id, to_facility_id=to_facility_id,
+                        medication_id=medication_id, quantity_transferred=quantity,
+                    ))
+                    moved += quantity
+                except HTTPException:
+                    refused += 1
+                latencies.append(time.perf_counter() - started)
+        return latencies, moved, refused
+
+    retries_before = sum(db_transaction_retries_total.values().values())
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(transfer_many, range(workers)))
+    elapsed = time.perf_counter() - started
+    retries = sum(db_transaction_retries_total.values().values()) - retries_before
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    moved = sum(result[1] for result in results)
+    refused = sum(result[2] for result in results)
+    with SessionFactory() as db:
+        closing = db.execute(medication_stock).scalar_one()
+        lowest = db.execute(select(func.min(Inventory.quantity)).where(Inventory.medication_id == medication_id)).scalar_one()
+    assert lowest >= 0 and closing == opening, "Stock was overdrawn, lost or created"
+
+    def percentile(share: float) -> float:
+        return latencies[min(int(share * len(latencies)), len(latencies) - 1)] * 1000
+
+    print(
+        f"{workers} workers x {transfers} transfers between {facilities} facilities: "
+        f"{len(latencies) / elapsed:.0f} transfers/s, p50 {percentile(0.5):.1f}ms, p99 {percentile(0.99):.1f}ms; "
+        f"{moved} units moved, {refused} refused, {retries} conflicts retried; "
+        f"stock {opening} before and {closing} after, lowest lot {lowest}"
+    )
+
+if __name__ == "__main__":
+    # python -m app.services.transfer_service [workers] [transfers per worker] [database url]
+    # Point the URL at a scratch database: the benchmark creates its tables and adds facilities and lots
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    transfers = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    database_url = sys.argv[3] if len(sys.argv) > 3 else "sqlite:///transfer_benchmark.db"
+    _benchmark(workers, transfers, database_url)
@@ -1,10 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
 from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import User
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password, verify_and_update_password_async
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 import logging
 
@@ -53,9 +54,14 @@ class UserService:
                 return None
 
             # Verify the provided password
-            if not verify_password(password, user.password_hash):
+            verified, new_hash = verify_and_update_password(password, user.password_hash)
+            if not verified:
                 return None
 
+            # Replace hashes made with an outdated bcrypt cost
+            if new_hash:
+                self.user_repo.set_password_hash(user, new_hash)
+
             return user
         except SQLAlchemyError as e:
             logging.error(f"Database error while authenticating user: {e}")
@@ -180,3 +186,46 @@ class UserService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while listing users."
             )
+
+    def list_users_page(
+        self, cursor: Optional[str] = None, order_by: Optional[str] = None, limit: int = 10
+    ) -> Tuple[List[User], Optional[str]]:
+        try:
+            return self.user_repo.get_page(after=cursor, order_by=order_by, limit=limit)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while listing users: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while listing users."
+            )
+
+class AsyncUserService:
+    """
+    User operations for async endpoints, on an AsyncSession.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.user_repo = AsyncUserRepository(db)
+
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        try:
+            user = await self.user_repo.get_by_username(username)
+            if not user:
+                return None
+
+            # bcrypt runs in the password hashing process pool, off the event loop
+            verified, new_hash = await verify_and_update_password_async(password, user.password_hash)
+            if not verified:
+                return None
+
+            # Replace hashes made with an outdated bcrypt cost
+            if new_hash:
+                await self.user_repo.set_password_hash(user, new_hash)
+
+            return user
+        except SQLAlchemyError as e:
+            logging.error(f"Database error while authenticating user: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while authenticating the user."
+            )
@@ -1 +1,40 @@
-# Placeholder for app/services/vendor_service.py
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.models.vendor import Vendor
+from app.repositories.vendor_repository import VendorRepository
+from app.schemas.vendor import VendorCreate, VendorListItem, VendorUpdate
+
+class VendorService:
+    def __init__(self, db: Session):
+        self.vendor_repo = VendorRepository(db)
+
+    def list_vendors(
+        self,
+        name: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[VendorListItem], Optional[str]]:
+        filters = [Vendor.vendor_name.ilike(f"{name}%")] if name else []
+        return self.vendor_repo.get_projected_page(
+            VendorListItem, after=after, order_by="vendor_name", limit=limit, filters=filters
+        )
+
+    def get_vendor(self, vendor_id: UUID) -> Vendor:
+        vendor = self.vendor_repo.get(vendor_id)
+        if vendor is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Vendor with id {vendor_id} not found",
+            )
+        return vendor
+
+    def create_vendor(self, vendor_in: VendorCreate) -> Vendor:
+        return self.vendor_repo.create(vendor_in)
+
+    def update_vendor(self, vendor_id: UUID, vendor_in: VendorUpdate) -> Vendor:
+        return self.vendor_repo.update(self.get_vendor(vendor_id), vendor_in)
+
+    def delete_vendor(self, vendor_id: UUID) -> Vendor:
+        return self.vendor_repo.remove(vendor_id)
@@ -1 +1,149 @@
-# Placeholder for app/tests/conftest.py
+# app/tests/conftest.py
+
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+import pytest
+from sqlalchemy.engine import Engine
+
+# Tests run against TEST_DATABASE_URL (e.g. a PostgreSQL database kept for
+# tests) or, when it is not set, a throwaway SQLite file. It is set before any
+# application module creates its engine, so the configured database is never
+# touched and no PostgreSQL driver is needed just to collect the suite.
+os.environ["SQLALCHEMY_DATABASE_URI"] = os.getenv(
+    "TEST_DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="pharma-tests-"), "test.db")
+)
+
+from app.core.query_budget import track_queries
+from app.db.explain import assert_uses_index, prefer_indexes
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    The application's engine, on the test database migrated to head. Built on
+    first use so tests that need no database do not connect to one.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from app.db.session import engine
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    command.upgrade(config, "head")
+    return engine
+
+@pytest.fixture
+def session_factory(engine):
+    from app.db.session import SessionLocal
+
+    return SessionLocal
+
+@pytest.fixture
+def db_session(session_factory):
+    """
+    A session on the test database whose transaction is rolled back after the
+    test.
+    """
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+@pytest.fixture
+def make_facility(session_factory):
+    """
+    make_facility(**fields) commits a facility and returns its id.
+    """
+    from app.models.facility import Facility, FacilityType
+
+    def _make_facility(**fields) -> uuid.UUID:
+        values = {"facility_name": f"Facility {uuid.uuid4().hex[:8]}", "facility_type": FacilityType.clinic,
+                  "address": "1 Hospital Road", "state": "Lagos", "city": "Ikeja", **fields}
+        with session_factory() as session:
+            facility = Facility(**values)
+            session.add(facility)
+            session.commit()
+            return facility.facility_id
+
+    return _make_facility
+
+@pytest.fixture
+def make_medication(session_factory):
+    """
+    make_medication(**fields) commits a medication and returns its id.
+    """
+    from app.models.medication import Medication
+
+    def _make_medication(**fields) -> uuid.UUID:
+        values = {"medication_name": f"Medication {uuid.uuid4().hex[:8]}", "dosage_form": "tablet",
+                  "strength": "500mg", "manufacturer": "Emzor", **fields}
+        with session_factory() as session:
+            medication = Medication(**values)
+            session.add(medication)
+            session.commit()
+            return medication.medication_id
+
+    return _make_medication
+
+@pytest.fixture
+def client(engine):
+    """
+    TestClient for the application, authenticated as an admin unless a test
+    calls ``client.login_as(role)``.
+    """
+    from fastapi.testclient import TestClient
+    from app.core.auth import get_current_user
+    from app.main import app
+    from app.models.user import User, UserRole
+
+    def login_as(role: UserRole, facility_id: Optional[uuid.UUID] = None) -> None:
+        user = User(user_id=uuid.uuid4(), username=f"{role.value}-{uuid.uuid4().hex[:8]}", role=role,
+                    facility_id=facility_id or uuid.uuid4())
+        app.dependency_overrides[get_current_user] = lambda: user
+
+    test_client = TestClient(app)
+    test_client.login_as = login_as
+    login_as(UserRole.admin)
+    try:
+        yield test_client
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def assert_index_scan(db_session):
+    """
+    assert_index_scan(stmt, "ix_name") fails unless the plan for ``stmt`` uses
+    the named index. Sequential scans are disabled for the transaction so the
+    check does not depend on how much data the test database holds.
+    """
+    prefer_indexes(db_session)
+    return lambda stmt, index_name: assert_uses_index(db_session, stmt, index_name)
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Context manager failing the test when the block runs more than
+    ``max_queries`` statements, or one statement shape more than
+    ``max_repeats`` times (an N+1 loop):
+
+        with assert_max_queries(3, max_repeats=1):
+            client.get(f"/api/v1/facilities/{facility_id}")
+
+    Statements on every engine are counted, including those an endpoint runs
+    on TestClient's worker threads.
+    """
+    @contextmanager
+    def _assert_max_queries(max_queries: int, max_repeats: Optional[int] = None):
+        with track_queries(Engine, max_queries=max_queries, max_repeats=max_repeats) as tracker:
+            yield tracker
+        if tracker.violations():
+            pytest.fail(f"Query budget exceeded: {tracker.report()}")
+
+    return _assert_max_queries
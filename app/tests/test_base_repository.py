@@ -0,0 +1,78 @@
+# app/tests/test_base_repository.py
+
+import asyncio
+import uuid
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.inventory import Inventory
+from app.models.inventory_import import ImportStatus, InventoryImport
+from app.models.user import UserRole
+from app.repositories.base import BaseRepository
+from app.schemas.user import UserCreate
+
+def test_partial_upserts_keep_the_columns_they_leave_out(session_factory):
+    first, second = uuid.uuid4(), uuid.uuid4()
+    with session_factory() as db:
+        db.add_all([
+            InventoryImport(job_id=job_id, filename=f"{name}.csv", status=ImportStatus.completed, rows_read=10,
+                            created_at=datetime(2030, 1, 1))
+            for job_id, name in ((first, "first"), (second, "second"))
+        ])
+        db.commit()
+
+        # Rows giving different columns share one call (and one chunk size)
+        result = BaseRepository(db, InventoryImport).bulk_upsert([
+            {"job_id": first, "rows_failed": 2},
+            {"job_id": second, "rows_failed": 3, "filename": "renamed.csv"},
+            {"job_id": uuid.uuid4(), "filename": "new.csv"},
+        ])
+        assert result.errors == []
+        assert len(result.ids) == 3
+
+        db.expire_all()
+        rows = {job_id: db.get(InventoryImport, job_id) for job_id in (first, second)}
+    assert (rows[first].filename, rows[first].status, rows[first].rows_read, rows[first].rows_failed) == (
+        "first.csv", ImportStatus.completed, 10, 2
+    )
+    assert (rows[second].filename, rows[second].rows_read, rows[second].rows_failed) == ("renamed.csv", 10, 3)
+    assert rows[first].created_at == datetime(2030, 1, 1)
+
+def test_async_repository_skips_unmapped_fields_and_reports_stale_updates(session_factory, make_facility,
+                                                                          make_medication):
+    from app.db.async_session import AsyncSessionLocal, async_engine
+    from app.repositories.async_base import AsyncBaseRepository
+    from app.repositories.user_repository import AsyncUserRepository
+
+    facility_id, medication_id = make_facility(), make_medication()
+    with session_factory() as db:
+        lot = Inventory(facility_id=facility_id, medication_id=medication_id, quantity=10, reorder_level=2,
+                        expiry_date=date(2031, 1, 31))
+        db.add(lot)
+        db.commit()
+        inventory_id = lot.inventory_id
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as db:
+                user = await AsyncUserRepository(db).create(UserCreate(
+                    username=f"async-{uuid.uuid4().hex[:8]}", password="secret", facility_id=facility_id,
+                    role=UserRole.facility_staff, password_hash="not-a-real-hash",
+                ))
+                assert user.password_hash == "not-a-real-hash"
+
+                repo = AsyncBaseRepository(db, Inventory)
+                stale = await repo.get(inventory_id)
+                # Another request moves the lot on after it was read
+                with session_factory() as other:
+                    other.get(Inventory, inventory_id).quantity = 7
+                    other.commit()
+                with pytest.raises(HTTPException) as conflict:
+                    await repo.update(stale, {"quantity": 4})
+                assert conflict.value.status_code == 409
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
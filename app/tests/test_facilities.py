@@ -1 +1,33 @@
-# Placeholder for app/tests/test_facilities.py
+# app/tests/test_facilities.py
+
+from datetime import date
+
+import pytest
+
+from app.models.inventory import Inventory
+from app.models.transfer import Transfer
+
+@pytest.mark.parametrize("medications", [1, 6])
+def test_facility_detail_query_count_does_not_grow_with_its_rows(
+    client, session_factory, make_facility, make_medication, assert_max_queries, medications
+):
+    facility_id = make_facility()
+    with session_factory() as db:
+        for medication_id in [make_medication() for _ in range(medications)]:
+            other_id = make_facility()
+            db.add_all([
+                Inventory(facility_id=facility_id, medication_id=medication_id, quantity=50,
+                          reorder_level=10, expiry_date=date(2031, 1, 31)),
+                Transfer(from_facility_id=facility_id, to_facility_id=other_id, medication_id=medication_id,
+                         quantity_transferred=5),
+                Transfer(from_facility_id=other_id, to_facility_id=facility_id, medication_id=medication_id,
+                         quantity_transferred=3),
+            ])
+        db.commit()
+
+    # The facility, its lots, and its outgoing and incoming transfers
+    with assert_max_queries(4, max_repeats=1):
+        response = client.get(f"/api/v1/facilities/{facility_id}")
+    assert response.status_code == 200
+    assert len(response.json()["inventory"]) == medications
+    assert len(response.json()["recent_transfers"]) == 2 * medications
@@ -0,0 +1,53 @@
+# app/tests/test_fanout.py
+
+import asyncio
+
+from app.core.fanout import FanoutHub
+
+def test_updates_to_a_queued_key_coalesce_in_place():
+    async def run():
+        hub = FanoutHub(max_pending=10)
+        subscription = hub.subscribe("facility-a")
+        hub.publish("facility-a", "lot-1", "lot-1 v1")
+        hub.publish("facility-a", "lot-2", "lot-2 v1")
+        hub.publish("facility-a", "lot-1", "lot-1 v2")
+        hub.publish("facility-b", "lot-3", "lot-3 v1")
+        assert await subscription.get() == (["lot-1 v2", "lot-2 v1"], False)
+
+        hub.publish("facility-a", "lot-1", "lot-1 v3")
+        assert await subscription.get() == (["lot-1 v3"], False)
+
+    asyncio.run(run())
+
+def test_a_subscriber_too_far_behind_is_told_to_resync():
+    async def run():
+        hub = FanoutHub(max_pending=2)
+        slow, prompt = hub.subscribe("facility-a"), hub.subscribe("facility-a")
+        for lot in ("lot-1", "lot-2"):
+            hub.publish("facility-a", lot, lot)
+        assert await prompt.get() == (["lot-1", "lot-2"], False)
+
+        hub.publish("facility-a", "lot-3", "lot-3")
+        hub.publish("facility-a", "lot-1", "lot-1 again")  # Dropped: the resync supersedes it
+        assert await slow.get() == ([], True)
+        assert await prompt.get() == (["lot-3", "lot-1 again"], False)
+
+        # Back to normal after the resync
+        hub.publish("facility-a", "lot-2", "lot-2 again")
+        assert await slow.get() == (["lot-2 again"], False)
+
+    asyncio.run(run())
+
+def test_unsubscribed_streams_receive_nothing():
+    hub = FanoutHub()
+    with hub.subscription("facility-a") as first:
+        second = hub.subscribe("facility-a")
+        assert len(hub) == 2
+        assert hub.publish("facility-a", "lot-1", "lot-1") == 2
+    assert len(hub) == 1
+    assert first not in hub._topics["facility-a"]
+
+    hub.unsubscribe(second)
+    hub.unsubscribe(second)  # A second unsubscribe is a no-op
+    assert len(hub) == 0
+    assert hub.publish("facility-a", "lot-1", "lot-1") == 0
@@ -0,0 +1,54 @@
+# app/tests/test_forecasting.py
+
+import numpy as np
+import pytest
+
+from app.core.forecasting import (
+    MODELS,
+    cover_demand,
+    exponential_smoothing,
+    fit_forecast,
+    moving_average,
+    order_quantities,
+    safety_stock,
+    seasonal_naive,
+)
+
+def test_single_models():
+    history = np.array([[0, 4, 8, 4]], dtype=np.float32)
+    np.testing.assert_allclose(moving_average(history, 2, window=2), [[6, 6]])
+    # Levels 0 -> 2 -> 5 -> 4.5 with alpha 0.5
+    np.testing.assert_allclose(exponential_smoothing(history, 2, alpha=0.5), [[4.5, 4.5]])
+    # Two seasons of two periods; the horizon cycles through the last season
+    np.testing.assert_allclose(seasonal_naive(history, 3, season=2), [[8, 4, 8]])
+    assert np.isnan(seasonal_naive(history, 2, season=5)).all()
+
+def test_each_series_uses_the_model_that_backtests_best():
+    seasonal = np.tile([1, 5, 9], 6)
+    steady = np.full(18, 7)
+    forecast = fit_forecast(np.stack([seasonal, steady]), horizon=4, window=3, season=3, backtest=3)
+
+    assert MODELS[forecast.model[0]] == "seasonal_naive"
+    np.testing.assert_allclose(forecast.values[0], [1, 5, 9, 1])
+    # Every model is exact on a flat series; the first one wins the tie
+    assert MODELS[forecast.model[1]] == "moving_average"
+    np.testing.assert_allclose(forecast.values[1], [7, 7, 7, 7])
+    np.testing.assert_allclose(forecast.error, [0, 0])
+
+def test_history_shorter_than_a_season_never_picks_seasonal_naive():
+    forecast = fit_forecast(np.array([[3, 3, 3, 3, 9]]), horizon=2, season=52)
+    assert MODELS[forecast.model[0]] != "seasonal_naive"
+    assert np.isfinite(forecast.values).all()
+
+def test_order_quantities_cover_demand_and_safety_stock_net_of_stock():
+    values = np.array([[1, 2, 3], [4, 4, 4]], dtype=np.float32)
+    # Cover is clipped to between one period and the horizon
+    np.testing.assert_allclose(cover_demand(values, np.array([0, 10])), [1, 12])
+    np.testing.assert_allclose(cover_demand(values, np.array([2, 2])), [3, 8])
+
+    assert safety_stock(np.array([2.0]), np.array([4]))[0] == pytest.approx(1.65 * 2 * 2)
+    quantities = order_quantities(
+        demand=np.array([10.0, 10.0]), safety=np.array([2.5, 0.0]),
+        on_hand=np.array([5.0, 20.0]), on_order=np.array([4.0, 0.0]),
+    )
+    assert quantities.tolist() == [4, 0]
@@ -0,0 +1,17 @@
+# app/tests/test_indexes.py
+
+import pytest
+from sqlalchemy import select
+
+from app.db.explain import key_queries
+from app.models.inventory import Inventory
+
+@pytest.mark.parametrize("name", list(key_queries(None)))
+def test_key_query_uses_its_index(name, db_session, assert_index_scan):
+    build, index_name = key_queries(db_session)[name]
+    assert_index_scan(build(), index_name)
+
+def test_assert_index_scan_rejects_other_plans(db_session, assert_index_scan):
+    stmt = select(Inventory).where(Inventory.quantity > 0)  # No index on quantity alone
+    with pytest.raises(AssertionError):
+        assert_index_scan(stmt, "ix_inventory_medication_facility")
@@ -1 +1,182 @@
-# Placeholder for app/tests/test_inventory.py
+# app/tests/test_inventory.py
+
+import os
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.inventory import Inventory
+from app.models.inventory_import import ImportStatus
+from app.models.job import Job, JobStatus
+from app.models.stock_ledger import MovementType, StockMovement
+from app.models.stock_summary import FacilityStockSummary
+from app.models.user import UserRole
+from app.repositories.inventory_repository import InventoryRepository
+from app.schemas.inventory import DispenseRequest
+from app.services.inventory_import_service import InventoryImportService, create_import_job, get_import_job
+from app.services.inventory_service import InventoryService
+from app.worker import Worker
+
+@pytest.fixture
+def stock_count_file(tmp_path, make_facility, make_medication):
+    facility_id, medication_id = make_facility(), make_medication()
+    path = tmp_path / "count.csv"
+    path.write_text(
+        "facility_id,medication_id,quantity,reorder_level,expiry_date\n"
+        f"{facility_id},{medication_id},40,10,2031-01-31\n"
+        f"{facility_id},{medication_id},-5,10,2031-02-28\n"
+    )
+    return str(path)
+
+def test_import_status_is_shared_through_the_database(session_factory, stock_count_file):
+    with session_factory() as db:
+        job = create_import_job(db, "count.csv")
+        InventoryImportService(db).run_import(job.job_id, stock_count_file, "csv")
+
+    # Another worker's session sees the outcome
+    with session_factory() as other:
+        status = get_import_job(other, job.job_id)
+    assert status.status == ImportStatus.completed
+    assert (status.rows_read, status.rows_imported, status.rows_failed) == (2, 1, 1)
+    assert [error.line for error in status.errors] == [3]
+    assert status.finished_at is not None
+
+def test_failed_commit_marks_the_import_failed(session_factory, stock_count_file, monkeypatch):
+    def fail_commit(self, lots, chunk_size=None):
+        list(lots)
+        raise HTTPException(status_code=500, detail="An error occurred while committing the bulk write.")
+
+    monkeypatch.setattr(InventoryRepository, "upsert_lots", fail_commit)
+    with session_factory() as db:
+        job = create_import_job(db, "count.csv")
+        InventoryImportService(db).run_import(job.job_id, stock_count_file, "csv")
+
+    with session_factory() as other:
+        status = get_import_job(other, job.job_id)
+    assert status.status == ImportStatus.failed
+    assert status.errors[-1].line == 0
+
+def test_retried_imports_count_rows_once_and_keep_the_file_until_done(
+    session_factory, stock_count_file, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_DELAY", 0)  # Retries are due at once
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 1)
+    upsert_lots = InventoryRepository.upsert_lots
+    calls = []
+
+    def fail_second_chunk(self, lots, chunk_size=None):
+        calls.append(1)
+        if len(calls) == 2:
+            raise HTTPException(status_code=500, detail="An error occurred while committing the bulk write.")
+        return upsert_lots(self, lots, chunk_size)
+
+    monkeypatch.setattr(InventoryRepository, "upsert_lots", fail_second_chunk)
+    spooled = [str(tmp_path / name) for name in ("retried.csv", "given-up.csv")]
+    for path in spooled:
+        shutil.copy(stock_count_file, path)
+    with session_factory() as db:
+        retried = create_import_job(db, "count.csv", spooled[0], "csv")
+
+    worker = Worker(poll_interval=0)
+    assert worker.run_once() == 1
+    with session_factory() as db:
+        assert get_import_job(db, retried.job_id).status == ImportStatus.failed
+    assert os.path.exists(spooled[0])  # Kept for the retry
+
+    while worker.run_once():
+        pass
+    with session_factory() as db:
+        status = get_import_job(db, retried.job_id)
+    assert status.status == ImportStatus.completed
+    assert (status.rows_read, status.rows_imported, status.rows_failed) == (2, 1, 1)
+    assert not os.path.exists(spooled[0])
+
+    # An import that keeps failing has its file removed once attempts run out
+    monkeypatch.setattr(InventoryRepository, "upsert_lots", lambda self, lots, chunk_size=None: 1 / 0)
+    with session_factory() as db:
+        given_up = create_import_job(db, "count.csv", spooled[1], "csv")
+    while worker.run_once():
+        pass
+    with session_factory() as db:
+        assert get_import_job(db, given_up.job_id).status == ImportStatus.failed
+        job = db.execute(select(Job).where(Job.payload["job_id"].as_string() == str(given_up.job_id))).scalar_one()
+    assert (job.status, job.attempts) == (JobStatus.failed, settings.JOB_MAX_ATTEMPTS)
+    assert not os.path.exists(spooled[1])
+
+def test_import_endpoint_queues_the_import_for_a_worker(client, stock_count_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_SPOOL_DIR", str(tmp_path / "spool"))
+    os.mkdir(settings.IMPORT_SPOOL_DIR)
+    with open(stock_count_file, "rb") as handle:
+        response = client.post("/api/v1/inventory/imports", files={"file": ("count.csv", handle, "text/csv")})
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert len(os.listdir(settings.IMPORT_SPOOL_DIR)) == 1
+
+    worker = Worker(poll_interval=0)
+    while worker.run_once():
+        pass
+    status = client.get(f"/api/v1/inventory/imports/{response.json()['job_id']}").json()
+    assert status["status"] == "completed"
+    assert status["rows_imported"] == 1
+    assert os.listdir(settings.IMPORT_SPOOL_DIR) == []
+
+def test_concurrent_dispenses_never_oversell(session_factory, make_facility, make_medication):
+    facility_id, medication_id = make_facility(), make_medication()
+    lots = {date(2030, 3, 31): 30, date(2030, 6, 30): 40, date(2030, 9, 30): 50}
+    with session_factory() as db:
+        db.add_all([
+            Inventory(facility_id=facility_id, medication_id=medication_id, quantity=quantity,
+                      reorder_level=10, expiry_date=expiry_date)
+            for expiry_date, quantity in lots.items()
+        ])
+        db.commit()
+
+    def dispense_many(seed):
+        # Asks for well over the stock in total, so the last requests must be refused
+        rng = random.Random(seed)
+        dispensed = refused = 0
+        with session_factory() as db:
+            service = InventoryService(db)
+            for _ in range(15):
+                quantity = rng.randint(1, 6)
+                try:
+                    result = service.dispense(DispenseRequest(
+                        facility_id=facility_id, medication_id=medication_id, quantity=quantity
+                    ))
+                except HTTPException as e:
+                    assert e.status_code == 409
+                    refused += 1
+                else:
+                    assert sum(lot.quantity for lot in result.allocations) == quantity
+                    dispensed += quantity
+        return dispensed, refused
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        outcomes = list(pool.map(dispense_many, range(8)))
+    dispensed = sum(dispensed for dispensed, _ in outcomes)
+    assert sum(refused for _, refused in outcomes) > 0
+
+    with session_factory() as db:
+        pair = (Inventory.facility_id == facility_id, Inventory.medication_id == medication_id)
+        remaining = db.execute(select(Inventory.quantity).where(*pair)).scalars().all()
+        assert min(remaining) >= 0
+        assert sum(remaining) == sum(lots.values()) - dispensed
+
+        moved = db.execute(
+            select(func.sum(StockMovement.quantity))
+            .where(StockMovement.facility_id == facility_id, StockMovement.medication_id == medication_id,
+                   StockMovement.movement_type == MovementType.dispense)
+        ).scalar_one()
+        assert moved == -dispensed
+        summary = db.get(FacilityStockSummary, (facility_id, medication_id))
+        assert summary.quantity_on_hand == sum(remaining)
+
+def test_only_admins_take_balance_snapshots(client):
+    client.login_as(UserRole.state_official)
+    assert client.post("/api/v1/inventory/ledger/snapshots").status_code == 403
@@ -0,0 +1,137 @@
+# app/tests/test_jobs.py
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.models.job import Job, JobSchedule, JobStatus
+from app.models.user import UserRole
+from app.repositories.job_repository import JobRepository
+from app.worker import Worker
+
+def test_only_admins_enqueue_jobs_and_change_schedules(client):
+    schedule = {"job_type": "noop", "payload": {}, "cron": "0 * * * *", "enabled": False}
+
+    client.login_as(UserRole.state_official)
+    assert client.post("/api/v1/jobs/", json={"job_type": "noop"}).status_code == 403
+    assert client.put("/api/v1/jobs/schedules/hourly-noop", json=schedule).status_code == 403
+    assert client.get("/api/v1/jobs/schedules").status_code == 200
+
+    client.login_as(UserRole.admin)
+    job = client.post("/api/v1/jobs/", json={"job_type": "noop"}).json()
+    assert client.put("/api/v1/jobs/schedules/hourly-noop", json=schedule).status_code == 200
+
+    client.login_as(UserRole.facility_staff)
+    assert client.post(f"/api/v1/jobs/{job['job_id']}/cancel").status_code == 403
+    assert client.delete("/api/v1/jobs/schedules/hourly-noop").status_code == 403
+
+    client.login_as(UserRole.admin)
+    assert client.post(f"/api/v1/jobs/{job['job_id']}/cancel").json()["status"] == "cancelled"
+    assert client.delete("/api/v1/jobs/schedules/hourly-noop").status_code == 200
+
+def _enqueue(session_factory, count=1, **fields):
+    with session_factory() as db:
+        jobs = [JobRepository(db).enqueue("test_echo", payload={"index": index}, **fields) for index in range(count)]
+        db.commit()
+        return [job.job_id for job in jobs]
+
+def _job(session_factory, job_id):
+    with session_factory() as db:
+        return db.get(Job, job_id)
+
+def _echo(db, payload):
+    return payload
+
+def test_concurrent_claims_never_hand_a_job_to_two_workers(session_factory):
+    job_ids = _enqueue(session_factory, 12)
+    workers = [Worker(f"worker-{index}", handlers={"test_echo": _echo}, batch_size=2) for index in range(4)]
+
+    def claim_all(worker):
+        claimed = []
+        while (jobs := worker.claim()):
+            claimed.extend(job.job_id for job in jobs)
+        return claimed
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        claims = list(pool.map(claim_all, workers))
+    assert sorted(job_id for claimed in claims for job_id in claimed) == sorted(job_ids)
+
+    for worker, claimed in zip(workers, claims):
+        for job_id in claimed:
+            job = _job(session_factory, job_id)
+            assert (job.status, job.locked_by, job.attempts) == (JobStatus.running, worker.worker_id, 1)
+            assert worker.run_job(job)
+    assert {_job(session_factory, job_id).status for job_id in job_ids} == {JobStatus.succeeded}
+
+def test_failed_attempts_are_retried_until_attempts_run_out(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_DELAY", 0)  # Retries are due at once
+    calls = []
+
+    def flaky(db, payload):
+        calls.append(payload["index"])
+        if len(calls) < 3:
+            raise RuntimeError("Supplier API unavailable")
+        return {"calls": len(calls)}
+
+    worker = Worker(handlers={"test_echo": flaky}, poll_interval=0)
+    [retried] = _enqueue(session_factory, max_attempts=3)
+    while worker.run_once():
+        pass
+    job = _job(session_factory, retried)
+    assert (job.status, job.attempts, job.result, job.last_error) == (JobStatus.succeeded, 3, {"calls": 3}, None)
+
+    # Two failures use up two attempts
+    calls.clear()
+    [given_up] = _enqueue(session_factory, max_attempts=2)
+    while worker.run_once():
+        pass
+    job = _job(session_factory, given_up)
+    assert (job.status, job.attempts, job.finished_at is not None) == (JobStatus.failed, 2, True)
+    assert job.last_error == "RuntimeError: Supplier API unavailable"
+
+def test_a_lapsed_lease_lets_another_worker_take_the_job(session_factory):
+    [job_id] = _enqueue(session_factory)
+    stalled, rescuer = (Worker(name, handlers={"test_echo": _echo}) for name in ("stalled", "rescuer"))
+    [claimed] = stalled.claim()
+    assert rescuer.claim() == []
+    assert stalled.renew_leases() == 1
+
+    with session_factory() as db:
+        lapsed = datetime.utcnow() - timedelta(seconds=1)
+        db.execute(update(Job).where(Job.job_id == job_id).values(locked_until=lapsed))
+        db.commit()
+    [reclaimed] = rescuer.claim()
+    assert (reclaimed.job_id, reclaimed.attempts) == (job_id, 2)
+
+    # The stalled worker can neither extend the lease nor record an outcome any more
+    assert stalled.renew_leases() == 0
+    stalled.run_job(claimed)
+    assert _job(session_factory, job_id).locked_by == "rescuer"
+    assert rescuer.run_job(reclaimed)
+    assert _job(session_factory, job_id).status == JobStatus.succeeded
+
+def test_a_due_schedule_is_enqueued_once_however_many_workers_see_it(session_factory):
+    now = datetime.utcnow()
+    with session_factory() as db:
+        db.add(JobSchedule(name="hourly-echo", job_type="test_echo", payload={"index": 7}, cron="0 * * * *",
+                           next_run_at=now - timedelta(hours=3)))  # Three runs were missed
+        db.commit()
+    try:
+        workers = [Worker(handlers={"test_echo": _echo}) for _ in range(3)]
+        assert sum(worker.fire_schedules() for worker in workers) == 1
+
+        with session_factory() as db:
+            schedule = db.get(JobSchedule, "hourly-echo")
+            assert now < schedule.next_run_at <= now + timedelta(hours=1)
+            assert schedule.next_run_at.minute == 0
+            jobs = db.execute(select(Job).where(Job.schedule_name == "hourly-echo")).scalars().all()
+        assert [(job.job_type, job.payload, job.status) for job in jobs] == [
+            ("test_echo", {"index": 7}, JobStatus.queued)
+        ]
+        assert workers[0].run_once() == 1
+    finally:
+        with session_factory() as db:
+            db.delete(db.get(JobSchedule, "hourly-echo"))
+            db.commit()
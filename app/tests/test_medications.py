@@ -1 +1,24 @@
-# Placeholder for app/tests/test_medications.py
+# app/tests/test_medications.py
+
+from app.models.user import UserRole
+
+def test_only_admins_change_the_medication_catalogue(client):
+    medication = {"medication_name": "Amoxicillin", "dosage_form": "capsule", "strength": "250mg",
+                  "manufacturer": "Emzor"}
+
+    client.login_as(UserRole.state_official)
+    assert client.post("/api/v1/medications/", json=medication).status_code == 403
+
+    client.login_as(UserRole.admin)
+    response = client.post("/api/v1/medications/", json=medication)
+    assert response.status_code == 201
+    medication_id = response.json()["medication_id"]
+
+    client.login_as(UserRole.facility_staff)
+    assert client.put(f"/api/v1/medications/{medication_id}", json={"strength": "500mg"}).status_code == 403
+    assert client.delete(f"/api/v1/medications/{medication_id}").status_code == 403
+    assert client.get(f"/api/v1/medications/{medication_id}").status_code == 200
+
+    client.login_as(UserRole.admin)
+    assert client.put(f"/api/v1/medications/{medication_id}", json={"strength": "500mg"}).json()["strength"] == "500mg"
+    assert client.delete(f"/api/v1/medications/{medication_id}").status_code == 200
@@ -0,0 +1,146 @@
+# app/tests/test_outbox.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models.inventory import Inventory
+from app.models.outbox import OutboxEvent
+from app.relay import OutboxRelay
+from app.repositories.outbox_repository import OutboxRepository
+
+@pytest.fixture
+def relay(session_factory):
+    relay = OutboxRelay(session_factory, batch_size=3, interval=0)
+    relay.ensure_state()
+    while relay.relay_once():
+        pass  # Publish whatever earlier tests left behind
+    return relay
+
+def _add_lots(session_factory, facility_id, medication_id, count, commit=True):
+    with session_factory() as db:
+        db.add_all([
+            Inventory(facility_id=facility_id, medication_id=medication_id, quantity=10,
+                      reorder_level=2, expiry_date=date(2031, month, 1))
+            for month in range(1, count + 1)
+        ])
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+            db.rollback()
+
+def test_concurrent_relays_number_committed_events_without_gaps(relay, session_factory, make_facility, make_medication):
+    facility_id, medication_id = make_facility(), make_medication()
+    _add_lots(session_factory, facility_id, medication_id, 10)
+    _add_lots(session_factory, make_facility(), medication_id, 4, commit=False)
+
+    def drain(_):
+        published = 0
+        while (count := relay.relay_once()):
+            published += count
+        return published
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert sum(pool.map(drain, range(3))) == 10
+
+    with session_factory() as db:
+        sequences = db.execute(
+            select(OutboxEvent.sequence).where(OutboxEvent.sequence.is_not(None)).order_by(OutboxEvent.sequence)
+        ).scalars().all()
+        assert sequences == list(range(sequences[0], sequences[0] + len(sequences)))
+        assert db.execute(select(OutboxEvent.event_id).where(OutboxEvent.sequence.is_(None))).first() is None
+        mine = db.execute(
+            select(OutboxEvent.sequence, OutboxEvent.payload["expiry_date"].as_string())
+            .where(OutboxEvent.aggregate_type == "inventory", OutboxEvent.sequence > sequences[-1] - 10)
+            .order_by(OutboxEvent.sequence)
+        ).all()
+    # Numbered in the order the events were written
+    assert [expiry for _, expiry in mine] == [date(2031, month, 1).isoformat() for month in range(1, 11)]
+
+def test_publish_numbers_nothing_once_another_relay_moved_on(relay, session_factory, make_facility, make_medication):
+    _add_lots(session_factory, make_facility(), make_medication(), 2)
+    with session_factory() as db:
+        repo = OutboxRepository(db)
+        last_sequence = repo.lock_relay_state()
+        event_ids = repo.unpublished(10)
+        assert repo.publish(event_ids, last_sequence - 1, datetime.utcnow()) is None
+        assert repo.publish(event_ids, last_sequence, datetime.utcnow()) == last_sequence + 2
+        db.commit()
+
+def test_feed_reads_in_sequence_and_skips_filtered_events(relay, session_factory, make_facility, make_medication):
+    from app.db.async_session import AsyncSessionLocal, async_engine
+    from app.services.outbox_service import OutboxFeedService
+
+    async def read_feed():
+        feed = OutboxFeedService(AsyncSessionLocal)
+        start = await feed.start_position(None)
+        _add_lots(session_factory, make_facility(), make_medication(), 5)
+        while relay.relay_once():
+            pass
+
+        events, position = await feed.read(start, 3, "inventory")
+        assert [event.sequence for event in events] == [start + 1, start + 2, start + 3]
+        events, position = await feed.read(position, 3, "inventory")
+        assert [event.sequence for event in events] == [start + 4, start + 5]
+        assert position == start + 5
+        # Nothing of another type was published, yet the position still reaches the head
+        events, position = await feed.read(start, 10, "transfer")
+        assert events == [] and position == start + 5
+
+    async def run():
+        try:
+            await read_feed()
+        finally:
+            await async_engine.dispose()  # Its connections belong to this event loop
+
+    asyncio.run(run())
+
+@pytest.mark.parametrize("path", ["/api/v1/events/stream", "/api/v1/facilities/{facility_id}/stock/stream"])
+def test_open_streams_hold_no_database_connection(engine, session_factory, make_facility, path):
+    from app.core.auth import principal_claims
+    from app.core.security import create_access_token, get_password_hash
+    from app.db.async_session import async_engine
+    from app.main import app
+    from app.models.user import User, UserRole
+    from app.services.stock_feed_service import stock_feed
+
+    facility_id = make_facility()
+    with session_factory() as db:
+        user = User(facility_id=facility_id, username=f"streamer-{facility_id.hex[:8]}",
+                    password_hash=get_password_hash("secret"), role=UserRole.facility_staff)
+        db.add(user)
+        db.commit()
+        token = create_access_token(principal_claims(user))
+
+    path = path.format(facility_id=facility_id)
+    checked_out = []
+
+    async def stream():
+        # Driven through ASGI directly: the response is open until the client disconnects
+        disconnected = asyncio.Event()
+        scope = {"type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "path": path,
+                 "raw_path": path.encode(), "root_path": "", "query_string": b"", "server": ("test", 80),
+                 "client": ("test", 1), "headers": [(b"authorization", f"Bearer {token}".encode())]}
+
+        async def receive():
+            await disconnected.wait()
+            await asyncio.sleep(0.1)  # Leave the stream between reads rather than cancel one midway
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                checked_out.append((message["status"], engine.pool.checkedout()))
+                disconnected.set()
+
+        try:
+            await asyncio.wait_for(app(scope, receive, send), 10)
+        finally:
+            await stock_feed.close()
+            await async_engine.dispose()
+
+    asyncio.run(stream())
+    assert checked_out == [(200, 0)]
@@ -0,0 +1,34 @@
+# app/tests/test_pool_metrics.py
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import registry
+from app.db.pool_metrics import TimedQueuePool, instrument_engine
+
+def test_pool_metrics_come_from_pool_events_and_registry(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    metrics = instrument_engine(engine, "pool-test", max_overflow=0)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+            busy = metrics.snapshot(engine.pool)
+        idle = metrics.snapshot(engine.pool)
+    finally:
+        engine.dispose()
+
+    assert (busy["size"], busy["checked_out"], busy["overflow"], busy["max_overflow"]) == (1, 1, 0, 0)
+    assert idle["checked_out"] == 0
+    assert (idle["checkouts"], idle["timeouts"], idle["connects"], idle["peak_checked_out"]) == (1, 1, 1, 1)
+    assert idle["wait_seconds"]["count"] == 2  # The timed-out wait is counted too
+    assert idle["wait_seconds"]["buckets"]["+Inf"] == 2
+    assert idle["hold_seconds"]["count"] == 1
+
+    exposition = registry.render()
+    assert 'db_pool_wait_seconds_count{engine="pool-test"} 2' in exposition
+    assert 'db_pool_timeouts_total{engine="pool-test"} 1' in exposition
@@ -0,0 +1,54 @@
+# app/tests/test_redistribution.py
+
+import numpy as np
+import pytest
+
+from app.core.redistribution import _pair_flows, _synthetic_positions, plan_redistribution
+
+def _transfers(plan):
+    return sorted(zip(plan.donor.tolist(), plan.recipient.tolist(), plan.quantity.tolist()))
+
+def test_hub_flows_split_into_sender_receiver_pairs():
+    # Hub 0: senders 0 and 1 give 3 and 2, receivers 0 and 1 take 1 and 4; hub 1 passes 4 from 2 to 2
+    sender, receiver, quantity = _pair_flows(
+        np.array([0, 0, 1]), np.array([0, 1, 2]), np.array([3, 2, 4]),
+        np.array([0, 0, 1]), np.array([0, 1, 2]), np.array([1, 4, 4]),
+    )
+    assert sorted(zip(sender.tolist(), receiver.tolist(), quantity.tolist())) == [
+        (0, 0, 1), (0, 1, 2), (1, 1, 2), (2, 2, 4),
+    ]
+
+def test_same_city_and_near_expiry_donors_are_drawn_on_first():
+    plan = plan_redistribution(
+        donor_group=[0, 0, 0], donor_city=[0, 1, 1], donor_supply=[5, 5, 5], donor_days=[10, 150, 10],
+        recipient_group=[0], recipient_city=[1], recipient_need=[4],
+    )
+    assert _transfers(plan) == [(2, 0, 4)]
+    assert plan.unmet.tolist() == [0]
+
+def test_shortage_is_reported_as_unmet_need():
+    plan = plan_redistribution(
+        donor_group=[0, 1], donor_city=[0, 0], donor_supply=[2, 9], donor_days=[30, 30],
+        recipient_group=[0, 0, 2], recipient_city=[0, 1, 0], recipient_need=[3, 2, 6],
+    )
+    received = np.bincount(plan.recipient, weights=plan.quantity, minlength=3)
+    assert received.sum() == 2
+    assert (received + plan.unmet).tolist() == [3, 2, 6]
+    assert plan.unmet[2] == 6  # No donor stocks its medication
+
+@pytest.mark.parametrize("batch_size", [1, 2000])
+def test_plans_respect_supply_and_move_as_much_as_each_medication_allows(batch_size):
+    (donor_group, donor_city, supply, days), (recipient_group, recipient_city, need) = _synthetic_positions(
+        facilities=40, medications=6, cities=4
+    )
+    plan = plan_redistribution(donor_group, donor_city, supply, days, recipient_group, recipient_city, need,
+                               batch_size=batch_size)
+
+    assert (plan.quantity > 0).all()
+    assert (donor_group[plan.donor] == recipient_group[plan.recipient]).all()
+    assert (np.bincount(plan.donor, weights=plan.quantity, minlength=len(supply)) <= supply).all()
+    received = np.bincount(plan.recipient, weights=plan.quantity, minlength=len(need))
+    assert (received + plan.unmet == need).all()
+    for group in np.unique(recipient_group):
+        moved = received[recipient_group == group].sum()
+        assert moved == min(supply[donor_group == group].sum(), need[recipient_group == group].sum())
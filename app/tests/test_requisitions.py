@@ -1 +1,118 @@
-# Placeholder for app/tests/test_requisitions.py
+# app/tests/test_requisitions.py
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.models.inventory import Inventory
+from app.models.requisition import Requisition, RequisitionStatus
+from app.models.user import UserRole
+from app.models.vendor import Vendor
+
+def _requisitions(session_factory, facility_id):
+    with session_factory() as db:
+        return db.execute(
+            select(Requisition.requisition_id, Requisition.status).where(Requisition.facility_id == facility_id)
+        ).all()
+
+def _low_stock_facility(session_factory, make_facility, make_medication):
+    facility_id = make_facility()
+    with session_factory() as db:
+        db.add(Inventory(facility_id=facility_id, medication_id=make_medication(), quantity=5,
+                         reorder_level=20, expiry_date=date(2031, 1, 31)))
+        db.commit()
+    return facility_id
+
+def test_reorder_drafts_can_be_submitted_and_approved(client, session_factory, make_facility, make_medication):
+    submitted_facility = _low_stock_facility(session_factory, make_facility, make_medication)
+    approved_facility = _low_stock_facility(session_factory, make_facility, make_medication)
+
+    assert client.post("/api/v1/requisitions/reorder-scan").status_code == 200
+    [(submitted_id, status)] = _requisitions(session_factory, submitted_facility)
+    [(approved_id, _)] = _requisitions(session_factory, approved_facility)
+    assert status == RequisitionStatus.draft
+
+    response = client.post("/api/v1/requisitions/submit-batch", json={"requisition_ids": [str(submitted_id)]})
+    assert response.json()["outcomes"][0]["status"] == RequisitionStatus.pending.value
+    response = client.post("/api/v1/requisitions/submit-batch", json={"requisition_ids": [str(submitted_id)]})
+    assert response.json()["outcomes"][0]["outcome"] == "not_draft"
+
+    # Drafts can also be approved without being submitted first
+    response = client.post(
+        "/api/v1/requisitions/approve-batch", json={"requisition_ids": [str(submitted_id), str(approved_id)]}
+    )
+    assert [outcome["outcome"] for outcome in response.json()["outcomes"]] == ["approved", "approved"]
+
+    # Stock on order keeps the pairs from being flagged again
+    client.post("/api/v1/requisitions/reorder-scan")
+    assert len(_requisitions(session_factory, submitted_facility)) == 1
+    assert len(_requisitions(session_factory, approved_facility)) == 1
+
+def test_only_deciders_approve_and_rejections_are_not_stamped_approved(client, session_factory, make_facility,
+                                                                      make_medication):
+    facility_id = make_facility()
+    with session_factory() as db:
+        approved, rejected = (
+            Requisition(facility_id=facility_id, medication_id=make_medication(), quantity_requested=10) for _ in range(2)
+        )
+        db.add_all([approved, rejected])
+        db.commit()
+        approved_id, rejected_id = approved.requisition_id, rejected.requisition_id
+
+    client.login_as(UserRole.facility_staff, facility_id)
+    for action in ("approve-batch", "reject-batch", "cancel-batch"):
+        response = client.post(f"/api/v1/requisitions/{action}", json={"requisition_ids": [str(approved_id)]})
+        assert response.status_code == 403
+
+    client.login_as(UserRole.state_official)
+    client.post("/api/v1/requisitions/approve-batch", json={"requisition_ids": [str(approved_id)]})
+    client.post("/api/v1/requisitions/reject-batch", json={"requisition_ids": [str(rejected_id)]})
+    with session_factory() as db:
+        assert db.get(Requisition, approved_id).approved_at is not None
+        assert db.get(Requisition, rejected_id).status == RequisitionStatus.rejected
+        assert db.get(Requisition, rejected_id).approved_at is None
+
+@pytest.mark.parametrize("requisitions", [1, 6])
+def test_requisition_batches_use_a_fixed_number_of_queries(
+    client, session_factory, make_facility, make_medication, assert_max_queries, requisitions
+):
+    facility_id = make_facility()
+    with session_factory() as db:
+        vendor = Vendor(vendor_name="Emzor Pharmaceuticals", contact_name="Ada Obi", phone_number="08010000000",
+                        email="orders@example.com", address="1 Industrial Avenue")
+        rows = [
+            Requisition(facility_id=facility_id, medication_id=make_medication(), quantity_requested=10)
+            for _ in range(requisitions)
+        ]
+        db.add_all([vendor, *rows])
+        db.commit()
+        batch = {"requisition_ids": [str(row.requisition_id) for row in rows],
+                 "create_purchase_orders": True, "vendor_id": str(vendor.vendor_id)}
+
+    with assert_max_queries(6, max_repeats=1):
+        response = client.post("/api/v1/requisitions/approve-batch", json=batch)
+    assert response.json()["changed"] == requisitions
+    assert response.json()["purchase_orders"][0]["purchase_orders"] == requisitions
+
+    with assert_max_queries(1):
+        response = client.get("/api/v1/requisitions/export", params={"facility_id": str(facility_id)})
+    assert response.text.count("\n") == requisitions + 1
+
+def test_staff_submit_only_their_own_facility_and_cannot_scan(client, session_factory, make_facility, make_medication):
+    own_facility, other_facility = make_facility(), make_facility()
+    with session_factory() as db:
+        own, other = (
+            Requisition(facility_id=facility_id, medication_id=make_medication(), quantity_requested=10,
+                        status=RequisitionStatus.draft)
+            for facility_id in (own_facility, other_facility)
+        )
+        db.add_all([own, other])
+        db.commit()
+        own_id, other_id = own.requisition_id, other.requisition_id
+
+    client.login_as(UserRole.facility_staff, own_facility)
+    assert client.post("/api/v1/requisitions/reorder-scan", params={"dry_run": True}).status_code == 403
+    response = client.post("/api/v1/requisitions/submit-batch", json={"requisition_ids": [str(own_id), str(other_id)]})
+    assert [outcome["outcome"] for outcome in response.json()["outcomes"]] == ["submitted", "not_found"]
+    assert dict(_requisitions(session_factory, other_facility)) == {other_id: RequisitionStatus.draft}
@@ -0,0 +1,102 @@
+# app/tests/test_stock_summary.py
+
+from datetime import date
+
+from sqlalchemy import select
+
+from app.models.inventory import Inventory
+from app.models.requisition import Requisition, RequisitionStatus
+from app.models.stock_summary import FacilityExpirySummary, FacilityStockSummary
+from app.models.user import UserRole
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.stock_summary_repository import StockSummaryRepository
+
+def _summary(db, facility_id, medication_id):
+    db.expire_all()
+    return db.get(FacilityStockSummary, (facility_id, medication_id))
+
+def test_reorder_level_is_the_highest_of_the_lots(session_factory, make_facility, make_medication):
+    facility_id, medication_id = make_facility(), make_medication()
+    with session_factory() as db:
+        high = Inventory(facility_id=facility_id, medication_id=medication_id, quantity=5,
+                         reorder_level=30, expiry_date=date(2031, 1, 31))
+        low = Inventory(facility_id=facility_id, medication_id=medication_id, quantity=5,
+                        reorder_level=10, expiry_date=date(2031, 2, 28))
+        db.add_all([high, low])
+        db.commit()
+        assert _summary(db, facility_id, medication_id).reorder_level == 30
+
+        # A later write with a lower level does not replace a higher one on another lot
+        InventoryRepository(db).upsert_lots([{"facility_id": facility_id, "medication_id": medication_id,
+                                              "quantity": 8, "reorder_level": 5, "expiry_date": date(2031, 1, 31)}])
+        assert _summary(db, facility_id, medication_id).reorder_level == 10
+
+        db.delete(db.get(Inventory, low.inventory_id))
+        db.commit()
+        assert _summary(db, facility_id, medication_id).reorder_level == 5
+
+        incremental = _summary(db, facility_id, medication_id)
+        incremental = (incremental.quantity_on_hand, incremental.reorder_level)
+        StockSummaryRepository(db).rebuild()
+        rebuilt = _summary(db, facility_id, medication_id)
+        assert (rebuilt.quantity_on_hand, rebuilt.reorder_level) == incremental == (8, 5)
+
+def test_expiry_summary_is_kept_per_medication(session_factory, make_facility, make_medication):
+    facility_id, first, second = make_facility(), make_medication(), make_medication()
+    with session_factory() as db:
+        db.add_all([
+            Inventory(facility_id=facility_id, medication_id=medication_id, quantity=quantity,
+                      reorder_level=0, expiry_date=date(2030, 6, 30))
+            for medication_id, quantity in ((first, 12), (second, 7))
+        ])
+        db.commit()
+        rows = db.execute(
+            select(FacilityExpirySummary.medication_id, FacilityExpirySummary.quantity)
+            .where(FacilityExpirySummary.facility_id == facility_id)
+        ).all()
+        assert dict(rows) == {first: 12, second: 7}
+
+        repo = StockSummaryRepository(db)
+        today = date(2030, 6, 1)
+        assert repo.get_expiring_quantity(facility_id, 90, today) == 19
+        assert repo.get_expiring_quantity(facility_id, 90, today, medication_id=second) == 7
+
+def test_receipt_and_cancellation_take_stock_off_order(client, session_factory, make_facility, make_medication):
+    facility_id, medication_id = make_facility(), make_medication()
+    with session_factory() as db:
+        delivered, withdrawn, undecided = (
+            Requisition(facility_id=facility_id, medication_id=medication_id, quantity_requested=quantity)
+            for quantity in (40, 25, 10)
+        )
+        db.add_all([delivered, withdrawn, undecided])
+        db.commit()
+        ids = [str(delivered.requisition_id), str(withdrawn.requisition_id), str(undecided.requisition_id)]
+
+    response = client.post("/api/v1/requisitions/approve-batch", json={"requisition_ids": ids[:2]})
+    assert response.status_code == 200
+    with session_factory() as db:
+        assert _summary(db, facility_id, medication_id).quantity_on_order == 65
+
+    # Receipts are booked by the receiving facility's staff; other facilities' staff cannot see them
+    client.login_as(UserRole.facility_staff, make_facility())
+    response = client.post("/api/v1/requisitions/receive-batch", json={"requisition_ids": [ids[0]]})
+    assert response.json()["outcomes"][0]["outcome"] == "not_found"
+    client.login_as(UserRole.facility_staff, facility_id)
+    response = client.post("/api/v1/requisitions/receive-batch", json={"requisition_ids": [ids[0], ids[2]]})
+    assert response.status_code == 200
+    assert [outcome["outcome"] for outcome in response.json()["outcomes"]] == ["received", "not_approved"]
+    client.login_as(UserRole.admin)
+    response = client.post("/api/v1/requisitions/cancel-batch", json={"requisition_ids": [ids[1]]})
+    assert response.json()["outcomes"][0]["status"] == RequisitionStatus.cancelled.value
+
+    with session_factory() as db:
+        assert _summary(db, facility_id, medication_id).quantity_on_order == 0
+        StockSummaryRepository(db).rebuild()
+        # Nothing on hand or on order, so the rebuilt summary has no row for the pair
+        assert _summary(db, facility_id, medication_id) is None
+
+def test_only_admins_rebuild_the_summary(client):
+    client.login_as(UserRole.state_official)
+    assert client.post("/api/v1/facilities/stock-summary/rebuild").status_code == 403
+    client.login_as(UserRole.admin)
+    assert client.post("/api/v1/facilities/stock-summary/rebuild").status_code == 204
@@ -1 +1,118 @@
-# Placeholder for app/tests/test_transfers.py
+# app/tests/test_transfers.py
+
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models.inventory import Inventory
+from app.models.stock_ledger import StockMovement
+from app.models.user import UserRole
+from app.repositories import stock_ledger_repository
+from app.repositories.stock_ledger_repository import StockLedgerRepository
+from app.schemas.inventory import DispenseRequest
+from app.schemas.transfer import TransferCreate
+from app.services.inventory_service import InventoryService
+from app.services.stock_ledger_service import StockLedgerService
+from app.services.transfer_service import TransferService
+
+@pytest.mark.parametrize("lots", [1, 4])
+def test_transfer_queries_do_not_grow_with_the_lots_drawn_on(
+    client, session_factory, make_facility, make_medication, assert_max_queries, lots
+):
+    from_facility_id, to_facility_id, medication_id = make_facility(), make_facility(), make_medication()
+    with session_factory() as db:
+        db.add_all([
+            Inventory(facility_id=from_facility_id, medication_id=medication_id, quantity=5,
+                      reorder_level=2, expiry_date=date(2031, month, 1))
+            for month in range(1, lots + 1)
+        ])
+        db.commit()
+
+    # Every lot is debited, credited and recorded in the same few executemany statements
+    with assert_max_queries(18, max_repeats=3):
+        response = client.post("/api/v1/transfers/", json={
+            "from_facility_id": str(from_facility_id), "to_facility_id": str(to_facility_id),
+            "medication_id": str(medication_id), "quantity_transferred": 5 * lots,
+        })
+    assert response.status_code == 201
+
+    with assert_max_queries(1):
+        response = client.get("/api/v1/transfers/export", params={"facility_id": str(from_facility_id)})
+    assert response.text.count("\n") == 2
+
+def test_ledger_and_snapshots_match_stock_under_concurrent_moves(
+    session_factory, make_facility, make_medication, monkeypatch
+):
+    # Snapshots normally trail by a settle time; the phases below are already sequential
+    monkeypatch.setattr(stock_ledger_repository, "SNAPSHOT_SETTLE_TIME", timedelta(0))
+    facility_ids, medication_id = [make_facility() for _ in range(3)], make_medication()
+    with session_factory() as db:
+        db.add_all([
+            Inventory(facility_id=facility_id, medication_id=medication_id, quantity=60,
+                      reorder_level=10, expiry_date=date(2031, month, 1))
+            for facility_id in facility_ids for month in (3, 9)
+        ])
+        db.commit()
+
+    def move_stock(seed):
+        rng = random.Random(seed)
+        dispensed = 0
+        with session_factory() as db:
+            for _ in range(12):
+                from_facility_id, to_facility_id = rng.sample(facility_ids, 2)
+                try:
+                    if rng.random() < 0.5:
+                        TransferService(db).create_transfer(TransferCreate(
+                            from_facility_id=from_facility_id, to_facility_id=to_facility_id,
+                            medication_id=medication_id, quantity_transferred=rng.randint(1, 8),
+                        ))
+                    else:
+                        quantity = rng.randint(1, 5)
+                        InventoryService(db).dispense(DispenseRequest(
+                            facility_id=from_facility_id, medication_id=medication_id, quantity=quantity
+                        ))
+                        dispensed += quantity
+                except HTTPException as e:
+                    assert e.status_code == 409
+        return dispensed
+
+    def run_phase(seeds):
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            return sum(pool.map(move_stock, seeds))
+
+    dispensed = run_phase(range(6))
+    with session_factory() as db:
+        snapshot_as_of = StockLedgerService(db).take_snapshots(datetime.utcnow()).as_of
+    dispensed += run_phase(range(6, 12))
+
+    with session_factory() as db:
+        ledger = StockLedgerRepository(db)
+        now = datetime.utcnow() + timedelta(seconds=1)
+        total = 0
+        for facility_id in facility_ids:
+            pair = (Inventory.facility_id == facility_id, Inventory.medication_id == medication_id)
+            on_hand = db.execute(select(func.sum(Inventory.quantity)).where(*pair)).scalar_one()
+            moved = db.execute(
+                select(func.sum(StockMovement.quantity))
+                .where(StockMovement.facility_id == facility_id, StockMovement.medication_id == medication_id)
+            ).scalar_one()
+            assert moved == on_hand
+            # The snapshot taken between the phases plus the movements after it
+            assert tuple(ledger.balance_as_of(facility_id, medication_id, now)) == (on_hand, snapshot_as_of)
+            total += on_hand
+        assert total == 6 * 60 - dispensed
+
+def test_only_deciders_plan_redistribution_and_confirm_transfers(client):
+    client.login_as(UserRole.facility_staff)
+    assert client.post("/api/v1/transfers/redistribution", params={"state": "Lagos", "dry_run": True}).status_code == 403
+    assert client.post(f"/api/v1/transfers/{uuid.uuid4()}/confirm").status_code == 403
+
+    client.login_as(UserRole.state_official)
+    response = client.post("/api/v1/transfers/redistribution", params={"state": "Nowhere", "dry_run": True})
+    assert response.status_code == 200
+    assert client.post(f"/api/v1/transfers/{uuid.uuid4()}/confirm").status_code == 404
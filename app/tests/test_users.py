@@ -1 +1,38 @@
-# Placeholder for app/tests/test_users.py
+# app/tests/test_users.py
+
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import sort_columns
+from app.core.security import get_password_hash
+from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+
+def test_users_cannot_be_ordered_by_password_hash():
+    with pytest.raises(HTTPException) as error:
+        sort_columns(User, "password_hash", UserRepository.sortable_columns)
+    assert error.value.status_code == 400
+
+def test_user_pages_are_ordered_by_whitelisted_columns_only(client, db_session):
+    facility_id = uuid.uuid4()
+    prefix = uuid.uuid4().hex[:8]
+    db_session.add_all([
+        User(username=f"{prefix}-{index}", password_hash=get_password_hash("secret"),
+             role=UserRole.facility_staff, facility_id=facility_id)
+        for index in range(3)
+    ])
+    db_session.commit()
+
+    assert client.get("/api/v1/", params={"order_by": "password_hash"}).status_code == 400
+    assert client.get("/api/v1/", params={"limit": 5000}).status_code == 422
+
+    response = client.get("/api/v1/", params={"order_by": "username", "limit": 1})
+    assert response.status_code == 200
+    cursor = response.headers["X-Next-Cursor"]
+    payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    assert payload["o"] == "username"
+    assert not any(str(value).startswith("$2") for value in payload["v"])  # No bcrypt hash in the cursor
@@ -1 +1,24 @@
-# Placeholder for app/tests/test_vendors.py
+# app/tests/test_vendors.py
+
+from app.models.user import UserRole
+
+def test_only_admins_change_the_vendor_list(client):
+    vendor = {"vendor_name": "May & Baker", "contact_name": "Ada Obi", "phone_number": "08010000000",
+              "email": "orders@example.com", "address": "1 Industrial Avenue"}
+
+    client.login_as(UserRole.state_official)
+    assert client.post("/api/v1/vendors/", json=vendor).status_code == 403
+
+    client.login_as(UserRole.admin)
+    response = client.post("/api/v1/vendors/", json=vendor)
+    assert response.status_code == 201
+    vendor_id = response.json()["vendor_id"]
+
+    client.login_as(UserRole.facility_staff)
+    assert client.put(f"/api/v1/vendors/{vendor_id}", json={"contact_name": "Bola Ade"}).status_code == 403
+    assert client.delete(f"/api/v1/vendors/{vendor_id}").status_code == 403
+    assert client.get(f"/api/v1/vendors/{vendor_id}").status_code == 200
+
+    client.login_as(UserRole.admin)
+    assert client.put(f"/api/v1/vendors/{vendor_id}", json={"contact_name": "Bola Ade"}).json()["contact_name"] == "Bola Ade"
+    assert client.delete(f"/api/v1/vendors/{vendor_id}").status_code == 200
@@ -0,0 +1,284 @@
+# app/worker.py
+
+"""
+Background job worker.
+
+    python -m app.worker                                   # one worker process
+    python -m app.worker --processes 4                     # four of them
+    python -m app.worker --benchmark 20000 --processes 4   # queue throughput
+
+A worker claims due jobs in batches (see JobRepository.claim), runs them one
+at a time, each with its own session, and records the outcome. A heartbeat
+thread renews the leases of the jobs it holds, so only jobs whose worker
+died are claimed again. Failed attempts are retried with exponential backoff
+until the job runs out of attempts, when the job type's failure handler (if
+any) cleans up after it. Due schedules are enqueued by whichever
+worker gets to them first. Workers share nothing but the database, so the
+queue scales out by starting more of them, on this host or others.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.cron import CronSchedule
+from app.core.metrics import Counter, Histogram, registry
+from app.db import base  # Import all models so relationships between them resolve
+from app.db.retry import run_in_transaction
+from app.db.session import SessionLocal, engine
+from app.models.job import Job, JobStatus
+from app.repositories import stock_summary_repository  # Keeps the stock summary in sync with ORM writes
+from app.repositories.job_repository import JobRepository
+from app.services.job_service import JOB_FAILURE_HANDLERS, JOB_HANDLERS, JobFailureHandler, JobHandler
+
+jobs_finished_total = registry.register(Counter(
+    "jobs_finished_total", "Job attempts finished by workers, by job type and outcome.", ("job_type", "outcome")
+))
+job_duration_seconds = registry.register(Histogram(
+    "job_duration_seconds", "Time spent running job attempts, by job type.", ("job_type",)
+))
+
+def retry_delay(attempts: int) -> float:
+    # Full jitter over an exponentially growing, capped window
+    return random.uniform(0, min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1)))
+
+def describe_error(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return f"{type(error).__name__}: {error}"
+
+class Worker:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        session_factory: Callable = SessionLocal,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        failure_handlers: Optional[Dict[str, JobFailureHandler]] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.session_factory = session_factory
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self.failure_handlers = JOB_FAILURE_HANDLERS if failure_handlers is None else failure_handlers
+        self.batch_size = batch_size or settings.JOB_CLAIM_BATCH
+        self.poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.lease = timedelta(seconds=lease_seconds or settings.JOB_LEASE_SECONDS)
+        self._held: Set[uuid.UUID] = set()
+        self._held_lock = threading.Lock()
+
+    def _transaction(self, work: Callable, operation: str):
+        # Queue bookkeeping in a short transaction of its own, retried on conflicts
+        with self.session_factory() as db:
+            return run_in_transaction(db, lambda: work(JobRepository(db), datetime.utcnow()), operation=operation)
+
+    def fire_schedules(self) -> int:
+        """
+        Enqueue one job for every due schedule and move each to its next
+        run. Runs missed while no worker was up are enqueued once.
+        """
+        def fire(repo: JobRepository, now: datetime) -> int:
+            fired = 0
+            for schedule in repo.due_schedules(now):
+                try:
+                    next_run_at = CronSchedule(schedule.cron).next_after(now)
+                except ValueError as e:
+                    logging.error(f"Skipping job schedule {schedule.name}: {e}")
+                    continue
+                if repo.advance_schedule(schedule.name, schedule.next_run_at, next_run_at, now):
+                    repo.enqueue(schedule.job_type, schedule.payload, schedule_name=schedule.name)
+                    fired += 1
+            return fired
+
+        return self._transaction(fire, "job_schedules")
+
+    def claim(self) -> List:
+        jobs = self._transaction(
+            lambda repo, now: repo.claim(self.worker_id, self.batch_size, self.lease, now), "job_claim"
+        )
+        with self._held_lock:
+            self._held.update(job.job_id for job in jobs)
+        return jobs
+
+    def renew_leases(self) -> int:
+        with self._held_lock:
+            held = list(self._held)
+        return self._transaction(
+            lambda repo, now: repo.extend_leases(held, self.worker_id, now + self.lease), "job_heartbeat"
+        )
+
+    def _record(self, job, outcome: str, finish: Callable) -> bool:
+        recorded = self._transaction(finish, "job_outcome")
+        if not recorded:
+            # The lease ran out and another worker has the job now
+            logging.warning(f"Job {job.job_id} was no longer held by {self.worker_id}; outcome {outcome} dropped")
+        jobs_finished_total.inc(job.job_type, outcome)
+        return recorded
+
+    def run_job(self, job) -> bool:
+        """
+        Run one claimed job and record the outcome. Returns whether it succeeded.
+        """
+        started = time.perf_counter()
+        try:
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                raise LookupError(f"No handler for job type '{job.job_type}'")
+            if job.attempts > job.max_attempts:
+                # Claimed again after a worker died holding it on its last attempt
+                raise RuntimeError(f"Gave up after {job.max_attempts} attempts")
+            with self.session_factory() as db:
+                result = handler(db, job.payload or {})
+                db.commit()  # Handlers may leave their work for the caller to commit
+        except Exception as e:
+            error = describe_error(e)
+            retry_at = None
+            if job.attempts < job.max_attempts and job.job_type in self.handlers:
+                retry_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+            logging.error(
+                f"Job {job.job_id} ({job.job_type}) failed on attempt {job.attempts} of {job.max_attempts}: {error}"
+            )
+            recorded = self._record(
+                job, "retried" if retry_at else "failed",
+                lambda repo, now: repo.fail(job.job_id, self.worker_id, error, now, retry_at),
+            )
+            if recorded and retry_at is None and job.job_type in self.failure_handlers:
+                try:
+                    self.failure_handlers[job.job_type](job.payload or {})
+                except Exception as e:
+                    logging.error(f"Clean-up after job {job.job_id} ({job.job_type}) failed: {describe_error(e)}")
+            return False
+        finally:
+            job_duration_seconds.observe(time.perf_counter() - started, job.job_type)
+            with self._held_lock:
+                self._held.discard(job.job_id)
+
+        result = jsonable_encoder(result) if result is not None else None
+        self._record(job, "succeeded", lambda repo, now: repo.complete(job.job_id, self.worker_id, result, now))
+        return True
+
+    def run_once(self) -> int:
+        """
+        Claim one batch of due jobs and run it. Returns the number claimed.
+        """
+        jobs = self.claim()
+        for job in jobs:
+            self.run_job(job)
+        return len(jobs)
+
+    def _heartbeat(self, stop: threading.Event) -> None:
+        while not stop.wait(self.lease.total_seconds() / 3):
+            try:
+                self.renew_leases()
+            except Exception as e:
+                logging.error(f"Worker {self.worker_id} could not renew its job leases: {e}")
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Work until ``stop`` is set, finishing the job in hand first.
+        """
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop,), name=f"heartbeat-{self.worker_id}", daemon=True)
+        heartbeat.start()
+        logging.info(f"Worker {self.worker_id} started")
+        next_schedule_check = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() >= next_schedule_check:
+                    self.fire_schedules()
+                    next_schedule_check = time.monotonic() + self.poll_interval
+                if self.run_once() == 0:
+                    stop.wait(self.poll_interval)
+            except Exception as e:
+                logging.error(f"Worker {self.worker_id} loop error: {e}")
+                stop.wait(self.poll_interval)
+        heartbeat.join()
+        logging.info(f"Worker {self.worker_id} stopped")
+
+def start_embedded_workers(count: int) -> Tuple[threading.Event, List[threading.Thread]]:
+    """
+    Run ``count`` workers as threads of the current process (used by the API
+    when JOB_EMBEDDED_WORKERS is set). Set the returned event to stop them.
+    """
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=Worker().run, args=(stop,), name=f"job-worker-{index}", daemon=True)
+        for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return stop, threads
+
+def _worker_process(stop, poll_interval: Optional[float]) -> None:
+    # Connections inherited from the parent must not be shared with it
+    engine.dispose(close=False)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    Worker(poll_interval=poll_interval).run(stop)
+
+def run_processes(count: int, stop, poll_interval: Optional[float] = None) -> List[multiprocessing.Process]:
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(stop, poll_interval), name=f"job-worker-{index}")
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    return processes
+
+def benchmark(jobs: int, processes: int) -> None:
+    """
+    Enqueue ``jobs`` no-op jobs, drain them with ``processes`` workers and
+    report the throughput.
+    """
+    started_at = datetime.utcnow()
+    with SessionLocal() as db:
+        JobRepository(db).enqueue_many({"job_type": "noop", "created_at": started_at} for _ in range(jobs))
+        db.commit()
+    engine.dispose()
+
+    stop = multiprocessing.Event()
+    started = time.perf_counter()
+    workers = run_processes(processes, stop, poll_interval=0.05)
+    pending = select(func.count()).select_from(Job).where(
+        Job.job_type == "noop", Job.created_at >= started_at, Job.status != JobStatus.succeeded
+    )
+    with SessionLocal() as db:
+        while db.execute(pending).scalar_one():
+            db.rollback()
+            time.sleep(0.1)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for process in workers:
+        process.join()
+    print(f"{jobs} jobs, {processes} worker processes: {elapsed:.1f}s, {jobs / elapsed:.0f} jobs/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to run")
+    parser.add_argument("--benchmark", type=int, metavar="JOBS", help="drain this many no-op jobs and report jobs/s")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.processes)
+    else:
+        stop_event = multiprocessing.Event()
+        workers = run_processes(args.processes, stop_event)
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+        for process in workers:
+            process.join()